@@ -0,0 +1,21 @@
+"""
+Zinclusive
+==========
+
+Loan paydown models and simulations for the Zinclusive product.
+
+The modules are imported on their own, so importing the package is cheap, e.g. a worker process only loads the
+modules that it uses.
+
+EXAMPLE USAGE:
+    from zinclusive import Zinclusive
+    from zinclusive.systems import CustomerSystem
+    from zinclusive.reports import loan_report
+"""
+
+import os
+from .zinclusive import ProductConfig, Zinclusive
+
+# Profiling can be switched on for a whole process with an environment variable, see instrument.py.
+if os.environ.get("ZINCLUSIVE_PROFILE"):
+    from . import instrument
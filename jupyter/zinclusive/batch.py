@@ -0,0 +1,206 @@
+"""
+Batch Runner
+============
+
+Runs a loan tape, i.e. a CSV or JSONL file of applications, through CustomerSystem as a job.
+The rows are read and simulated in chunks across a pool of processes, and the summary of each loan is written as soon
+as its chunk is done. Only a few chunks are in memory at once, so the memory is bounded whatever the size of the tape.
+
+Each application has these fields. Only bal is required.
+* id          The id of the application. Default is the row number.
+* bal         The balance of the loan.
+* income      The annual income of the customer (default is 40,000).
+* frequency   The pay frequency: weekly, biweekly, semimonthly or monthly (default is biweekly).
+* next_pay    The next pay date, YYYY-MM-DD. Default is the start.
+* start       The start (origination) date of the loan. Default is --start.
+
+EXAMPLE USAGE:
+    python -m zinclusive.batch book.csv --out summaries.csv
+    python -m zinclusive.batch book.jsonl --out summaries.csv --ledger book_ledger --workers 8 --chunk 5000
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, datetime
+from dateutil.relativedelta import relativedelta
+from .customer import Customer
+from .loans import ZLoan
+from .period import BiWeeklyPeriod, Period, SemiMonthlyPeriod
+from .systems import CustomerSystem
+
+
+FIELDS = ["id", "bal", "band", "income", "frequency", "payments", "paid", "interest", "fees", "endBal", "payoffDate", "aprDropDate", "error"]
+
+
+def make_period(frequency, next_pay):
+    "Returns the income Period of a pay frequency that starts on the next pay date."
+    frequency = (frequency or "biweekly").lower().replace("-", "").replace("_", "")
+    if frequency == "weekly":
+        return Period(next_pay, days=7)
+    if frequency == "biweekly":
+        return BiWeeklyPeriod(next_pay)
+    if frequency == "semimonthly":
+        return SemiMonthlyPeriod(next_pay)
+    if frequency == "monthly":
+        return Period(next_pay, months=1, days=[next_pay.day])
+    raise ValueError(f"Invalid pay frequency: {frequency}")
+
+
+def _date(text, default):
+    return datetime.strptime(text, "%Y-%m-%d") if text else default
+
+
+def read_tape(path):
+    "Yields the applications of a CSV or JSONL file as dicts, one row at a time."
+    with open(path, newline='') as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def run_application(i, app, start, years, ledger=False):
+    """
+    Returns the summary row of one application, and its statement if the ledger is wanted, else None.
+    An application that cannot be simulated, e.g. a balance that does not fit in a band, has an error instead.
+    """
+    row = {"id": app.get("id") or i, "bal": app.get("bal"), "income": app.get("income") or 40000, "frequency": app.get("frequency") or "biweekly"}
+    try:
+        bal = float(row["bal"])
+        start = _date(app.get("start"), start)
+        pIncome = make_period(row["frequency"], _date(app.get("next_pay"), start))
+        customer = Customer(annual_income=float(row["income"]), pIncome=pIncome)
+        system = CustomerSystem(start=start, end=start, loan=ZLoan(bal), customer=customer)
+        end = start + relativedelta(years=years)
+        summary = system.summary(end)
+        statement = system.get_statement(end) if ledger else None
+    except Exception as e:
+        return {**row, "error": str(e)}, None
+
+    row.update(band=system.loan.band, payments=summary.payments, paid=round(summary.paid, 2), interest=round(summary.interest, 2),
+               fees=summary.fees, endBal=round(summary.bal, 2), payoffDate=_text(summary.payoffDate), aprDropDate=_text(summary.aprDropDate))
+    return row, statement
+
+
+def _text(d):
+    return d.strftime("%Y-%m-%d") if d else ""
+
+
+def run_chunk(chunk, start, years, ledger):
+    "Returns the (row, statement) of each application of a chunk."
+    return [run_application(i, app, start, years, ledger) for i, app in chunk]
+
+
+def run_tape(path, out, start=None, years=3, ledger=None, workers=None, chunk=1000, progress=sys.stderr):
+    """
+    Simulates every application of the tape and writes a summary row per loan to the out CSV file.
+    Returns the number of rows.
+
+    Parameters
+    ----------
+    path : str
+        The CSV or JSONL file of applications.
+    out : str
+        The CSV file of summaries. The rows are in the order that their chunks finish.
+    start : date, optional
+        The start date of the loans without one. Default is today.
+    years : int, optional
+        The number of years to simulate (default is 3).
+    ledger : str, optional
+        A directory to write the statements to as a ledger, see ledger.py.
+        The ledger column of the summaries is the index of the loan in the ledger.
+    workers : int, optional
+        The number of processes. Default is the number of CPUs. 0 runs in this process.
+    chunk : int, optional
+        The number of applications per task (default is 1000).
+    progress : file, optional
+        Where to report the rows per second, None for nothing (default is stderr).
+    """
+    start = start or datetime.combine(date.today(), datetime.min.time())
+    apps = enumerate(read_tape(path))
+    chunks = iter(lambda: list(itertools.islice(apps, chunk)), [])
+
+    writer = None
+    if ledger:
+        from .ledger import LedgerWriter
+        writer = LedgerWriter(ledger)
+    fields = FIELDS + (["ledger"] if ledger else [])
+    count = 0
+    loans = 0
+    t = time.perf_counter()
+
+    with open(out, "w", newline='') as f:
+        summaries = csv.DictWriter(f, fieldnames=fields)
+        summaries.writeheader()
+
+        def collect(results):
+            nonlocal count, loans
+            for row, statement in results:
+                if statement is not None:
+                    row["ledger"] = loans
+                    writer.add(statement)
+                    loans += 1
+                summaries.writerow(row)
+            f.flush()
+            count += len(results)
+            if progress:
+                seconds = time.perf_counter() - t
+                print(f"{count:,} rows  {count / max(seconds, 1e-9):,.0f} rows/s", file=progress)
+
+        try:
+            if workers == 0:
+                for c in chunks:
+                    collect(run_chunk(c, start, years, bool(ledger)))
+            else:
+                workers = workers or os.cpu_count() or 1
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    pending = set()
+                    for c in chunks:
+                        pending.add(executor.submit(run_chunk, c, start, years, bool(ledger)))
+                        # Keep at most two chunks per worker in flight, so the tape is not read ahead into memory.
+                        if len(pending) >= 2 * workers:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                collect(future.result())
+                    for future in pending:
+                        collect(future.result())
+        except BaseException:
+            if writer:
+                writer.abort()
+            raise
+        if writer:
+            writer.close()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate a loan tape of applications and write a summary per loan.")
+    parser.add_argument("tape", help="The CSV or JSONL file of applications.")
+    parser.add_argument("--out", required=True, help="The CSV file of summaries.")
+    parser.add_argument("--ledger", help="Also write the statements to this ledger directory.")
+    parser.add_argument("--start", help="The start date of loans without one, YYYY-MM-DD (default is today).")
+    parser.add_argument("--years", type=int, default=3, help="The number of years to simulate (default 3).")
+    parser.add_argument("--workers", type=int, help="The number of processes (default is the number of CPUs, 0 for none).")
+    parser.add_argument("--chunk", type=int, default=1000, help="The number of applications per task (default 1000).")
+    parser.add_argument("--quiet", action="store_true", help="Do not report the progress.")
+    args = parser.parse_args(argv)
+
+    t = time.perf_counter()
+    count = run_tape(args.tape, args.out, _date(args.start, None), args.years, args.ledger, args.workers, args.chunk,
+                     progress=None if args.quiet else sys.stderr)
+    if not args.quiet:
+        seconds = time.perf_counter() - t
+        print(f"Done: {count:,} rows in {seconds:.1f} s, {count / max(seconds, 1e-9):,.0f} rows/s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
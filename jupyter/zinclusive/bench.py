@@ -0,0 +1,301 @@
+"""
+Benchmarks
+==========
+
+Times the simulation hot paths at several sizes, i.e. number of loans and years, and reports the throughput and peak memory.
+The results can be saved as JSON and compared against a saved baseline to tell whether a change made the simulator faster or slower.
+
+EXAMPLE USAGE:
+    python -m zinclusive.bench                              # Quick sizes.
+    python -m zinclusive.bench --full --save baseline.json  # 1, 100, 10,000 loans and 1 to 30 years.
+    python -m zinclusive.bench --baseline baseline.json     # Compare against the baseline.
+    python -m zinclusive.bench --case period --case merge   # Only some cases.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+import numpy as np
+from .customer import Customer
+from .events import EventSystem
+from .loans import Loan, ZLoan
+from .period import BiWeeklyPeriod, MonthlyPeriod, SemiMonthlyPeriod
+from .reports import Report, Statement, imerge, loan_report, merge
+from .solver import ZLoanSolver
+from .systems import CustomerSystem
+from .tx import Tx
+
+
+START = datetime(2000, 1, 1)
+
+QUICK_LOANS = [1, 100]
+QUICK_YEARS = [1, 3]
+FULL_LOANS = [1, 100, 10000]
+FULL_YEARS = [1, 3, 10, 30]
+
+# A result is a regression if it is slower than the baseline by more than this fraction.
+THRESHOLD = 0.10
+
+
+cases = {}
+
+def case(name):
+    """
+    Registers a benchmark case. The case is called with the number of loans and years, does its setup,
+    and returns (run, items), where run() is the timed function and items is the number of things it processes.
+    """
+    def register(f):
+        cases[name] = f
+        return f
+    return register
+
+
+def systems(loans, years):
+    "Returns a repeatable book of loans with random balances and income periods."
+    rng = random.Random(loans)
+    result = []
+    for i in range(loans):
+        pIncome = rng.choice([BiWeeklyPeriod, MonthlyPeriod, SemiMonthlyPeriod])(START + relativedelta(days=rng.randint(0, 13)))
+        customer = Customer(annual_income=rng.randint(30000, 80000), pIncome=pIncome)
+        result.append(CustomerSystem(start=START, end=START + relativedelta(years=years), loan=ZLoan(rng.randint(1000, 9999)), customer=customer))
+    return result
+
+
+def statements(loans, years):
+    return [system.get_statement(system._end) for system in systems(loans, years)]
+
+
+@case("period")
+def bench_period(loans, years):
+    periods = [system.pIncome for system in systems(loans, years)]
+    end = START + relativedelta(years=years)
+    items = sum(len(p.dates(end=end)) for p in periods)
+    def run():
+        for p in periods:
+            for d in p:
+                if d > end: break
+    return run, items
+
+
+@case("period.dates")
+def bench_period_dates(loans, years):
+    periods = [system.pIncome for system in systems(loans, years)]
+    end = START + relativedelta(years=years)
+    items = sum(len(p.dates(end=end)) for p in periods)
+    def run():
+        for p in periods:
+            p.dates(end=end)
+    return run, items
+
+
+@case("get_statement")
+def bench_get_statement(loans, years):
+    book = systems(loans, years)
+    items = sum(len(s) for s in statements(loans, years))
+    def run():
+        for system in book:
+            system.get_statement(system._end)
+    return run, items
+
+
+@case("EventSystem.get_statement")
+def bench_event_statement(loans, years):
+    book = [EventSystem(system._start, system._end, system.loan, system.customer) for system in systems(loans, years)]
+    items = sum(len(system.get_statement(system._end)) for system in book)
+    def run():
+        for system in book:
+            system.get_statement(system._end)
+    return run, items
+
+
+@case("add_tx")
+def bench_add_tx(loans, years):
+    txs = [tx for s in statements(loans, years) for tx in s.txs]
+    def run():
+        statement = Statement()
+        for tx in txs:
+            statement.add_tx(tx)
+    return run, len(txs)
+
+
+@case("merge")
+def bench_merge(loans, years):
+    book = statements(loans, years)
+    def run():
+        merge(*book)
+    return run, sum(len(s) for s in book)
+
+
+@case("imerge")
+def bench_imerge(loans, years):
+    book = statements(loans, years)
+    def run():
+        for tx in imerge(*book):
+            pass
+    return run, sum(len(s) for s in book)
+
+
+@case("loan_report")
+def bench_loan_report(loans, years):
+    book = [(system.loan, system.customer, system.get_statement(system._end)) for system in systems(loans, years)]
+    def run():
+        for loan, customer, statement in book:
+            loan_report(customer, 0, statement, loan)
+    return run, sum(len(s) for _, _, s in book)
+
+
+@case("Report.row")
+def bench_report_row(loans, years):
+    report = Report("Date:<10", "Description:<15", "Amount:>10,.2f", "Balance:>10,.2f")
+    txs = [tx for s in statements(loans, years) for tx in s.txs if tx.desc]
+    def run():
+        for tx in txs:
+            report.row(tx.date, tx.desc, tx.amount, tx.bal)
+    return run, len(txs)
+
+
+@case("Loan.calc_min_pmt")
+def bench_calc_min_pmt(loans, years):
+    rng = np.random.default_rng(loans)
+    bals = rng.uniform(0, 10000, loans * years * 26).tolist()
+    loan = Loan(5000, 0.12/12, 360)
+    def run():
+        for bal in bals:
+            loan.bal = bal
+            loan.calc_min_pmt()
+    return run, len(bals)
+
+
+@case("Loan.calc_min_pmts")
+def bench_calc_min_pmts(loans, years):
+    rng = np.random.default_rng(loans)
+    bals = rng.uniform(0, 10000, loans * years * 26)
+    loan = Loan(5000, 0.12/12, 360)
+    def run():
+        loan.calc_min_pmts(bals)
+    return run, len(bals)
+
+
+@case("CustomerSystem.summary")
+def bench_summary(loans, years):
+    book = systems(loans, years)
+    def run():
+        for system in book:
+            system.summary(system._end)
+    return run, len(book)
+
+
+@case("ZLoanSolver")
+def bench_solver(loans, years):
+    book = systems(loans, years)
+    def run():
+        for system in book:
+            ZLoanSolver(system.loan.bal, system.pIncome).payoff_period()
+    return run, len(book)
+
+
+def measure(name, loans, years, repeat=3):
+    "Returns the result of one case at one size: the best time of the repeats and the peak memory of one more run."
+    run, items = cases[name](loans, years)
+    seconds = float('inf')
+    for i in range(repeat):
+        t = time.perf_counter()
+        run()
+        seconds = min(seconds, time.perf_counter() - t)
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "case": name,
+        "loans": loans,
+        "years": years,
+        "items": items,
+        "seconds": seconds,
+        "throughput": items / seconds if seconds else float('inf'),
+        "peak_bytes": peak,
+    }
+
+
+def run_all(names=None, loans=QUICK_LOANS, years=QUICK_YEARS, repeat=3, out=sys.stdout):
+    "Runs the cases at every size and returns the results."
+    results = []
+    for name in names or cases:
+        for n in loans:
+            for y in years:
+                result = measure(name, n, y, repeat)
+                results.append(result)
+                if out:
+                    print(f"{name:<18} {n:>6,} loans {y:>3} yrs {result['items']:>10,} items {result['seconds']:>9.4f} s {result['throughput']:>14,.0f} /s {result['peak_bytes']/2**20:>9.2f} MiB", file=out)
+    return results
+
+
+def save(results, path):
+    meta = {
+        "date": datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+    }
+    with open(path, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    Returns the results that are in the baseline, with the throughput ratio to the baseline, i.e. > 1 is faster.
+    A result is a regression if it is slower than the baseline by more than the threshold.
+    """
+    base = {(r["case"], r["loans"], r["years"]): r for r in baseline}
+    rows = []
+    for r in results:
+        b = base.get((r["case"], r["loans"], r["years"]))
+        if b:
+            ratio = r["throughput"] / b["throughput"]
+            rows.append({**r, "ratio": ratio, "memory_ratio": r["peak_bytes"] / max(1, b["peak_bytes"]), "regression": ratio < 1 - threshold})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the simulation hot paths.")
+    parser.add_argument("--case", action="append", choices=list(cases), help="The cases to run (default is all).")
+    parser.add_argument("--full", action="store_true", help="Run 1, 100 and 10,000 loans for 1 to 30 years.")
+    parser.add_argument("--loans", type=int, nargs="+", help="The numbers of loans.")
+    parser.add_argument("--years", type=int, nargs="+", help="The numbers of years.")
+    parser.add_argument("--repeat", type=int, default=3, help="Report the best of this many runs (default 3).")
+    parser.add_argument("--save", help="Save the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare the results to this JSON file.")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="The slowdown that is a regression (default 0.10).")
+    args = parser.parse_args(argv)
+
+    loans = args.loans or (FULL_LOANS if args.full else QUICK_LOANS)
+    years = args.years or (FULL_YEARS if args.full else QUICK_YEARS)
+    results = run_all(args.case, loans, years, args.repeat)
+    if args.save:
+        save(results, args.save)
+
+    if args.baseline:
+        rows = compare(results, load(args.baseline), args.threshold)
+        print()
+        for r in rows:
+            flag = "REGRESSION" if r["regression"] else ""
+            print(f"{r['case']:<18} {r['loans']:>6,} loans {r['years']:>3} yrs  speed x{r['ratio']:>6.2f}  memory x{r['memory_ratio']:>6.2f}  {flag}")
+        return 1 if any(r["regression"] for r in rows) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Memory Benchmark
+================
+
+Reports the bytes per transaction of a portfolio run, before and after the compact transactions:
+* before: a Tx with a __dict__, copied into a list by every Statement.add_tx.
+* slots:  a Tx with __slots__.
+* frozen: the FrozenTx records of Statement.txs.
+* columns: the NumPy columns of a Statement, including the running balances and any records that it keeps.
+
+EXAMPLE USAGE:
+    python -m zinclusive.bench_memory         # 10,000 loans for 3 years, bi-weekly.
+    python -m zinclusive.bench_memory --loans 100
+"""
+
+import argparse
+import random
+import sys
+import tracemalloc
+from copy import copy
+from datetime import datetime
+from .customer import Customer
+from .loans import ZLoan
+from .period import BiWeeklyPeriod
+from .systems import CustomerSystem
+from .tx import Tx
+
+
+class DictTx:
+    "The transaction before __slots__, i.e. attributes in a __dict__."
+    def __init__(self, date, desc='', amount=0, key=None, value=None):
+        self.date = date
+        self.desc = desc
+        self.amount = amount
+        self.key = key
+        self.value = value
+        self.bal = 0
+
+
+def rows(statement):
+    "The fields of each transaction as new Python objects, so each representation counts its own dates and floats."
+    names = statement.descriptions
+    keys = statement._key[:len(statement)].tolist()
+    values = statement._value[:len(statement)].tolist()
+    for i, (date, desc, amount, bal, lBal) in enumerate(zip(statement.dates.astype(object), statement.codes.tolist(), statement.amounts.tolist(), statement.balances.tolist(), statement.lBals.tolist())):
+        key = None if keys[i] < 0 else names[keys[i]]
+        value = None if values[i] != values[i] else values[i]
+        yield date, names[desc], amount, key, value, bal, None if lBal != lBal else lBal
+
+
+def dict_txs(statement):
+    "The list of transactions the way Statement.add_tx used to build it: a copy of every Tx with an ad-hoc lBal."
+    txs = []
+    for date, desc, amount, key, value, bal, lBal in rows(statement):
+        tx = DictTx(date, desc, amount, key, value)
+        if lBal is not None:
+            tx.lBal = lBal
+        tx = copy(tx)
+        tx.bal = bal
+        txs.append(tx)
+    return txs
+
+
+def slotted_txs(statement):
+    txs = []
+    for date, desc, amount, key, value, bal, lBal in rows(statement):
+        tx = Tx(date, desc, amount, key, value, lBal)
+        tx.bal = bal
+        txs.append(tx)
+    return txs
+
+
+def frozen_txs(statement):
+    # Statement.txs is kept between calls, so clear it to count building the records.
+    statement._txList = []
+    txs = statement.txs
+    statement._txList = []
+    return txs
+
+
+def columns(statement):
+    "The bytes of every column of the statement, including the running balances, plus the records of Statement.txs if they are kept."
+    cols = (statement._date, statement._amount, statement._lBal, statement._desc, statement._key, statement._value, statement._bal, statement._carry)
+    return sum(col.nbytes for col in cols) + records(statement._txList)
+
+
+def records(txs):
+    "The bytes of a list of records and of the values that each record owns, i.e. not the shared descriptions and keys."
+    size = sys.getsizeof(txs)
+    for tx in txs:
+        size += sys.getsizeof(tx) + sum(sys.getsizeof(v) for v in tx if v is not None and not isinstance(v, str))
+    return size
+
+
+def traced(build, statement):
+    "The bytes allocated by build(statement) that are still alive."
+    tracemalloc.start()
+    try:
+        result = build(statement)
+        size = tracemalloc.get_traced_memory()[0]
+        del result
+    finally:
+        tracemalloc.stop()
+    return size
+
+
+def run(loans=10000, sample=500, seed=0):
+    """
+    Simulates the loans one at a time and returns the bytes per transaction of each representation.
+    Only one loan is alive at a time, so a large run does not need the memory of every transaction at once.
+    Every loan is simulated, but only a sample of about the given number of loans is traced since tracing is slow.
+    The columns are their allocated size, i.e. including room to grow.
+    """
+    rng = random.Random(seed)
+    start = datetime(2000, 1, 1)
+    sizes = {"before": 0, "slots": 0, "frozen": 0, "columns": 0}
+    count = 0
+    traced_count = 0
+    every = max(1, loans // sample)
+    for i in range(loans):
+        pIncome = BiWeeklyPeriod(datetime(2000, 1, rng.randint(1, 14)))
+        customer = Customer(annual_income=rng.randint(30000, 80000), pIncome=pIncome)
+        loan = ZLoan(rng.randint(1000, 9999))
+        statement = CustomerSystem(start=start, end=start, loan=loan, customer=customer).get_statement()
+        count += len(statement)
+        if i % every:
+            continue
+        traced_count += len(statement)
+        sizes["before"] += traced(dict_txs, statement)
+        sizes["slots"] += traced(slotted_txs, statement)
+        sizes["frozen"] += traced(frozen_txs, statement)
+        sizes["columns"] += columns(statement)
+    return {name: size / traced_count for name, size in sizes.items()}, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes per transaction for a portfolio of bi-weekly ZLoans.")
+    parser.add_argument("--loans", type=int, default=10000, help="The number of loans (default 10,000).")
+    parser.add_argument("--sample", type=int, default=500, help="The number of loans to trace (default 500).")
+    args = parser.parse_args()
+
+    per_tx, count = run(args.loans, args.sample)
+    print(f"{args.loans:,} loans, {count:,} transactions")
+    for name, size in per_tx.items():
+        print(f"{name:<10} {size:>8.1f} bytes/tx {size * count / 2**20:>10,.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
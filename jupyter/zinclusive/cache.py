@@ -0,0 +1,209 @@
+"""
+Simulation Cache
+================
+
+Memoizes CustomerSystem results, so rerunning a notebook or a nightly job skips the simulations that are already done.
+
+The key is a stable hash of everything that the result depends on: the loan, the customer, the income Period,
+the start and end dates, and the product parameters. The results are kept in an in-memory LRU of a bounded size,
+and optionally in a directory of pickle files that survives kernel restarts.
+The files are in a subdirectory that the cache owns, so the directory can be shared, e.g. a notebook folder.
+
+The product parameters are part of the key, so changing them misses rather than returns a stale result.
+invalidate(product) removes the results of old parameters, e.g. to reclaim the disk space after a pricing change.
+
+EXAMPLE USAGE:
+    cache = SimulationCache(maxsize=1024, path="sim_cache")
+    statement = cache.get_statement(system)  # Simulates the first time.
+    statement = cache.get_statement(system)  # Returns a copy of the cached statement.
+    cache.info()                              # CacheInfo(hits=1, misses=1, maxsize=1024, currsize=1)
+    cache.invalidate(Zinclusive)              # Forget the results of the current product parameters.
+"""
+
+import copy
+import hashlib
+import os
+import pickle
+import re
+import shutil
+from collections import OrderedDict
+from typing import NamedTuple
+from .zinclusive import Zinclusive
+
+
+# Change this when the simulation changes, so that the results on disk from an older version are not used.
+VERSION = 3
+
+# The subdirectory of the cache directory with a directory per product hash.
+STORE = "zinclusive_cache"
+_PRODUCT_DIR = re.compile("[0-9a-f]{64}")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def _canonical(x):
+    "Converts a value to builtin types with a stable repr, e.g. NumPy arrays to tuples."
+    if hasattr(x, "tolist"):
+        x = x.tolist()
+    if isinstance(x, (list, tuple)):
+        return tuple(_canonical(v) for v in x)
+    if hasattr(x, "isoformat"):
+        return x.isoformat()
+    return x
+
+
+def _copy(value):
+    "A Statement has its own copy(), else a shallow copy, e.g. of a LoanSummary."
+    return value.copy() if hasattr(value, "copy") else copy.copy(value)
+
+
+def _digest(*parts):
+    return hashlib.sha256(repr(_canonical(parts)).encode()).hexdigest()
+
+
+def product_key(product):
+    "Returns the hash of the product parameters, i.e. of Zinclusive or a ProductConfig."
+    if product is Zinclusive:
+        product = Zinclusive.config()
+    return _digest(VERSION, tuple(product._fields), tuple(product))
+
+
+def period_key(pIncome):
+    "The type, start, months and days of a Period."
+    return (type(pIncome).__name__, pIncome._start, pIncome._months, pIncome._days)
+
+
+def system_key(system, kind, end=None):
+    """
+    Returns the hash of the inputs of a CustomerSystem result.
+
+    Parameters
+    ----------
+    system : CustomerSystem
+        The system to simulate.
+    kind : str
+        The result, e.g. "statement" or "summary".
+    end : date, optional
+        The last date to simulate. Default is the default of the system.
+    """
+    loan = system.loan
+    customer = system.customer
+    return _digest(
+        VERSION,
+        kind,
+        system._start,
+        system._horizon(end),
+        (type(loan).__name__, loan.bal, loan.iBand),
+        (customer.annual_income, customer.paycheck),
+        period_key(system.pIncome),
+    )
+
+
+class SimulationCache:
+    """
+    An LRU cache of CustomerSystem results, optionally backed by a directory.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of results in memory (default is 256).
+    path : str, optional
+        The directory of the on-disk cache. Default is in memory only. The files are in its STORE subdirectory.
+    """
+    def __init__(self, maxsize=256, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self._root = os.path.join(path, STORE) if path else None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def _file(self, pkey, key):
+        return os.path.join(self._root, pkey, key + ".pkl")
+
+    def _load(self, pkey, key):
+        "Returns the result on disk, else None. A file that cannot be read is a miss."
+        if not self.path:
+            return None
+        try:
+            with open(self._file(pkey, key), "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def _store(self, pkey, key, value):
+        "Writes the result to a temporary file and renames it, so a reader never sees a partial file."
+        if not self.path:
+            return
+        file = self._file(pkey, key)
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        tmp = f"{file}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, file)
+
+    def _put(self, pkey, key, value):
+        self._entries[(pkey, key)] = value
+        self._entries.move_to_end((pkey, key))
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, system, kind, compute, end=None):
+        """
+        Returns the cached result of the system, else compute(system, end), which is then cached.
+        The cached result is never returned itself, only a copy, so the caller can change it.
+        """
+        pkey = product_key(system.product)
+        key = system_key(system, kind, end)
+        value = self._entries.get((pkey, key))
+        if value is not None:
+            self._entries.move_to_end((pkey, key))
+        else:
+            value = self._load(pkey, key)
+            if value is not None:
+                self._put(pkey, key, value)
+        if value is not None:
+            self.hits += 1
+            return _copy(value)
+
+        self.misses += 1
+        value = compute(system, end)
+        stored = _copy(value)
+        self._put(pkey, key, stored)
+        self._store(pkey, key, stored)
+        return value
+
+    def get_statement(self, system, end=None):
+        "Returns system.get_statement(end), from the cache if it was already simulated."
+        return self.get(system, "statement", lambda system, end: system.get_statement(end), end)
+
+    def summary(self, system, end=None):
+        "Returns system.summary(end), from the cache if it was already simulated."
+        return self.get(system, "summary", lambda system, end: system.summary(end), end)
+
+    def invalidate(self, product=None):
+        """
+        Removes the results of the product parameters from memory and disk. Default is every result.
+        Only the product directories of the cache are removed, nothing else in the cache directory.
+        """
+        if product is None:
+            self._entries.clear()
+            if self.path and os.path.isdir(self._root):
+                for name in os.listdir(self._root):
+                    if _PRODUCT_DIR.fullmatch(name):
+                        shutil.rmtree(os.path.join(self._root, name), ignore_errors=True)
+            return
+        pkey = product_key(product)
+        for k in [k for k in self._entries if k[0] == pkey]:
+            del self._entries[k]
+        if self.path:
+            shutil.rmtree(os.path.join(self._root, pkey), ignore_errors=True)
+
+    def info(self):
+        "Returns the hits, misses and size of the in-memory cache."
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
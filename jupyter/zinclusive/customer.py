@@ -1,4 +1,4 @@
-from period import Period
+from .period import Period
 
 class Customer:
     """
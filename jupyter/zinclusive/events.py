@@ -0,0 +1,208 @@
+"""
+Event Simulation
+================
+
+A simulation core that jumps from event to event instead of stepping every period.
+
+The events are in a priority queue ordered by date. Each event has a kind, e.g. "income" or "payment", and the handler
+that is registered for its kind adds its transactions to the statement and schedules the events that follow it,
+e.g. the next payment. The time of a simulation is proportional to the number of events, so a monthly payment with
+weekly income, or a one-off fee, costs only its own events, and a new kind of event does not slow down the main loop.
+
+The built-in events are:
+* income   The paycheck and the expenses of the period, on each income date.
+* payment  The loan payment, on each payment date from 10 days after the start. The same as CustomerSystem.
+* fee      A fee, e.g. the origination fee.
+* rate     An APR change, e.g. the APR drop after AprDropsOn payments.
+
+Events on the same date are handled in the order fee, income, payment, rate, then any other kind, then the order they
+were scheduled. So the origination fee is before the paycheck on the start date, the same as CustomerSystem.
+
+EXAMPLE USAGE:
+    system = EventSystem(start, end, ZLoan(5000), customer, pPayment=MonthlyPeriod(start))
+    system.schedule(Event(datetime(2000, 6, 1), "fee", dict(amount=25, desc="late fee")))
+    statement = system.get_statement()
+
+    @handler("bonus")
+    def on_bonus(system, event):
+        system.add_tx(Tx(event.date, "bonus", event.data["amount"]))
+"""
+
+import heapq
+import itertools
+from collections import ChainMap
+from datetime import timedelta
+from typing import NamedTuple
+from dateutil.relativedelta import relativedelta
+from .reports import Statement
+from .systems import EXPENSES, ISystem
+from .tx import Tx
+from .zinclusive import GRACE_DAYS, Zinclusive
+
+
+# The order of the kinds of events on the same date. Other kinds are after these.
+PRIORITY = {"fee": 0, "income": 1, "payment": 2, "rate": 3}
+OTHER = 9
+
+
+class Event(NamedTuple):
+    """
+    Something that happens on a date, handled by the handler of its kind.
+    """
+    date: object
+    kind: str
+    data: dict = None
+
+
+handlers = {}
+
+def handler(kind):
+    """
+    Registers the handler of a kind of event for every EventSystem. The handler is called with the system and the event.
+    A system can also have its own handlers, see EventSystem.on().
+    """
+    def register(f):
+        handlers[kind] = f
+        return f
+    return register
+
+
+class EventSystem(ISystem):
+    """
+    A system that models a customer with a periodic income paying down a loan, driven by a queue of events.
+
+    Parameters
+    ----------
+    start : date
+        The start date of the simulation.
+    end : date
+        The end date of the simulation, the default of get_statement() if it is after the start.
+    loan : ILoan
+        The loan to be paid down.
+    customer : Customer
+        The borrower.
+    product : ProductConfig, optional
+        The product parameters. Default is the current Zinclusive parameters.
+    pPayment : Period, optional
+        The loan payment period. Default is the income period of the customer.
+    """
+    def __init__(self, start, end, loan, customer, product=None, pPayment=None):
+        super().__init__()
+        self.product = Zinclusive if product is None else product
+        self._start = start
+        self._end = end
+        self.loan = loan
+        self.customer = customer
+        self.pIncome = customer.pIncome
+        self.pPayment = self.pIncome if pPayment is None else pPayment
+        self.paycheck = customer.paycheck
+        # The handlers of this system, then the registered handlers, including those registered later.
+        self.handlers = ChainMap({}, handlers)
+        self._extra = []
+        self._queue = None
+
+    def on(self, kind, f):
+        "Registers the handler of a kind of event for this system only."
+        self.handlers[kind] = f
+
+    def schedule(self, event):
+        """
+        Adds an event to the queue. Before get_statement(), the event is kept for every run of the system.
+        """
+        if self._queue is None:
+            self._extra.append(event)
+        else:
+            heapq.heappush(self._queue, (event.date, PRIORITY.get(event.kind, OTHER), next(self._seq), event))
+
+    def add_tx(self, tx):
+        "Adds a transaction to the statement of the current run."
+        self.statement.add_tx(tx)
+
+    def rate(self, apr):
+        "The interest rate per payment period of an APR, in percent, the same as CustomerSystem."
+        return self.pPayment.adjust_monthly(apr/12)
+
+    def get_statement(self, end=None, stop_at_payoff=True):
+        """
+        Returns the statement of the simulation until the end date.
+
+        Parameters
+        ----------
+        end : date, optional
+            The last date to simulate. Default is the end of the system if it is after the start, else 3 years after the start.
+        stop_at_payoff : bool, optional
+            If True, there are no more payment events after the loan is paid off (default is True).
+            Else a payment of 0 is made on each payment date, the same as CustomerSystem.get_statement.
+        """
+        if end is None:
+            end = self._end if self._end is not None and self._end > self._start else self._start + relativedelta(years=3)
+        self.statement = Statement()
+        self.bal = self.loan.bal
+        self.apr = self.product.Apr
+        self.r = self.rate(self.apr)
+        self.iPayment = 0
+        self.stop_at_payoff = stop_at_payoff
+        self._queue = []
+        self._seq = itertools.count()
+
+        d = self._start
+        self.add_tx(Tx(d, key="apr", value=self.apr))
+        self.add_tx(Tx(d, desc=f"APR={self.apr:.2f}%", key="apr", value=self.apr))
+        self.add_tx(Tx(d, key="r", value=self.r))
+        self.schedule(Event(d, "fee", dict(amount=self.product.OrigFee, desc="orig fee")))
+        k = self.pIncome._count_before(d)
+        self.schedule(Event(self.pIncome.nth(k), "income", dict(k=k)))
+        k = self.pPayment._count_before(d + timedelta(days=GRACE_DAYS))
+        self.schedule(Event(self.pPayment.nth(k), "payment", dict(k=k)))
+        for event in self._extra:
+            self.schedule(event)
+
+        queue, handlers = self._queue, self.handlers
+        try:
+            while queue:
+                event = heapq.heappop(queue)[3]
+                if event.date > end:
+                    break
+                handlers[event.kind](self, event)
+        finally:
+            self._queue = None
+        return self.statement
+
+
+@handler("income")
+def on_income(system, event):
+    system.add_tx(Tx(event.date, "paycheck", system.paycheck))
+    system.add_tx(Tx(event.date, "expenses", -EXPENSES))
+    k = event.data["k"] + 1
+    system.schedule(Event(system.pIncome.nth(k), "income", dict(k=k)))
+
+
+@handler("payment")
+def on_payment(system, event):
+    product = system.product
+    iBand = system.loan.iBand
+    bal, r = system.bal, system.r
+    pct = system.pPayment.adjust_monthly(product.MinPmtPctPrin[iBand]/100)
+    pmt = min(bal * (1+r/100), max(bal*pct, product.MinPmtFloor[iBand]))
+    system.bal = bal = bal*(1+r/100) - pmt
+    system.iPayment += 1
+    system.add_tx(Tx(event.date, "loan payment", -pmt, lBal=bal))
+    if system.iPayment == product.AprDropsOn:
+        system.schedule(Event(event.date, "rate", dict(apr=product.AprDropsTo)))
+    if system.stop_at_payoff and bal < 0.01:
+        return
+    k = event.data["k"] + 1
+    system.schedule(Event(system.pPayment.nth(k), "payment", dict(k=k)))
+
+
+@handler("fee")
+def on_fee(system, event):
+    system.add_tx(Tx(event.date, event.data.get("desc", "fee"), -event.data["amount"]))
+
+
+@handler("rate")
+def on_rate(system, event):
+    system.apr = apr = event.data["apr"]
+    system.r = system.rate(apr)
+    system.add_tx(Tx(event.date, desc=f"APR={apr:.2f}%", key="apr", value=apr))
+    system.add_tx(Tx(event.date, key="r", value=system.r))
@@ -0,0 +1,273 @@
+"""
+Instrumentation
+===============
+
+Records where the time of a simulation goes: the calls, the cumulative wall time and the retained memory blocks of each
+stage of the hot paths in period, systems, reports and loans, plus relativedelta arithmetic.
+
+Nothing is changed until profiling is switched on. enable() replaces the functions of the stages with wrappers that
+record each call, and disable() puts the original functions back, so there is no overhead when it is off.
+
+The times are cumulative, i.e. a stage includes the stages that it calls, e.g. CustomerSystem.get_statement includes
+Statement.add_tx. The time of a generator, e.g. Period.generator, is the time spent producing its values.
+The retained blocks are the net change of sys.getallocatedblocks(), i.e. the memory blocks that the stage allocated and
+kept. Blocks that are allocated and freed within the stage are not counted, so this is not the number of allocations.
+
+Setting ZINCLUSIVE_PROFILE profiles the whole process from the import of the zinclusive package, whatever the entry point.
+
+The trace is a Chrome trace event file, which flame-graph viewers such as Perfetto or speedscope can load.
+
+EXAMPLE USAGE:
+    with profiled(trace="trace.json") as profiler:
+        system.get_statement()
+    print(profiler.table())
+
+    ZINCLUSIVE_PROFILE=1 ZINCLUSIVE_TRACE=trace.json python -m zinclusive.batch book.csv --out out.csv --workers 0
+"""
+
+import atexit
+import functools
+import importlib
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+# The stages that are instrumented, as (module, name in the module).
+STAGES = [
+    ("zinclusive.period", "Period.generator"),
+    ("zinclusive.period", "Period.dates"),
+    ("zinclusive.period", "Period.nth"),
+    ("zinclusive.period", "Period.count_between"),
+    ("dateutil.relativedelta", "relativedelta.__add__"),
+    ("dateutil.relativedelta", "relativedelta.__radd__"),
+    ("zinclusive.systems", "CustomerSystem._periods"),
+    ("zinclusive.systems", "CustomerSystem.iter_events"),
+    ("zinclusive.systems", "CustomerSystem.get_statement"),
+    ("zinclusive.systems", "CustomerSystem.summary"),
+    ("zinclusive.reports", "Statement.add_tx"),
+    ("zinclusive.reports", "Statement.extend"),
+    ("zinclusive.reports", "Statement.to_frame"),
+    ("zinclusive.reports", "Report.row"),
+    ("zinclusive.reports", "Report.rows"),
+    ("zinclusive.reports", "merge"),
+    ("zinclusive.reports", "statement_report"),
+    ("zinclusive.reports", "loan_report"),
+    ("zinclusive.loans", "Loan.calc_min_pmt"),
+    ("zinclusive.loans", "Loan.calc_min_pmts"),
+    ("zinclusive.loans", "Loan.schedule"),
+    ("zinclusive.loans", "ZLoan.calc_min_pmt"),
+]
+
+# The environment variables that switch on profiling for a whole process, and write the trace when it exits.
+ENV_PROFILE = "ZINCLUSIVE_PROFILE"
+ENV_TRACE = "ZINCLUSIVE_TRACE"
+
+
+class Stage:
+    "The totals of one stage."
+    __slots__ = ('calls', 'seconds', 'retained')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.retained = 0
+
+
+class Profiler:
+    """
+    Collects the totals of each stage and, optionally, the trace events.
+
+    Parameters
+    ----------
+    trace : bool, optional
+        If True, keep an event for each call for write_trace() (default is False).
+    max_events : int, optional
+        The maximum number of trace events. Later calls are only counted in the totals (default is 1,000,000).
+    parent : Profiler, optional
+        A profiler that also records every call, e.g. the process-wide profiler around a profiled() block.
+    """
+    def __init__(self, trace=False, max_events=1000000, parent=None):
+        self.stages = {}
+        self.trace = trace
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self.parent = parent
+        self.t0 = time.perf_counter()
+
+    def record(self, name, t0, t1, retained):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = Stage()
+        stage.calls += 1
+        stage.seconds += t1 - t0
+        stage.retained += retained
+        if self.trace:
+            if len(self.events) < self.max_events:
+                self.events.append((name, t0, t1, threading.get_ident()))
+            else:
+                self.dropped += 1
+        if self.parent is not None:
+            self.parent.record(name, t0, t1, retained)
+
+    def rows(self):
+        "Returns the totals of each stage as dicts, slowest first."
+        rows = [dict(stage=name, calls=s.calls, seconds=s.seconds, us_per_call=1e6 * s.seconds / s.calls, retained=s.retained)
+                for name, s in self.stages.items()]
+        return sorted(rows, key=lambda row: -row["seconds"])
+
+    def table(self):
+        "Returns the totals as a text table."
+        from .reports import Report
+        report = Report("Stage:<34", "Calls:>12,", "Seconds:>10.4f", "us/call:>10.2f", "Retained:>10,")
+        lines = [report.header()]
+        lines += report.rows((row["stage"], row["calls"], row["seconds"], row["us_per_call"], row["retained"]) for row in self.rows())
+        return "\n".join(lines)
+
+    def write_trace(self, path):
+        "Writes the trace events as a Chrome trace event file."
+        pid = os.getpid()
+        events = [dict(name=name, ph="X", ts=1e6 * (t0 - self.t0), dur=1e6 * (t1 - t0), pid=pid, tid=tid)
+                  for name, t0, t1, tid in self.events]
+        with open(path, "w") as f:
+            json.dump(dict(traceEvents=events, displayTimeUnit="ms", otherData=dict(dropped=self.dropped)), f)
+
+
+_profiler = None
+_patched = []
+
+
+def _wrap(name, f):
+    """
+    Returns a wrapper of f that records each call, or each value of a generator, to the active profiler.
+    A generator that is abandoned, i.e. closed before it is exhausted, closes the generator that it wraps.
+    """
+    clock = time.perf_counter
+    blocks = sys.getallocatedblocks
+
+    if inspect.isgeneratorfunction(f):
+        @functools.wraps(f)
+        def generator(*args, **kwargs):
+            gen = f(*args, **kwargs)
+            try:
+                while True:
+                    b0 = blocks()
+                    t0 = clock()
+                    try:
+                        value = next(gen)
+                    except StopIteration:
+                        if _profiler:
+                            _profiler.record(name, t0, clock(), blocks() - b0)
+                        return
+                    if _profiler:
+                        _profiler.record(name, t0, clock(), blocks() - b0)
+                    yield value
+            finally:
+                gen.close()
+        return generator
+
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        b0 = blocks()
+        t0 = clock()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            if _profiler:
+                _profiler.record(name, t0, clock(), blocks() - b0)
+    return wrapper
+
+
+def _patch(module_name, path):
+    "Replaces the function of a stage with its wrapper. Returns the undo of each replacement."
+    module = importlib.import_module(module_name)
+    name = path.split(".")[-1]
+    if "." in path:
+        owner = getattr(module, path.split(".")[0])
+        original = owner.__dict__[name]
+        setattr(owner, name, _wrap(path, original))
+        return [(owner, name, original)]
+
+    # A function is also in the modules that star-imported it, e.g. loan_report in systems.
+    original = getattr(module, name)
+    wrapper = _wrap(path, original)
+    undo = []
+    for m in list(sys.modules.values()):
+        if m is not None and vars(m).get(name) is original:
+            setattr(m, name, wrapper)
+            undo.append((m, name, original))
+    return undo
+
+
+def enable(profiler=None):
+    """
+    Switches on profiling and returns the profiler that collects the totals.
+    If profiling is already on, the profiler is replaced and the stages stay instrumented.
+    """
+    global _profiler
+    if not _patched:
+        for module_name, path in STAGES:
+            _patched.extend(_patch(module_name, path))
+    _profiler = Profiler() if profiler is None else profiler
+    return _profiler
+
+
+def disable():
+    "Switches off profiling and puts the original functions back. Returns the profiler."
+    global _profiler
+    while _patched:
+        owner, name, original = _patched.pop()
+        setattr(owner, name, original)
+    profiler, _profiler = _profiler, None
+    return profiler
+
+
+def is_enabled():
+    return _profiler is not None
+
+
+@contextmanager
+def profiled(trace=None, max_events=1000000):
+    """
+    Profiles the body of a with statement, and yields the profiler.
+    Inside another profiled() or the process-wide profiling, the outer profiler also records the calls, and is the
+    active profiler again at the end.
+
+    Parameters
+    ----------
+    trace : str, optional
+        The file to write the trace events to at the end.
+    max_events : int, optional
+        The maximum number of trace events (default is 1,000,000).
+    """
+    global _profiler
+    previous = _profiler
+    profiler = enable(Profiler(trace=bool(trace), max_events=max_events, parent=previous))
+    try:
+        yield profiler
+    finally:
+        if previous is None:
+            disable()
+        else:
+            _profiler = previous
+        if trace:
+            profiler.write_trace(trace)
+
+
+def _at_exit():
+    trace = os.environ.get(ENV_TRACE)
+    profiler = disable()
+    if profiler:
+        print(profiler.table(), file=sys.stderr)
+        if trace:
+            profiler.write_trace(trace)
+
+
+if os.environ.get(ENV_PROFILE) and not is_enabled():
+    enable(Profiler(trace=bool(os.environ.get(ENV_TRACE))))
+    atexit.register(_at_exit)
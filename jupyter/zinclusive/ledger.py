@@ -0,0 +1,254 @@
+"""
+Ledger Files
+============
+
+Saves the statements of many loans in a binary columnar format and reads them back with numpy.memmap,
+so a process can slice one loan or a date range without reading the whole file.
+
+A ledger is a directory with one raw file per column, i.e. fixed-width values back to back:
+* date.bin      datetime64[us]  The date of each transaction.
+* amount.bin    float64         The amount.
+* bal.bin       float64         The running balance of the loan's statement.
+* lBal.bin      float64         The loan balance, NaN for none.
+* desc.bin      int32           The description code, i.e. an index into the descriptions.
+* key.bin       int32           The key code, -1 for none.
+* value.bin     float64         The value of the key, NaN for none.
+* offsets.bin   int64           The first transaction of each loan, and the number of transactions at the end.
+* start.bin     float64         The starting balance of each loan's statement.
+* meta.json     The version, the counts, the descriptions, and whether the dates are dates rather than datetimes.
+
+The transactions of loan i are offsets[i] to offsets[i+1]. Each loan's transactions are in date order.
+meta.json is written last, so a ledger that was not closed, e.g. after an error, cannot be opened.
+
+EXAMPLE USAGE:
+    write_ledger("book", (system.get_statement() for system in systems))
+    ledger = Ledger("book")
+    ledger.statement(42)                                  # The Statement of loan 42.
+    ledger.between(datetime(2001, 1, 1), datetime(2001, 2, 1), loan=42)  # The rows of loan 42 in January 2001.
+"""
+
+import json
+import os
+import numpy as np
+from .reports import Statement
+
+
+VERSION = 1
+
+COLUMNS = {
+    'date': 'datetime64[us]',
+    'amount': 'float64',
+    'bal': 'float64',
+    'lBal': 'float64',
+    'desc': 'int32',
+    'key': 'int32',
+    'value': 'float64',
+}
+
+
+class LedgerWriter:
+    """
+    Appends statements to a ledger, a chunk at a time, so the whole book never has to be in memory.
+
+    EXAMPLE USAGE:
+        with LedgerWriter("book") as writer:
+            for system in systems:
+                writer.add(system.get_statement())
+    """
+    def __init__(self, path, chunk=65536):
+        self.path = path
+        self.chunk = chunk
+        self._names = []
+        self._codes = {}
+        self._offsets = [0]
+        self._starts = []
+        self._buffer = []
+        self._buffered = 0
+        self._as_date = None
+        os.makedirs(path, exist_ok=True)
+        # The ledger is incomplete until it is closed, even if it replaces a complete one.
+        self._remove_meta()
+        self._files = {name: open(os.path.join(path, name + '.bin'), 'wb') for name in COLUMNS}
+
+    def _code(self, name):
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self._names)
+            self._names.append(name)
+        return code
+
+    def add(self, statement : Statement):
+        "Appends the transactions of a statement as the next loan."
+        n = len(statement)
+        codes = np.array([self._code(name) for name in statement.descriptions] + [-1], dtype=np.int32)
+        self._buffer.append({
+            'date': statement.dates,
+            'amount': statement.amounts,
+            'bal': statement.balances,
+            'lBal': statement.lBals,
+            'desc': codes[statement.codes],
+            'key': codes[statement._key[:n]],  # A key of -1 stays -1.
+            'value': statement._value[:n],
+        })
+        self._offsets.append(self._offsets[-1] + n)
+        self._starts.append(statement.start_bal)
+        if n:
+            # The same as merge(), i.e. the dates are read back as dates only if every statement was added with dates.
+            self._as_date = statement._as_date and self._as_date is not False
+        self._buffered += n
+        if self._buffered >= self.chunk:
+            self.flush()
+
+    def flush(self):
+        "Writes the buffered transactions."
+        if not self._buffer:
+            return
+        for name, dtype in COLUMNS.items():
+            np.concatenate([columns[name] for columns in self._buffer]).astype(dtype, copy=False).tofile(self._files[name])
+        self._buffer = []
+        self._buffered = 0
+
+    def _remove_meta(self):
+        try:
+            os.remove(os.path.join(self.path, 'meta.json'))
+        except FileNotFoundError:
+            pass
+
+    def abort(self):
+        "Closes the files without the metadata, so the incomplete ledger cannot be opened."
+        for f in self._files.values():
+            f.close()
+        self._remove_meta()
+
+    def close(self):
+        "Writes the rest of the transactions, the index and the metadata."
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        np.array(self._offsets, dtype=np.int64).tofile(os.path.join(self.path, 'offsets.bin'))
+        np.array(self._starts, dtype=np.float64).tofile(os.path.join(self.path, 'start.bin'))
+        meta = dict(version=VERSION, loans=len(self._starts), count=self._offsets[-1], columns=COLUMNS, descriptions=self._names,
+                    as_date=bool(self._as_date))
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_ledger(path, statements, chunk=65536):
+    """
+    Writes the statements to a ledger, one loan per statement, and returns the number of loans.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the ledger. The files are replaced if they exist.
+    statements : iterable of Statement
+        The statements, e.g. a generator so they are not all in memory at once.
+    chunk : int, optional
+        The number of transactions to buffer between writes (default is 65,536).
+    """
+    with LedgerWriter(path, chunk) as writer:
+        for statement in statements:
+            writer.add(statement)
+    return len(writer._starts)
+
+
+class Ledger:
+    """
+    A ledger on disk. The columns are memory-mapped, so only the pages that are sliced are read.
+
+    Attributes
+    ----------
+    date, amount, bal, lBal, desc, key, value : numpy.memmap
+        The columns of every transaction.
+    offsets : numpy.ndarray
+        The first transaction of each loan, and the number of transactions at the end.
+    descriptions : list of str
+        The descriptions of the codes.
+    as_date : bool
+        True if the statements were added with dates rather than datetimes, so their Statement.txs have dates.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta['version'] != VERSION:
+            raise ValueError(f"Unsupported ledger version: {meta['version']}")
+        self.descriptions = meta['descriptions']
+        self.count = meta['count']
+        self.as_date = meta.get('as_date', False)
+        self.offsets = np.fromfile(os.path.join(path, 'offsets.bin'), dtype=np.int64)
+        self.starts = np.fromfile(os.path.join(path, 'start.bin'), dtype=np.float64)
+        for name, dtype in meta['columns'].items():
+            setattr(self, name, self._map(name, dtype))
+
+    def _map(self, name, dtype):
+        # numpy.memmap cannot map an empty file.
+        if not self.count:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, name + '.bin'), dtype=dtype, mode='r', shape=(self.count,))
+
+    def __len__(self):
+        "The number of loans."
+        return len(self.starts)
+
+    def _range(self, loan):
+        if not 0 <= loan < len(self):
+            raise IndexError(f"Invalid loan: {loan}")
+        return int(self.offsets[loan]), int(self.offsets[loan + 1])
+
+    def loan(self, loan):
+        "Returns the columns of one loan as a dict of read-only views."
+        lo, hi = self._range(loan)
+        return {name: getattr(self, name)[lo:hi] for name in COLUMNS}
+
+    def between(self, start, end, loan=None):
+        """
+        Returns the columns of the transactions from start (inclusive) to end (exclusive) as a dict of arrays.
+        For one loan the dates are sorted, so only its rows in the range are read.
+        Else the whole date column is read and compared, i.e. O(n) in the size of the ledger.
+
+        Parameters
+        ----------
+        start, end : date
+            The range of dates.
+        loan : int, optional
+            The index of the loan. Default is every loan, and a "loan" column is added.
+        """
+        start = np.datetime64(start, 'us')
+        end = np.datetime64(end, 'us')
+        if loan is not None:
+            lo, hi = self._range(loan)
+            dates = self.date[lo:hi]
+            a, b = lo + np.searchsorted(dates, start), lo + np.searchsorted(dates, end)
+            return {name: np.asarray(getattr(self, name)[a:b]) for name in COLUMNS}
+        rows = np.flatnonzero((self.date >= start) & (self.date < end))
+        columns = {name: np.asarray(getattr(self, name)[rows]) for name in COLUMNS}
+        columns['loan'] = np.searchsorted(self.offsets, rows, side='right') - 1
+        return columns
+
+    def statement(self, loan):
+        "Returns the Statement of one loan."
+        columns = self.loan(loan)
+        s = Statement(float(self.starts[loan]), capacity=max(1, len(columns['amount'])))
+        n = len(columns['amount'])
+        s._date[:n] = columns['date']
+        s._amount[:n] = columns['amount']
+        s._lBal[:n] = columns['lBal']
+        s._desc[:n] = columns['desc']
+        s._key[:n] = columns['key']
+        s._value[:n] = columns['value']
+        s._n = n
+        s._names = list(self.descriptions)
+        s._codes = {name: code for code, name in enumerate(s._names)}
+        s.bal = float(columns['bal'][-1]) if n else s.start_bal
+        s._as_date = self.as_date and n > 0
+        return s
@@ -1,5 +1,6 @@
-from zinclusive import Zinclusive
-from tx import Tx
+import numpy as np
+from .zinclusive import Zinclusive
+from .tx import Tx
 
 
 class ILoan:
@@ -9,7 +10,7 @@ class ILoan:
 
     def __init__(self, bal):
         self.bal = bal
-        self.iBand = next((i for i, band in enumerate(Zinclusive.bands) if i+1 < len(Zinclusive.bands) and band[i] <= self.bal <= band[i+1]), None)
+        self.iBand = Zinclusive.get_band_index(bal)
         if self.iBand is None:
             raise Exception("Invalid balance. Does not fit in a band.")
         self.band = self.iBand + 1
@@ -138,7 +139,7 @@ class Loan(ILoan):
     term : int
         The term of the loan in months.
     pmt : float
-        The monthly payment of the loan.
+        The monthly payment of the loan, computed from the current balance, rate and term.
     mp_type : int
         The method type for calculating minimum payment.
     xl : float
@@ -184,13 +185,19 @@ class Loan(ILoan):
         """
         self.bal = bal
         self.rate = rate
+        self.term = term
         self.mp_type = mp_type
         self.xl = xl
         self.xh = xh
         self.r = r
         self.fees = fees
 
-    def calc_pmt(self, period):
+    @property
+    def pmt(self):
+        "The level payment of the current balance, rate and term, else None if there is no term."
+        return self.calc_pmt() if self.term > 0 else None
+
+    def calc_pmt(self, period=None):
         """
         Calculates the monthly payment of the loan.
 
@@ -202,9 +209,23 @@ class Loan(ILoan):
         if self.term <= 0: raise Exception("Term must be greater than 0 to call this method.")
         r = self.rate
         n = self.term
+        if r == 0: return self.bal / n
         pmt = (self.bal * r) / (1 - (1 + r) ** -n)
         return pmt
 
+    def schedule(self):
+        """
+        Calculates the amortization schedule of the loan in closed form, i.e. without stepping through the payments.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            The interest, principal and balance of each of the term payments.
+        """
+        if self.term <= 0: raise Exception("Term must be greater than 0 to call this method.")
+        interest, principal, bal = amortize([self.bal], [self.rate], [self.term])
+        return interest[0], principal[0], bal[0]
+
     def calc_min_pmt(self):
         """
         Calculates the minimum payment of the loan.
@@ -233,3 +254,93 @@ class Loan(ILoan):
 
         # Creditors typically round up to the nearest dollar making it easier for both the creditor and the debtor to handle.
         return round(f() + 0.4999)
+
+    def calc_min_pmts(self, bals):
+        """
+        Calculates the minimum payment of the loan for many balances at once, i.e. calc_min_pmt() for an array.
+
+        Parameters
+        ----------
+        bals : array_like
+            The balances.
+
+        Returns
+        -------
+        numpy.ndarray
+            The minimum payment for each balance.
+
+        Raises
+        ------
+        Exception
+            If the minimum payment type is invalid.
+        """
+        bals = np.asarray(bals, dtype=float)
+        if self.mp_type == 1:
+            f = self.r * bals
+        elif self.mp_type == 2:
+            f = np.where(bals > self.xh, self.r * bals, np.where(bals > self.xl, self.xl, bals)) + self.fees
+        else:
+            raise Exception("Invalid option")
+
+        # np.rint rounds half to even like round() does, so the results match calc_min_pmt exactly.
+        return np.rint(f + 0.4999)
+
+
+def calc_pmts(bals, rates, terms):
+    """
+    Calculates the level payment of many loans, i.e. Loan.calc_pmt() for arrays.
+
+    Parameters
+    ----------
+    bals : array_like
+        The balances of the loans.
+    rates : array_like
+        The interest rates per period, e.g. 0.12/12.
+    terms : array_like
+        The number of payments, which must be greater than 0.
+    """
+    bals, rates, terms = np.broadcast_arrays(np.asarray(bals, dtype=float), np.asarray(rates, dtype=float), np.asarray(terms))
+    if np.any(terms <= 0): raise Exception("Term must be greater than 0 to call this method.")
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(rates == 0, bals / terms, bals * rates / (1 - (1 + rates) ** -terms.astype(float)))
+
+
+def amortize(bals, rates, terms):
+    """
+    Calculates the amortization schedules of many loans at once in closed form.
+    The balance after k payments is bal*(1+r)^k - pmt*((1+r)^k - 1)/r, i.e. a geometric series.
+
+    Parameters
+    ----------
+    bals : array_like
+        The balances of the loans.
+    rates : array_like
+        The interest rates per period, e.g. 0.12/12.
+    terms : array_like
+        The number of payments, which must be greater than 0.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        The interest, principal and balance of each payment, one row per loan and one column per payment.
+        Payments after the term of a loan are NaN.
+
+    Examples
+    --------
+    interest, principal, bal = amortize([5000, 5000], [2/12, .59/12], [24, 24])
+    """
+    bals, rates, terms = np.broadcast_arrays(np.asarray(bals, dtype=float), np.asarray(rates, dtype=float), np.asarray(terms))
+    pmt = calc_pmts(bals, rates, terms)[:, None]
+    k = np.arange(int(terms.max()) + 1 if terms.size else 1)
+    b0 = bals[:, None]
+    r = rates[:, None]
+    g = (1 + r) ** k
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bal = np.where(r == 0, b0 - pmt * k, b0 * g - pmt * (g - 1) / r)
+    interest = r * bal[:, :-1]
+    principal = pmt - interest
+    bal = bal[:, 1:]
+    after = k[1:] > terms[:, None]
+    for x in (interest, principal, bal):
+        x[after] = np.nan
+    return interest, principal, bal
@@ -0,0 +1,253 @@
+"""
+Monte Carlo Engine
+==================
+
+Simulates thousands of random paths of one ZLoan at once, where the customer can miss a payment, pay part of it,
+prepay, or have their income change. The paths advance one payment period at a time as NumPy arrays, like the
+portfolio engine, and only the statistics are kept, not the paths.
+
+The rules are the same as CustomerSystem, plus the behavior of the customer each period:
+* A missed payment pays nothing, and the interest is added to the balance.
+* A partial payment pays a fraction of the minimum payment.
+* A prepayment pays a fraction of the balance more than the minimum payment.
+* An income shock multiplies the income by a lognormal factor. The chance of a missed or partial payment is divided
+  by the income, i.e. a customer with half of their income is twice as likely to miss.
+* The APR drops after AprDropsOn consecutive full payments. A missed or partial payment starts the count again.
+With no misses, partial payments or prepayments, every path is the same as CustomerSystem.
+
+The paths are run in batches. Each batch has its own random generator spawned from the seed, so the results
+are the same for a seed whatever the number of processes.
+
+EXAMPLE USAGE:
+    behavior = Behavior(p_miss=0.05, p_partial=0.05, p_income=0.02)
+    result = run(5000, BiWeeklyPeriod(datetime(2000, 1, 1)), datetime(2000, 1, 1), behavior, paths=100000, seed=1)
+    result.summary()  # The mean and quantiles of the payoff time and interest, and the fraction paid off.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+import numpy as np
+from .portfolio import payment_dates
+from .zinclusive import Zinclusive
+
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class Behavior(NamedTuple):
+    """
+    The probabilities of the customer's behavior each payment period.
+    """
+    p_miss: float = 0.0      # The chance of missing a payment.
+    p_partial: float = 0.0   # The chance of paying part of the payment.
+    partial: float = 0.5     # The fraction of the payment of a partial payment.
+    p_prepay: float = 0.0    # The chance of paying more than the payment.
+    prepay: float = 0.1      # The fraction of the balance that a prepayment adds to the payment.
+    p_income: float = 0.0    # The chance that the income changes.
+    income_sigma: float = 0.2  # The standard deviation of the log of an income change.
+
+
+class Histogram:
+    """
+    Counts values in bins of a fixed width, so the quantiles of any number of values take constant memory.
+    The mean is exact. The quantiles are to the width of a bin.
+    """
+    def __init__(self, width=1.0):
+        self.width = width
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.n = 0
+        self.total = 0.0
+
+    def add(self, values):
+        values = np.asarray(values, dtype=float)
+        if not len(values):
+            return
+        counts = np.bincount(np.maximum(0, values // self.width).astype(np.int64))
+        if len(counts) > len(self.counts):
+            self.counts = np.pad(self.counts, (0, len(counts) - len(self.counts)))
+        self.counts[:len(counts)] += counts
+        self.n += len(values)
+        self.total += values.sum()
+
+    def merge(self, other):
+        "Adds the counts of another histogram with the same width."
+        if len(other.counts) > len(self.counts):
+            self.counts = np.pad(self.counts, (0, len(other.counts) - len(self.counts)))
+        self.counts[:len(other.counts)] += other.counts
+        self.n += other.n
+        self.total += other.total
+
+    @property
+    def mean(self):
+        return self.total / self.n if self.n else np.nan
+
+    def quantile(self, q):
+        "Returns the lower edge of the bin of the q-th quantile, NaN if there are no values."
+        if not self.n:
+            return np.nan
+        i = int(np.searchsorted(np.cumsum(self.counts), q * self.n, side='left'))
+        return min(i, len(self.counts) - 1) * self.width
+
+
+class MonteCarloResult:
+    """
+    The statistics of the paths of a Monte Carlo run.
+
+    Attributes
+    ----------
+    paths : int
+        The number of paths.
+    paidOff : int
+        The number of paths that paid off the loan.
+    aprDropped : int
+        The number of paths that reached the APR drop.
+    payoff : Histogram
+        The number of payments until the loan is paid off, of the paths that paid it off.
+    interest : Histogram
+        The interest of each path until the loan is paid off or the end.
+    """
+    def __init__(self, interest_width=1.0):
+        self.paths = 0
+        self.paidOff = 0
+        self.aprDropped = 0
+        self.payoff = Histogram(1)
+        self.interest = Histogram(interest_width)
+
+    def merge(self, other):
+        self.paths += other.paths
+        self.paidOff += other.paidOff
+        self.aprDropped += other.aprDropped
+        self.payoff.merge(other.payoff)
+        self.interest.merge(other.interest)
+        return self
+
+    def summary(self, quantiles=QUANTILES):
+        "Returns the statistics as a dict."
+        result = dict(paths=self.paths, paidOff=self.paidOff / self.paths, aprDropped=self.aprDropped / self.paths)
+        for name, h in [("payoff", self.payoff), ("interest", self.interest)]:
+            result[f"{name}_mean"] = h.mean
+            for q in quantiles:
+                result[f"{name}_q{round(q*100)}"] = h.quantile(q)
+        return result
+
+
+def simulate_paths(bal, pIncome, start, behavior, paths, rng, years=3, product=Zinclusive, iBand=None, interest_width=1.0):
+    """
+    Simulates the paths of one loan and returns their statistics as a MonteCarloResult.
+
+    Parameters
+    ----------
+    bal : float
+        The starting balance of the loan.
+    pIncome : Period
+        The income period of the customer. Loan payments are due on the income dates.
+    start : date
+        The start (origination) date of the loan.
+    behavior : Behavior
+        The probabilities of the customer's behavior.
+    paths : int
+        The number of paths.
+    rng : numpy.random.Generator
+        The random generator.
+    """
+    if iBand is None:
+        iBand = Zinclusive.get_band_index(bal)
+        if iBand is None:
+            raise ValueError("Invalid balance. Does not fit in a band.")
+
+    # The same operations as CustomerSystem so the rates are identical.
+    r1 = pIncome.adjust_monthly(product.Apr/12) / 100
+    r2 = pIncome.adjust_monthly(product.AprDropsTo/12) / 100
+    pct = pIncome.adjust_monthly(product.MinPmtPctPrin[iBand]/100)
+    floor = product.MinPmtFloor[iBand]
+    m = len(payment_dates(pIncome, start, years))
+
+    b = np.full(paths, float(bal))
+    r = np.full(paths, r1)
+    income = np.ones(paths)
+    good = np.zeros(paths, dtype=np.int64)
+    dropped = np.zeros(paths, dtype=bool)
+    interest = np.zeros(paths)
+    payoff = np.full(paths, -1, dtype=np.int64)
+    active = np.ones(paths, dtype=bool)
+
+    for k in range(m):
+        idx = np.flatnonzero(active)
+        if not len(idx):
+            break
+        n = len(idx)
+        if behavior.p_income:
+            shock = rng.random(n) < behavior.p_income
+            income[idx] = np.where(shock, income[idx] * rng.lognormal(0, behavior.income_sigma, n), income[idx])
+        u = rng.random(n)
+        v = rng.random(n)
+
+        bk, rk = b[idx], r[idx]
+        owed = bk * (1 + rk)
+        due = np.minimum(owed, np.maximum(bk*pct, floor))
+        pMiss = np.minimum(1, behavior.p_miss / income[idx])
+        pPartial = np.minimum(1 - pMiss, behavior.p_partial / income[idx])
+        miss = u < pMiss
+        partial = ~miss & (u < pMiss + pPartial)
+        full = ~miss & ~partial
+        pmt = np.where(miss, 0.0, np.where(partial, due * behavior.partial, due))
+        pmt = np.where(full & (v < behavior.p_prepay), np.minimum(owed, pmt + bk * behavior.prepay), pmt)
+
+        interest[idx] += bk * rk
+        bk = owed - pmt
+        b[idx] = bk
+        g = np.where(full, good[idx] + 1, 0)
+        good[idx] = g
+        d = dropped[idx] | (g >= product.AprDropsOn)
+        dropped[idx] = d
+        r[idx] = np.where(d, r2, r1)
+
+        done = bk < 0.01
+        payoff[idx[done]] = k + 1
+        active[idx[done]] = False
+
+    result = MonteCarloResult(interest_width)
+    result.paths = paths
+    result.paidOff = int((payoff > 0).sum())
+    result.aprDropped = int(dropped.sum())
+    result.payoff.add(payoff[payoff > 0])
+    result.interest.add(interest)
+    return result
+
+
+def _run_batch(args):
+    bal, pIncome, start, behavior, paths, seed, kwargs = args
+    return simulate_paths(bal, pIncome, start, behavior, paths, np.random.default_rng(seed), **kwargs)
+
+
+def run(bal, pIncome, start, behavior=Behavior(), paths=10000, seed=0, batch=10000, workers=0, **kwargs):
+    """
+    Runs the paths of one loan in batches and returns the merged MonteCarloResult.
+    The result depends on the seed and the batch size, but not on the number of workers.
+
+    Parameters
+    ----------
+    paths : int, optional
+        The number of paths (default is 10,000).
+    seed : int, optional
+        The seed. Each batch has its own generator spawned from it (default is 0).
+    batch : int, optional
+        The number of paths per batch, i.e. the size of the arrays (default is 10,000).
+    workers : int, optional
+        The number of processes. None is the number of CPUs. 0 runs in this process (default is 0).
+    kwargs
+        The other arguments of simulate_paths, e.g. years or product.
+    """
+    sizes = [min(batch, paths - i) for i in range(0, paths, batch)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(bal, pIncome, start, behavior, size, s, kwargs) for size, s in zip(sizes, seeds)]
+    if workers == 0:
+        results = map(_run_batch, tasks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_run_batch, tasks))
+
+    total = MonteCarloResult(kwargs.get("interest_width", 1.0))
+    for result in results:
+        total.merge(result)
+    return total
@@ -0,0 +1,194 @@
+from datetime import date, datetime
+from datetime import timedelta
+from dateutil.relativedelta import relativedelta
+from copy import copy
+from typing import NamedTuple
+from .customer import Customer
+from .loans import *
+from .period import MonthlyPeriod
+from .solver import ZLoanSolver
+from .tx import Tx
+from .reports import *
+
+
+
+
+def run_statement(loan : Loan, customer : Customer, expenses, start=None, periods=None):
+    """
+    Run a statement scenario into the future, one month at a time.
+
+    Parameters
+    ----------
+    loan : Loan
+        A loan with a term. Its level payment is made each month of the term.
+    customer : Customer
+        The customer, who is paid each month.
+    expenses : float
+        The monthly expenses.
+    start : date, optional
+        The date of the first month. Default is the first day of the next month.
+    periods : int, optional
+        The number of months. Default is the term of the loan.
+    """
+    if not loan.term: raise Exception("The loan must have a term.")
+    statement = Statement()
+
+    # Start on the first day of the next month.
+    if start is None:
+        d = date.today().replace(day=1) + timedelta(days=32)
+        start = datetime.combine(d.replace(day=1), datetime.min.time())
+
+    bal = loan.bal
+    level = loan.pmt
+    for i in range(loan.term if periods is None else periods):
+        d = start + relativedelta(months=i)
+        pmt = level if i < loan.term else 0
+        bal = bal * (1 + loan.rate) - pmt
+        statement.add_tx(Tx(d, "", 0))
+        statement.add_tx(Tx(d, "paycheck", customer.paycheck))
+        statement.add_tx(Tx(d, "loan payment", -pmt, lBal=bal))
+        statement.add_tx(Tx(d, "expenses", -expenses))
+    return statement
+
+
+class Comparison(NamedTuple):
+    """
+    The monthly cash flows of a grid of competitor offers side by side with our loan, see compare().
+    The offers have one row per APR and one column per term, and the curves have a value per month of the horizon.
+    """
+    aprs: np.ndarray
+    terms: np.ndarray
+    pmt: np.ndarray        # Their level payment of each offer, (aprs, terms).
+    them: np.ndarray       # Their payment each month, (aprs, terms, months).
+    us: np.ndarray         # Our payment each month, (months,).
+    bank_them: np.ndarray  # The bank balance at the start and after each month with their loan, (aprs, terms, months+1).
+    bank_us: np.ndarray    # The bank balance at the start and after each month with our loan, (aprs, terms, months+1).
+    owed_them: np.ndarray  # Their loan balance at the horizon, (aprs, terms).
+    owed_us: float         # Our loan balance at the horizon.
+    savings: np.ndarray    # The net worth with our loan less with theirs at the horizon, (aprs, terms).
+
+    def to_frame(self):
+        "Returns the savings as a DataFrame with a row per APR and a column per term, i.e. the savings table."
+        import pandas as pd
+        return pd.DataFrame(self.savings, index=pd.Index(self.aprs, name="APR"), columns=pd.Index(self.terms, name="Term"))
+
+
+def compare(bal, aprs, terms, product=None, months=None, start_bal=0):
+    """
+    Compares every competitor offer of a grid of APRs and terms against our loan of the same balance, all at once.
+
+    As in scenario(), the customer's expenses are their paycheck less the competitor's payment, i.e. with their loan the
+    bank balance stays flat for the term. With our loan the customer keeps the difference between the two payments each
+    month. Their payments are the closed-form level payments of each offer, and ours are the payments of the product
+    from ZLoanSolver, which do not depend on the offer, so the curves of every pair are one cumulative sum.
+
+    The savings are the net worth at the horizon, i.e. the bank balance less what is still owed on the loan, so a loan
+    that is not paid off by the horizon does not count as saved money.
+
+    Parameters
+    ----------
+    bal : float
+        The balance of the loan.
+    aprs : array_like
+        Their APRs, e.g. 2 for 200%.
+    terms : array_like
+        Their terms in months.
+    product : ProductConfig, optional
+        Our product parameters. Default is the current Zinclusive parameters.
+    months : int, optional
+        The horizon in months. Default is the longest term.
+    start_bal : float, optional
+        The bank balance at the start (default is 0).
+
+    Returns
+    -------
+    Comparison
+        The payments, the bank balance curves and the savings at the horizon of each offer.
+
+    Examples
+    --------
+    savings = compare(5000, np.linspace(1, 3, 81), range(12, 61, 6)).savings
+    """
+    aprs = np.atleast_1d(np.asarray(aprs, dtype=float))
+    terms = np.atleast_1d(np.asarray(terms, dtype=int))
+    months = int(terms.max()) if months is None else months
+    rates, n = np.meshgrid(aprs / 12, terms, indexing='ij')
+    pmt = calc_pmts(bal, rates, n)
+    them = np.where(np.arange(months) < n[..., None], pmt[..., None], 0.0)
+
+    # Our payments are monthly. Only the rates of the period are used, not its dates.
+    solver = ZLoanSolver(bal, MonthlyPeriod(datetime(2000, 1, 1)), product=product)
+    us = np.diff([solver.paid(k) for k in range(months + 1)])
+
+    def bank(payments):
+        flows = np.cumsum(pmt[..., None] - payments, axis=-1)
+        return start_bal + np.concatenate((np.zeros(flows.shape[:-1] + (1,)), flows), axis=-1)
+
+    bank_them = bank(them)
+    bank_us = bank(np.broadcast_to(us, them.shape))
+
+    # Their balance after k level payments is a geometric series, 0 after the term.
+    k = np.minimum(months, n)
+    g = (1 + rates) ** k
+    with np.errstate(divide='ignore', invalid='ignore'):
+        owed_them = np.where(rates == 0, bal - pmt * k, bal * g - pmt * (g - 1) / rates)
+    owed_them = np.where(k >= n, 0.0, owed_them)
+    owed_us = solver.balance(months)
+    savings = (bank_us[..., -1] - owed_us) - (bank_them[..., -1] - owed_them)
+    return Comparison(aprs, terms, pmt, them, us, bank_them, bank_us, owed_them, owed_us, savings)
+
+
+def scenario():
+    # ================================================================================
+    term = 24 # months
+
+    # They offer a 200% loan of $5000 for 24 months.
+    them = Loan(5000, 2/12, term)
+
+    # We offer a 59% loan of $5000 for 24 months.
+    us = Loan(5000, .59/12, term)
+
+    customer = Customer()
+    loan = Loan(5000, 0.12/12, 360)
+
+
+
+    report = Report("Date:<10", "Description:<15", "Amount:>10,.2f", "Balance:>10,.2f", "Amount:>10,.2f", "Balance:>10,.2f")
+    customer = Customer(40000)
+
+    # Assume that with their loan, your expenses are your paycheck less their payment. That is, for the first month of your loan, you spend yourself down to zero balance.
+    expenses = customer.paycheck - them.calc_min_pmt()
+
+    # Use the same fixed expenses for both loan scenarios.
+    statement_them = run_statement(them, customer, expenses)
+    statement_us = run_statement(us, customer, expenses)
+
+    print(f"""
+    SUMMARY:
+    With THEM, your balance goes to zero every month and your total expenses over {term} months.
+    With US,   your balance increases over time to finally end up with ${statement_us.bal:,.2f} in your account.
+
+    THEM:  APR: {them.rate*1200:>6.2f}%   PMT: ${them.pmt:.2f}   Your monthly expenses: ${expenses:.2f}
+    US:  APR: {us.rate*1200  :>6.2f}%   PMT: ${us.pmt:.2f}
+
+                                ----------THEM---------  ----------US----------
+    {report.header()}""")
+    for i in range(len(statement_us.txs))[:999]:
+        tx_us = statement_us.txs[i]
+        tx_them = statement_them.txs[i]
+        if tx_us.desc:
+            print(report.row(tx_us.date, tx_us.desc, tx_them.amount, tx_them.bal, tx_us.amount, tx_us.bal))
+        else:
+            print()
+
+    print(f"""
+    Your bank account at the end of the {term} months:
+    With their loan:  {statement_them.txs[-1].bal:>10,.2f}
+    With   our loan:  {statement_us.txs[-1].bal:>10,.2f}
+
+    Your savings:       {statement_us.txs[-1].bal - statement_them.txs[-1].bal:>10,.2f}
+    """)
+
+
+
+
@@ -0,0 +1,427 @@
+import calendar
+from datetime import date
+from datetime import timedelta
+from dateutil.relativedelta import relativedelta
+from functools import lru_cache
+import numpy as np
+
+
+# Schedules are materialized and shared for dates in this window. Dates outside of it are computed directly.
+SCHEDULE_START = np.datetime64('1970-01-01', 'D')
+SCHEDULE_END = np.datetime64('2100-01-01', 'D')
+
+# The maximum number of materialized schedules to keep.
+SCHEDULE_CACHE_SIZE = 256
+
+
+def _interval_dates(first, step, lo, hi):
+    "Every step days from first, from lo to hi inclusive."
+    k = max(0, -((first - lo).astype(int) // step))  # The first period on or after lo.
+    return np.arange(first + k*step, hi + 1, step)
+
+
+def _grid_dates(days, lo, hi):
+    "The days of every month from lo to hi inclusive. Every month must have the days."
+    days = np.array(days)
+    months = np.arange(lo.astype('datetime64[M]'), hi.astype('datetime64[M]') + 1)
+    dates = (months.astype('datetime64[D]')[:, None] + (days - 1)).ravel()
+    return dates[(dates >= lo) & (dates <= hi)]
+
+
+def _walk_dates(start, days, lo, hi):
+    """
+    The days of the month from lo to hi inclusive for days that are not in every month, e.g. the 31st.
+    Steps one payment at a time in the same order as the generator, which skips a month that does not have the day.
+    """
+    year, month, day = start.year, start.month, start.day
+    i = next((index for index, d in enumerate(days) if d >= start.day), 0)
+    lo = lo.astype(object)
+    hi = hi.astype(object)
+    dates = []
+    while True:
+        target = days[i]
+        if not 1 <= target <= 31:
+            raise ValueError("Invalid day for monthly period.")
+        if day > target or target > calendar.monthrange(year, month)[1]:
+            # Find the next month with the target day.
+            day = 1
+            while True:
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+                if target <= calendar.monthrange(year, month)[1]:
+                    break
+        d = date(year, month, target)
+        if d > hi:
+            break
+        if d >= lo:
+            dates.append(d)
+        day = target + 1
+        i = (i+1) % len(days)
+    return np.array(dates, dtype='datetime64[D]')
+
+
+@lru_cache(maxsize=SCHEDULE_CACHE_SIZE)
+def _schedule(frequency, anchor, days):
+    """
+    Returns the materialized schedule for the window, shared by all periods with the same cycle.
+
+    Parameters
+    ----------
+    frequency : str
+        "interval" for every number of days, "grid" for days in every month, or "walk" for days not in every month.
+    anchor : int or date
+        For "interval", the days after SCHEDULE_START of the first date in the window. For "walk", the start of the period.
+        Else None since every period with the same days has the same schedule.
+    days : int or tuple
+        The number of days in the period (int) or the days in the month (tuple).
+    """
+    if frequency == "interval":
+        dates = _interval_dates(SCHEDULE_START + anchor, days, SCHEDULE_START, SCHEDULE_END - 1)
+    elif frequency == "grid":
+        dates = _grid_dates(days, SCHEDULE_START, SCHEDULE_END - 1)
+    else:
+        dates = _walk_dates(anchor, days, max(SCHEDULE_START, np.datetime64(anchor, 'D')), SCHEDULE_END - 1)
+    dates.setflags(write=False)
+    return dates
+
+
+def schedule_cache_info():
+    "Returns the hits, misses and size of the shared schedule cache."
+    return _schedule.cache_info()
+
+
+def schedule_cache_clear():
+    "Empties the shared schedule cache."
+    _schedule.cache_clear()
+
+
+class Period:
+    """
+    A class to represent a period of time.
+
+    Attributes
+    ----------
+    start : datetime
+        The start date of the period.
+    months : int, optional
+        The number of months in the period (default is 0).
+    days : int, optional
+        The number of days in the period (default is 0).
+
+    Methods
+    -------
+    __iter__():
+        Initializes the iterator.
+    __next__():
+        Returns the next date in the period.
+    """
+
+    def __init__(self, start=None, months=1, days=[1]):
+        """
+        Constructs all the necessary attributes for the period object.
+
+        Parameters
+        ----------
+        start : datetime
+            The start date of the period. Default is today.
+        months : int, optional
+            The number of months in the period (default is 1 for monthly).
+        days : int or list, optional
+            The number of days (int) in the period (default is [1]).
+            Else the days in the month (list) to pay, e.g. [1, 15] means semi-monthly on the 1st and 15th.
+
+        Examples
+        --------
+        from datetime import date
+        from .period import Period
+
+        start = date.today()
+        period = Period()  # Bi-weekly starting today.
+        period = Period(start, days=14)  # Bi-weekly.
+        period = Period(start, days=7)  # Weekly.
+        period = Period(start, months=1)  # Monthly period on the first of each month.
+        period = Period(start, days=[7, 22])  # Semi-monthly period on the 7th and 22nd of each month.
+        period = Period(start, months=1, days=[1, 15]) # Semi-monthly period on the 1st and 15th of each month.
+        """
+        if not start:
+            start = date.today()
+        self._start = start
+        self._type = ""
+        if type(days) == int:
+            # An integer days means skip that number of days and ignore the months.
+            months = 0
+        if months:
+            if months == 1:
+                self._type = "monthly"
+            elif months == 6:
+                self._type = "semi-annually"
+            if days:
+                if type(days) == list:
+                    if not len(days):
+                        raise ValueError("At least one day is required.")
+                elif type(days) == int:
+                    self._type = "monthly"
+                    days = [days]
+            else:
+                days = [1] # Paid on the first of each month
+
+        elif type(days) == int:
+            if days == 7:
+                self._type = "weekly"
+            elif days == 14:
+                self._type = "bi-weekly"
+        elif type(days) == list:
+            if not months:
+                months = 1
+            if len(days) == 1:
+                self._type = "monthly"
+            elif len(days) == 2:
+                self._type = "semi-monthly"
+
+        self._months = months
+        self._days = days
+
+    def adjust_monthly(self, x):
+        """
+        Suppose this period is semi-monthly with payments on the 1st and 15th.
+        If x is 100, then adjust_month(100) will return 50 since there are twice as many payments for semi-monthly than monthly.
+        If the APR is 0.12, and the monthly rate is 0.01, then adjust_month(0.01) will return 0.005.
+
+        Suppose this period is bi-weekly.
+        If the APR is 0.12, and the monthly rate is 0.01, then adjust_month(0.01) will return 0.004615384615385, which is 0.01 * 12 / 26.
+
+        parameters
+        ----------
+        x : float
+            Some monthly number, e.g. payment or interest.
+
+        returns
+        -------
+        float
+            The adjusted monthly number for this period.
+        """
+        if self._type == "monthly": return x
+        if self._type == "semi-monthly": return x/2
+        if self._type == "bi-weekly": return x*12/26
+        if self._type == "weekly": return x*12/52
+        raise ValueError("Invalid period type.")
+
+
+    def generator(self):
+        """
+        Returns the generator for the period.
+        """
+        now = self._start
+        if self._months:
+            if not self._days or type(self._days) != list:
+                raise ValueError("Expected a list of days for monthly period.")
+            if self._months == 1:
+                i = next((index for index, day in enumerate(self._days) if day >= self._start.day), 0)
+
+                while True:
+                    count = 0
+                    while now.day != self._days[i]:
+                        now += relativedelta(days=1)
+                        count += 1
+                        if (count > 365):
+                            raise ValueError("Invalid day for monthly period.")
+                    i = (i+1) % len(self._days)
+                    yield now
+                    now += relativedelta(days=1)
+        elif type(self._days) == int and self._days > 0:
+            yield now
+            while True:
+                now += relativedelta(days=self._days)
+                yield now
+        else:
+            raise ValueError("Invalid period.")
+
+    def __iter__(self):
+        return iter(self.generator())
+
+
+    def _frequency(self):
+        """
+        Returns how the dates are calculated: "interval", "grid", "walk", or None if there are no dates.
+        """
+        if self._months:
+            if not self._days or type(self._days) != list:
+                raise ValueError("Expected a list of days for monthly period.")
+            if self._months != 1:
+                return None
+            days = self._days
+            if all(a < b for a, b in zip(days, days[1:])) and days[0] >= 1 and days[-1] <= 28:
+                return "grid"
+            return "walk"
+        elif type(self._days) == int and self._days > 0:
+            return "interval"
+        raise ValueError("Invalid period.")
+
+    def _shared_schedule(self):
+        """
+        Returns the shared materialized schedule for this period's cycle and the index of the period's first date in it.
+        """
+        frequency = self._frequency()
+        first = np.datetime64(self._start, 'D')
+        if frequency == "interval":
+            dates = _schedule(frequency, int((first - SCHEDULE_START).astype(int) % self._days), self._days)
+        elif frequency == "grid":
+            dates = _schedule(frequency, None, tuple(self._days))
+        elif first >= SCHEDULE_START:
+            start = self._start if type(self._start) == date else self._start.date()
+            dates = _schedule(frequency, start, tuple(self._days))
+        else:
+            # Too early to share, so step through this period's own schedule.
+            return _walk_dates(self._start, self._days, first, SCHEDULE_END - 1), 0
+        return dates, int(np.searchsorted(dates, first))
+
+    def _to_date(self, d):
+        "Converts a datetime64 from the schedule to the same type as the generator, e.g. a datetime with the start's time."
+        return self._start + timedelta(days=int((d - np.datetime64(self._start, 'D')).astype(int)))
+
+    def _grid_position(self, d):
+        "The number of days in the grid before d, counting from the first month of the epoch."
+        d = np.datetime64(d, 'D')
+        month = int(d.astype('datetime64[M]').astype(int))
+        day = int((d - d.astype('datetime64[M]')).astype(int)) + 1
+        return month * len(self._days) + sum(1 for x in self._days if x < day)
+
+
+    def dates(self, start=None, end=None):
+        """
+        Returns the dates of the period from start to end (inclusive) as an array, computed directly with calendar arithmetic.
+        These are the same dates as the generator, but without stepping day by day.
+        Dates in the shared window are sliced from the schedule cache so periods with the same cycle share one schedule.
+
+        Parameters
+        ----------
+        start : date, optional
+            The first date to include. Default is the start of the period.
+        end : date
+            The last date to include.
+
+        Returns
+        -------
+        numpy.ndarray
+            The dates as datetime64[D], i.e. to the day.
+
+        Examples
+        --------
+        period = SemiMonthlyPeriod(datetime(2000, 1, 1), days=[7, 22])
+        period.dates(end=datetime(2000, 3, 1))  # ['2000-01-07', '2000-01-22', '2000-02-07', '2000-02-22']
+        """
+        if end is None:
+            raise ValueError("An end date is required.")
+        first = np.datetime64(self._start, 'D')
+        lo = first if start is None else max(first, np.datetime64(start, 'D'))
+        hi = np.datetime64(end, 'D')
+        frequency = self._frequency()
+        if hi < lo or frequency is None:
+            return np.array([], dtype='datetime64[D]')
+
+        if SCHEDULE_START <= lo and hi < SCHEDULE_END:
+            dates, _ = self._shared_schedule()
+            return dates[np.searchsorted(dates, lo):np.searchsorted(dates, hi, side='right')]
+
+        if frequency == "interval":
+            return _interval_dates(first, self._days, lo, hi)
+        if frequency == "grid":
+            return _grid_dates(self._days, lo, hi)
+        return _walk_dates(self._start, self._days, lo, hi)
+
+
+    def nth(self, k):
+        """
+        Returns the k-th date of the period, counting from 0, i.e. the same as the k-th date of the generator.
+        """
+        if k < 0:
+            raise IndexError("The index must not be negative.")
+        frequency = self._frequency()
+        if frequency is None:
+            raise IndexError("The period has no dates.")
+        if frequency == "interval":
+            return self._start + timedelta(days=k*self._days)
+        if frequency == "grid":
+            n = len(self._days)
+            i = self._grid_position(self._start) + k
+            d = np.datetime64(i // n, 'M').astype('datetime64[D]') + (self._days[i % n] - 1)
+            return self._to_date(d)
+        dates, i = self._shared_schedule()
+        if i + k >= len(dates):
+            # Past the shared window, so walk on from its end. Each day of the month is in at least every other month.
+            extra = i + k - len(dates)
+            lo = max(SCHEDULE_END, np.datetime64(self._start, 'D'))
+            dates = _walk_dates(self._start, self._days, lo, lo + 62*(extra + 1))
+            return self._to_date(dates[extra])
+        return self._to_date(dates[i + k])
+
+    def _count_before(self, d):
+        "The number of dates of the period before d."
+        frequency = self._frequency()
+        if frequency is None:
+            return 0
+        first = np.datetime64(self._start, 'D')
+        d = np.datetime64(d, 'D')
+        if frequency == "interval":
+            return max(0, int(-((first - d).astype(int) // self._days)))
+        if frequency == "grid":
+            return max(0, self._grid_position(d) - self._grid_position(first))
+        if d >= SCHEDULE_END:
+            return len(self.dates(end=d - 1))
+        dates, i = self._shared_schedule()
+        return max(0, int(np.searchsorted(dates, d)) - i)
+
+    def count_between(self, a, b):
+        """
+        Returns the number of dates of the period from a (inclusive) to b (exclusive), to the day.
+        """
+        if b <= a:
+            return 0
+        return self._count_before(b) - self._count_before(a)
+
+    def index_of(self, d):
+        """
+        Returns the index of the date in the period, i.e. period.nth(period.index_of(d)) == d.
+
+        Raises
+        ------
+        ValueError
+            If the date is not in the period.
+        """
+        k = self._count_before(d)
+        if self._frequency() is None or np.datetime64(self.nth(k), 'D') != np.datetime64(d, 'D'):
+            raise ValueError(f"{d} is not in the period.")
+        return k
+
+
+    def num_periods(self, months=12):
+        """
+        Returns the number of periods in the given number of months.
+        """
+        end = self._start + relativedelta(months=months)
+        return self.count_between(self._start, end)
+
+class MonthlyPeriod(Period):
+    """
+    A class to represent a monthly period of time.
+    """
+    def __init__(self, start):
+        super().__init__(start, months=1)
+
+
+class SemiMonthlyPeriod(Period):
+    """
+    A class to represent a semi-monthly period of time.
+    """
+    def __init__(self, start, days=[1, 15]):
+        super().__init__(start, months=1, days=days)
+
+
+class BiWeeklyPeriod(Period):
+    """
+    A class to represent a bi-weekly period of time.
+    """
+    def __init__(self, start):
+        super().__init__(start, days=14)
+
+
+
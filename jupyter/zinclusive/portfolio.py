@@ -0,0 +1,142 @@
+"""
+Portfolio Engine
+================
+
+Simulates many ZLoans at once. Every loan is advanced one payment period at a time, but all loans advance
+together as NumPy arrays instead of one Python loop per loan as in CustomerSystem.get_statement.
+
+The rules are the same as CustomerSystem.get_statement:
+* No payment is required before 10 days after the loan starts.
+* The payment is max(MinPmtPctPrin * bal, MinPmtFloor) for the band, capped at the payoff amount bal*(1+r).
+* After AprDropsOn payments the APR drops to AprDropsTo.
+* The simulation runs for 3 years from the start.
+
+EXAMPLE USAGE:
+    bals = [5000, 2500, 8000]
+    pIncomes = [BiWeeklyPeriod(datetime(2000, 1, 1)), MonthlyPeriod(datetime(2000, 1, 1)), SemiMonthlyPeriod(datetime(2000, 1, 1))]
+    result = simulate(bals, pIncomes=pIncomes, starts=datetime(2000, 1, 1))
+    result.bal[0]  # Loan balance after each payment of the first loan.
+"""
+
+from datetime import date
+from datetime import timedelta
+from dateutil.relativedelta import relativedelta
+import numpy as np
+from .period import Period
+from .zinclusive import GRACE_DAYS, Zinclusive
+
+
+class PortfolioResult:
+    """
+    The per-period results of a portfolio simulation.
+
+    Each matrix has one row per loan and one column per payment period. Periods past the end of a loan's
+    schedule are NaN (or NaT for dates).
+
+    Attributes
+    ----------
+    dates : numpy.ndarray
+        The payment dates (datetime64[D]).
+    bal : numpy.ndarray
+        The loan balance after each payment.
+    pmt : numpy.ndarray
+        The loan payment for each period.
+    apr : numpy.ndarray
+        The APR used to calculate the interest for each period.
+    n : numpy.ndarray
+        The number of payment periods of each loan.
+    """
+    def __init__(self, dates, bal, pmt, apr, n):
+        self.dates = dates
+        self.bal = bal
+        self.pmt = pmt
+        self.apr = apr
+        self.n = n
+
+    def __len__(self):
+        return len(self.n)
+
+
+def payment_dates(pIncome : Period, start : date, years=3):
+    """
+    Returns the dates that a loan payment is due, i.e. the income dates from the 10th day after the start
+    to the end of the simulation.
+    """
+    end = start + relativedelta(years=years)
+    return pIncome.dates(start + timedelta(days=GRACE_DAYS), end)
+
+
+def _broadcast(x, n):
+    "Repeat a single value n times, else return the sequence as a list."
+    if isinstance(x, (list, tuple, np.ndarray)):
+        if len(x) != n:
+            raise ValueError(f"Expected {n} values but got {len(x)}.")
+        return list(x)
+    return [x] * n
+
+
+def simulate(bals, iBands=None, pIncomes=None, starts=None, years=3, product=Zinclusive):
+    """
+    Simulates a portfolio of ZLoans in one pass.
+
+    Parameters
+    ----------
+    bals : array_like
+        The starting balance of each loan.
+    iBands : array_like, optional
+        The band index of each loan into Zinclusive.bands. Default is the band of the starting balance.
+    pIncomes : Period or list of Period
+        The income period of each customer, e.g. bi-weekly. Loan payments are made on the income dates.
+    starts : date or list of date
+        The start (origination) date of each loan.
+    years : int, optional
+        The number of years to simulate (default is 3).
+    product : ProductConfig, optional
+        The product parameters (default is Zinclusive).
+
+    Returns
+    -------
+    PortfolioResult
+        The per-period dates, balances, payments and APRs.
+    """
+    bals = np.asarray(bals, dtype=float)
+    n = len(bals)
+    if iBands is None:
+        iBands = Zinclusive.get_band_index(bals)
+        if (iBands == Zinclusive.NoBand).any():
+            raise ValueError("Invalid balance. Does not fit in a band.")
+    iBands = np.asarray(iBands, dtype=int)
+    pIncomes = _broadcast(pIncomes, n)
+    starts = _broadcast(starts, n)
+
+    # The rates are the same as CustomerSystem.get_statement, i.e. adjusted from monthly to the income period.
+    # They are calculated per loan with the same operations so the results are identical.
+    r1 = np.array([p.adjust_monthly(product.Apr/12) for p in pIncomes])
+    r2 = np.array([p.adjust_monthly(product.AprDropsTo/12) for p in pIncomes])
+    pct = np.array([p.adjust_monthly(product.MinPmtPctPrin[i]/100) for p, i in zip(pIncomes, iBands)])
+    floor = np.asarray(product.MinPmtFloor)[iBands]
+
+    schedules = [payment_dates(p, s, years) for p, s in zip(pIncomes, starts)]
+    counts = np.array([len(s) for s in schedules], dtype=int)
+    m = int(counts.max()) if n else 0
+
+    dates = np.full((n, m), np.datetime64('NaT'), dtype='datetime64[D]')
+    for i, s in enumerate(schedules):
+        dates[i, :len(s)] = s
+    out_bal = np.full((n, m), np.nan)
+    out_pmt = np.full((n, m), np.nan)
+    out_apr = np.full((n, m), np.nan)
+
+    bal = bals.copy()
+    for k in range(m):
+        active = k < counts
+        dropped = k >= product.AprDropsOn
+        r = r2 if dropped else r1
+        payoff = bal * (1 + r/100)
+        pmt = np.minimum(payoff, np.maximum(bal*pct, floor))
+        bal = np.where(active, payoff - pmt, bal)
+        out_bal[active, k] = bal[active]
+        out_pmt[active, k] = pmt[active]
+        out_apr[active, k] = product.AprDropsTo if dropped else product.Apr
+
+    return PortfolioResult(dates, out_bal, out_pmt, out_apr, counts)
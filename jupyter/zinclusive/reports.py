@@ -0,0 +1,633 @@
+import bisect
+import csv
+import heapq
+import itertools
+import numbers
+from datetime import date, datetime
+from .loans import *
+from .tx import FrozenTx
+import numpy as np
+
+class Statement:
+    """
+    A balance and a list of transactions that affect the balance.
+    By default, we start with no money in the bank.
+
+    The transactions are stored in columns, i.e. growable NumPy arrays of dates, amounts, loan balances and description codes.
+    The running balances are the cumulative sum of the amounts.
+    The running balances, the loan balances, the totals and txs are brought up to date when they are used, from the
+    transactions added since they were last used, so adding and reading in a loop is linear rather than quadratic.
+    The date index is kept the same way while the transactions are added in date order, the usual case, so balance_at(),
+    loan_balance_at() and total_between() are binary searches even between appends. A transaction before the last date
+    makes the index a view that is sorted again when it is first used after a transaction is added.
+
+    The transactions of txs are immutable FrozenTx records built from the columns, not the Tx objects that were added,
+    so they cannot be changed. A date comes back as a date if every transaction was added with a date, else a datetime.
+    The monthly totals are rolled up incrementally, i.e. only the transactions added since the last call are read.
+    """
+    def __init__(self, bal = 0, capacity = 64):
+        self.bal = bal
+        self.start_bal = bal
+        self._n = 0
+        self._date = np.empty(capacity, dtype='datetime64[us]')
+        self._amount = np.empty(capacity)
+        self._lBal = np.empty(capacity)
+        self._desc = np.empty(capacity, dtype=np.int32)
+        self._key = np.empty(capacity, dtype=np.int32)
+        self._value = np.empty(capacity)
+        # The running balance and the carried-forward loan balance of the first _seen transactions, and their totals.
+        self._bal = np.empty(capacity)
+        self._carry = np.empty(capacity)
+        self._seen = 0
+        self._total = {}
+        self._txList = []
+        # True if every transaction was added with a date rather than a datetime.
+        self._as_date = False
+        # Interned descriptions and keys, e.g. "paycheck" is stored as its code.
+        self._names = []
+        self._codes = {}
+        # Whether the first _ordered transactions are in date order, and the dates and running totals of each description.
+        self._ordered = 0
+        self._in_order = True
+        self._byDesc = {}
+        self._described = 0
+        # The views of the first _viewed transactions.
+        self._views = {}
+        self._viewed = 0
+        # The monthly totals by (month, code) of the first _rolled transactions.
+        self._monthly = {}
+        self._rolled = 0
+
+    def __len__(self):
+        return self._n
+
+    def _code(self, name):
+        "Returns the code of the description or key, adding it if it is new."
+        code = self._codes.get(name)
+        if code is None:
+            code = len(self._names)
+            self._codes[name] = code
+            self._names.append(name)
+        return code
+
+    def _reserve(self, n):
+        "Grows the columns to hold at least n transactions."
+        capacity = len(self._amount)
+        if n <= capacity:
+            return
+        while capacity < n:
+            capacity = max(1, capacity * 2)
+        for name in ('_date', '_amount', '_lBal', '_desc', '_key', '_value', '_bal', '_carry'):
+            old = getattr(self, name)
+            col = np.empty(capacity, dtype=old.dtype)
+            col[:self._n] = old[:self._n]
+            setattr(self, name, col)
+
+    def add_tx(self, tx):
+        i = self._n
+        self._reserve(i + 1)
+        self._date[i] = tx.date
+        if i == 0:
+            self._as_date = type(tx.date) is date
+        elif self._as_date and type(tx.date) is not date:
+            self._as_date = False
+        self._amount[i] = tx.amount
+        self._lBal[i] = np.nan if tx.lBal is None else tx.lBal
+        self._desc[i] = self._code(tx.desc)
+        self._key[i] = -1 if tx.key is None else self._code(tx.key)
+        self._value[i] = np.nan if tx.value is None else tx.value
+        self._n = i + 1
+        self.bal = self.bal + tx.amount
+
+    def extend(self, dates, descs, amounts, lBals=None):
+        """
+        Adds many transactions at once.
+
+        Parameters
+        ----------
+        dates : array_like
+            The dates of the transactions.
+        descs : array_like
+            The descriptions of the transactions.
+        amounts : array_like
+            The amounts of the transactions.
+        lBals : array_like, optional
+            The loan balances after the transactions, NaN for none.
+        """
+        amounts = np.asarray(amounts, dtype=float)
+        i, n = self._n, len(amounts)
+        self._reserve(i + n)
+        self._as_date = (i == 0 or self._as_date) and all(type(d) is date for d in dates)
+        self._date[i:i+n] = np.asarray(dates, dtype='datetime64[us]')
+        self._amount[i:i+n] = amounts
+        self._lBal[i:i+n] = np.nan if lBals is None else lBals
+        self._desc[i:i+n] = [self._code(desc) for desc in descs]
+        self._key[i:i+n] = -1
+        self._value[i:i+n] = np.nan
+        self._n = i + n
+        self.bal = self.bal + amounts.sum()
+
+    def copy(self):
+        "Returns a copy of the statement with its own columns, trimmed to the number of transactions."
+        s = Statement(self.start_bal, capacity=max(1, self._n))
+        for name in ('_date', '_amount', '_lBal', '_desc', '_key', '_value'):
+            getattr(s, name)[:self._n] = getattr(self, name)[:self._n]
+        s._n = self._n
+        s.bal = self.bal
+        s._names = list(self._names)
+        s._codes = dict(self._codes)
+        s._as_date = self._as_date
+        return s
+
+    def _catch_up(self):
+        "Adds the transactions since the last call to the running balances, the loan balances and the totals."
+        m, n = self._seen, self._n
+        if m == n:
+            return
+        amounts = self._amount[m:n]
+        # The same sums in the same order as a cumulative sum of every amount, so the balances do not depend on when they are read.
+        self._bal[m:n] = np.cumsum(np.concatenate(([self._bal[m - 1] if m else self.start_bal], amounts)))[1:]
+        self._carry[m:n] = _carry_forward(np.concatenate(([self._carry[m - 1] if m else np.nan], self._lBal[m:n])))[1:]
+        codes = self._desc[m:n]
+        sums = np.bincount(codes, weights=amounts)
+        total = self._total
+        for code in np.flatnonzero(np.bincount(codes)).tolist():
+            name = self._names[code]
+            total[name] = total.get(name, 0.0) + float(sums[code])
+        self._seen = n
+
+    def _view(self, name):
+        "Returns a cached view, else None. The views are dropped once a transaction is added."
+        if self._viewed != self._n:
+            self._views.clear()
+            self._viewed = self._n
+        return self._views.get(name)
+
+    @property
+    def dates(self):
+        "The dates of the transactions."
+        return self._date[:self._n]
+
+    @property
+    def amounts(self):
+        "The amounts of the transactions."
+        return self._amount[:self._n]
+
+    @property
+    def lBals(self):
+        "The loan balances after the transactions, NaN for none."
+        return self._lBal[:self._n]
+
+    @property
+    def codes(self):
+        "The description codes of the transactions, i.e. indexes into descriptions."
+        return self._desc[:self._n]
+
+    @property
+    def descriptions(self):
+        "The unique descriptions in the order they were first added."
+        return self._names
+
+    @property
+    def balances(self):
+        "The running balance after each transaction."
+        self._catch_up()
+        return self._bal[:self._n]
+
+    @property
+    def loan_balances(self):
+        "The loan balance after each transaction, carried forward from the last transaction that changed it, NaN before."
+        self._catch_up()
+        return self._carry[:self._n]
+
+    def _is_sorted(self):
+        "Returns True if the transactions are in date order. Only the dates added since the last call are checked."
+        m, n = self._ordered, self._n
+        if m < n and self._in_order:
+            dates = self._date[max(m - 1, 0):n]
+            self._in_order = not (dates[1:] < dates[:-1]).any()
+        self._ordered = n
+        return self._in_order
+
+    def _index(self):
+        """
+        Returns the date index: the dates in order, and the balance and the loan balance after each of them.
+        A statement is usually in date order already, else the transactions are sorted by date, keeping their order on the same date.
+        """
+        if self._is_sorted():
+            return self.dates, self.balances, self.loan_balances
+        index = self._view('index')
+        if index is None:
+            dates = self.dates
+            if len(dates) > 1 and (dates[1:] < dates[:-1]).any():
+                order = np.argsort(dates, kind='stable')
+                dates = dates[order]
+                bals = np.cumsum(np.concatenate(([self.start_bal], self.amounts[order])))[1:]
+                lBals = _carry_forward(self.lBals[order])
+            else:
+                bals = self.balances
+                lBals = self.loan_balances
+            index = self._views['index'] = (dates, bals, lBals)
+        return index
+
+    def _balance(self, d, side):
+        dates, bals, _ = self._index()
+        i = int(np.searchsorted(dates, np.datetime64(d, 'us'), side=side))
+        return float(bals[i - 1]) if i else self.start_bal
+
+    def balance_at(self, d):
+        "Returns the balance after the transactions on or before the date."
+        return self._balance(d, 'right')
+
+    def loan_balance_at(self, d):
+        "Returns the loan balance after the transactions on or before the date, else None if no transaction has changed it."
+        dates, _, lBals = self._index()
+        i = int(np.searchsorted(dates, np.datetime64(d, 'us'), side='right'))
+        lBal = lBals[i - 1] if i else np.nan
+        return None if np.isnan(lBal) else float(lBal)
+
+    def total_between(self, a, b, desc=None):
+        """
+        Returns the total amount of the transactions from a (inclusive) to b (exclusive), e.g. the payments in a quarter.
+
+        Parameters
+        ----------
+        a, b : date
+            The range of dates.
+        desc : str, optional
+            Only the transactions with this description. Default is every transaction.
+        """
+        if desc is None:
+            return self._balance(b, 'left') - self._balance(a, 'left')
+        code = self._codes.get(desc)
+        if code is None:
+            return 0.0
+        if self._is_sorted():
+            self._describe()
+            dates, sums = self._byDesc.get(code, ([], [0.0]))
+            lo = bisect.bisect_left(dates, _micros(a))
+            hi = bisect.bisect_left(dates, _micros(b))
+            return sums[hi] - sums[lo] if hi > lo else 0.0
+        index = self._view(('desc', code))
+        if index is None:
+            rows = np.flatnonzero(self.codes == code)
+            order = np.argsort(self.dates[rows], kind='stable')
+            rows = rows[order]
+            index = self._views[('desc', code)] = (self.dates[rows], np.concatenate(([0.0], np.cumsum(self.amounts[rows]))))
+        dates, sums = index
+        lo, hi = np.searchsorted(dates, [np.datetime64(a, 'us'), np.datetime64(b, 'us')], side='left')
+        return float(sums[hi] - sums[lo]) if hi > lo else 0.0
+
+    def _describe(self):
+        "Adds the transactions since the last call to the dates and the running totals of their descriptions."
+        m, n = self._described, self._n
+        if m == n:
+            return
+        codes = self._desc[m:n]
+        dates = self._date[m:n].astype(np.int64)
+        amounts = self._amount[m:n]
+        for code in np.unique(codes).tolist():
+            rows = codes == code
+            entry = self._byDesc.get(code)
+            if entry is None:
+                entry = self._byDesc[code] = ([], [0.0])
+            entry[0].extend(dates[rows].tolist())
+            entry[1].extend(np.cumsum(np.concatenate(([entry[1][-1]], amounts[rows])))[1:].tolist())
+        self._described = n
+
+    def monthly(self):
+        """
+        Returns the total amount of each description in each month, as {month: {description: total}} in month order,
+        e.g. {"2000-01": {"paycheck": 2933.33, "expenses": -2803.33}}.
+        Only the transactions added since the last call are rolled up.
+        """
+        n = self._n
+        if self._rolled < n:
+            lo = self._rolled
+            months = self._date[lo:n].astype('datetime64[M]').astype(np.int64)
+            keys, inverse = np.unique(months * (1 << 31) + self._desc[lo:n], return_inverse=True)
+            sums = np.bincount(inverse.ravel(), weights=self._amount[lo:n])
+            monthly = self._monthly
+            for key, total in zip(keys.tolist(), sums.tolist()):
+                key = divmod(key, 1 << 31)
+                monthly[key] = monthly.get(key, 0.0) + total
+            self._rolled = n
+        result = {}
+        for month, code in sorted(self._monthly):
+            result.setdefault(str(np.datetime64(month, 'M')), {})[self._names[code]] = self._monthly[(month, code)]
+        return result
+
+    def _txs(self, lo, hi):
+        "Returns the transactions from lo to hi as a list of FrozenTx."
+        names = self._names
+        keys = [None if key < 0 else names[key] for key in self._key[lo:hi].tolist()]
+        values = [None if value != value else value for value in self._value[lo:hi].tolist()]
+        lBals = [None if lBal != lBal else lBal for lBal in self._lBal[lo:hi].tolist()]
+        descs = [names[desc] for desc in self._desc[lo:hi].tolist()]
+        dates = self._date[lo:hi].astype('datetime64[D]' if self._as_date else 'datetime64[us]').astype(object)
+        return list(map(FrozenTx, dates, descs, self._amount[lo:hi].tolist(), keys, values, lBals, self.balances[lo:hi].tolist()))
+
+    def __iter__(self):
+        "Yields the transactions as FrozenTx, building them a chunk at a time."
+        chunk = 1024
+        for lo in range(0, self._n, chunk):
+            yield from self._txs(lo, min(lo + chunk, self._n))
+
+    @property
+    def txs(self):
+        "The transactions as a list of FrozenTx. The list is extended, not rebuilt, as transactions are added."
+        txs = self._txList
+        if len(txs) < self._n:
+            txs.extend(self._txs(len(txs), self._n))
+        return txs
+
+    @property
+    def total(self):
+        "The total amount of each description."
+        self._catch_up()
+        return dict(self._total)
+
+    def to_frame(self):
+        """
+        Returns the transactions as a DataFrame that wraps the columns without copying them.
+        """
+        import pandas as pd
+        descs = pd.Categorical.from_codes(self.codes, categories=pd.Index(self._names, dtype=object)) if self._names else pd.Categorical([])
+        return pd.DataFrame({
+            'Date': self.dates,
+            'Description': descs,
+            'Amount': self.amounts,
+            'Balance': self.balances,
+            'Loan Bal': self.lBals,
+        }, copy=False)
+
+
+
+
+def _micros(d):
+    "The microseconds since the epoch of a date, the same as the dates of a Statement as integers."
+    return int(np.datetime64(d, 'us').astype(np.int64))
+
+
+def _carry_forward(lBals):
+    "Returns the loan balances with each NaN replaced by the last balance before it, NaN before the first."
+    last = np.where(np.isnan(lBals), -1, np.arange(len(lBals)))
+    last = np.maximum.accumulate(last) if len(last) else last
+    return np.where(last >= 0, lBals[np.maximum(last, 0)], np.nan)
+
+
+
+
+class Report:
+    """
+    A simple report generator with headers and formatted columns.
+    The column specs are compiled once into a single format string for the rows.
+    EXAMPLE USAGE:
+        report = Report("Name:<15", "Balance:>10,.2f")
+        print(report.header())
+        print(report.row("Fred", 1000))
+        print(report.row("Wilma", 2000))
+        report.write([("Fred", 1000), ("Wilma", 2000)], sys.stdout)  # The header and the rows.
+        report.write([("Fred", 1000), ("Wilma", 2000)], f, mode="csv")
+    OUTPUT:
+        Name                Balance
+        ===============  ==========
+        Fred               1,000.00
+        Wilma              2,000.00
+
+    """
+    # The presentation types of a format spec, e.g. "f" in ">10,.2f". A column without one is text.
+    TYPES = set("bcdeEfFgGnosxX%")
+
+    def __init__(self, *headers):
+        self.headers = headers
+        self.names = [h.split(':')[0] for h in headers]
+        self.formats = [h.split(':')[1] if ':' in h else f"<{len(h.split(':')[0])}" for h in headers]
+        self.names_formats = [h.split(':')[1].split(',')[0].split('.')[0] if ':' in h else f"<{len(h.split(':')[0])}" for h in headers]
+        self.colSpacing = '  '
+        self._compiled = None
+        self._dates = {}
+
+    def _compile(self):
+        """
+        Compiles the column specs for the current column spacing:
+        the format string of the header, the format strings of the rows by number of columns, the text columns,
+        and the formats of the CSV fields, i.e. only the precision and type since CSV has no widths or grouping.
+        """
+        sp = self.colSpacing
+        header = ''.join(f"{{:{f}}}{sp}" for f in self.names_formats).format(*self.names) + '\n'
+        header += ''.join('=' * int(f[1:]) + sp for f in self.names_formats)
+        rows = {n: ''.join(f"{{{i}:{f}}}{sp}" for i, f in enumerate(self.formats[:n])) for n in range(len(self.formats) + 1)}
+        text = [i for i, f in enumerate(self.formats) if not f or f[-1] not in Report.TYPES]
+        csv_formats = []
+        for f in self.formats:
+            if f and f[-1] in Report.TYPES:
+                precision = f[f.index('.'):-1] if '.' in f else ''
+                csv_formats.append(f"{{:{precision}{f[-1]}}}".format)
+            else:
+                csv_formats.append(None)
+        self._compiled = (sp, header, rows, text, csv_formats)
+        return self._compiled
+
+    def _specs(self):
+        compiled = self._compiled
+        if compiled is None or compiled[0] != self.colSpacing:
+            compiled = self._compile()
+        return compiled
+
+    def _text(self, arg):
+        if type(arg) is str:
+            return arg
+        if isinstance(arg, datetime):
+            # A statement has many rows on the same date, and strftime is most of the time of a row.
+            text = self._dates.get(arg)
+            if text is None:
+                if len(self._dates) > 4096:
+                    self._dates.clear()
+                text = self._dates[arg] = arg.strftime('%Y-%m-%d')
+            return text
+        if isinstance(arg, numbers.Number):
+            return arg
+        return str(arg)
+
+    def header(self):
+        return self._specs()[1]
+
+    def row(self, *args):
+        _, _, rows, text, _ = self._specs()
+        if text:
+            args = list(args)
+            for i in text:
+                if i < len(args):
+                    args[i] = self._text(args[i])
+        return rows[len(args)].format(*args)
+
+    def rows(self, iterable):
+        """
+        Yields the formatted row of each tuple of values in the iterable.
+        """
+        _, _, rows, text, _ = self._specs()
+        fmt = rows[len(self.formats)].format
+        _text = self._text
+        for args in iterable:
+            if text:
+                args = list(args)
+                for i in text:
+                    args[i] = _text(args[i])
+            yield fmt(*args)
+
+    def csv_rows(self, iterable):
+        """
+        Yields the fields of each tuple of values in the iterable for a CSV file: dates as YYYY-MM-DD and numbers without grouping.
+        """
+        csv_formats = self._specs()[4]
+        for args in iterable:
+            yield [self._text(arg) if f is None else f(arg) for f, arg in zip(csv_formats, args)]
+
+    def write(self, iterable, fileobj, mode="text", header=True, chunk=1000):
+        """
+        Writes the header and the rows of the iterable to the file, a chunk of rows at a time.
+        Memory is constant since the rows are formatted as they are written.
+
+        Parameters
+        ----------
+        iterable : iterable of tuple
+            The values of each row.
+        fileobj : file
+            A text file, e.g. sys.stdout.
+        mode : str, optional
+            "text" for the formatted report, "csv" or "tsv" (default is "text").
+        header : bool, optional
+            If True, write the header first (default is True).
+        chunk : int, optional
+            The number of rows per write (default is 1000).
+        """
+        if mode == "text":
+            if header:
+                fileobj.write(self.header() + '\n')
+            lines = self.rows(iterable)
+            while True:
+                block = list(itertools.islice(lines, chunk))
+                if not block:
+                    break
+                fileobj.write('\n'.join(block) + '\n')
+        elif mode in ("csv", "tsv"):
+            writer = csv.writer(fileobj, delimiter=',' if mode == "csv" else '\t', lineterminator='\n')
+            if header:
+                writer.writerow(self.names)
+            rows = self.csv_rows(iterable)
+            while True:
+                block = list(itertools.islice(rows, chunk))
+                if not block:
+                    break
+                writer.writerows(block)
+        else:
+            raise ValueError(f"Invalid mode: {mode}")
+
+
+
+def imerge(*statements, totals=None):
+    """
+    Yields the transactions of the statements in date order, with the combined running balance.
+    Each statement must be in date order. Uses a heap of the next transaction of each statement, i.e. O(n log k) for k statements.
+    Transactions on the same date are in the order of the statements.
+    The dates are compared as microseconds, the same as the index of merge(), so statements of date and datetime mix.
+
+    Parameters
+    ----------
+    totals : dict, optional
+        A dict that gets the total amount of each description so far as the transactions stream,
+        i.e. the same as merge(...).total once every transaction has been yielded.
+    """
+    bal = sum(statement.start_bal for statement in statements)
+    for tx in heapq.merge(*statements, key=lambda tx: _micros(tx.date)):
+        bal = bal + tx.amount
+        if totals is not None:
+            totals[tx.desc] = totals.get(tx.desc, 0.0) + tx.amount
+        yield tx._replace(bal=bal)
+
+
+def merge(*statements):
+    """
+    Merge multiple statements into one columnar Statement, in the same order as imerge().
+    The balances and the totals are combined, i.e. the starting balance is the sum of the starting balances.
+    """
+    s = Statement(sum(statement.start_bal for statement in statements), capacity=max(1, sum(len(statement) for statement in statements)))
+    if not statements:
+        return s
+
+    # Map the description codes of each statement to the codes of the merged statement.
+    descs, keys = [], []
+    for statement in statements:
+        codes = np.array([s._code(name) for name in statement.descriptions] + [-1], dtype=np.int32)
+        descs.append(codes[statement.codes])
+        keys.append(codes[statement._key[:len(statement)]])  # A key of -1 stays -1.
+
+    dates = np.concatenate([statement.dates for statement in statements])
+    order = np.argsort(dates, kind='stable')  # Finds the sorted runs, so it merges rather than sorts.
+    n = len(order)
+    s._date[:n] = dates[order]
+    s._amount[:n] = np.concatenate([statement.amounts for statement in statements])[order]
+    s._lBal[:n] = np.concatenate([statement.lBals for statement in statements])[order]
+    s._desc[:n] = np.concatenate(descs)[order]
+    s._key[:n] = np.concatenate(keys)[order]
+    s._value[:n] = np.concatenate([statement._value[:len(statement)] for statement in statements])[order]
+    s._n = n
+    s._as_date = all(statement._as_date for statement in statements if len(statement)) and n > 0
+    s.bal = s.balances[-1] if n else s.start_bal
+    return s
+
+
+
+def statement_report(statement):
+    df = statement.to_frame()
+    df = df[df['Description'] != ''][['Date', 'Description', 'Amount', 'Balance']].reset_index(drop=True)
+    df['Description'] = df['Description'].astype(str)
+    return df
+
+
+
+def loan_report(customer, expenses, statement : Statement, loan : ILoan, report=None, numeric=False):
+    """
+    Returns the transactions of the statement with the loan balance, until the loan is paid off.
+
+    Parameters
+    ----------
+    numeric : bool, optional
+        If True, keep the dates and amounts as numbers, e.g. to aggregate them, and format them when displayed,
+        e.g. df.to_string(float_format='{:.2f}'.format). Else they are formatted as text (default is False).
+    """
+    import pandas as pd
+    columns = ['iMonth', 'Date', 'Description', 'Amount', 'Balance', "Loan Bal"]
+    if not len(statement):
+        return pd.DataFrame([], columns=columns)
+
+    names = np.array(statement.descriptions, dtype=object)
+    codes = statement.codes
+    rows = np.flatnonzero(np.array([bool(name) for name in names], dtype=bool)[codes])
+
+    # The loan balance carries forward from the last transaction that changed it.
+    lBal = statement.loan_balances[rows]
+    lBal = np.where(np.isnan(lBal), loan.bal, lBal)
+
+    # Stop at the transaction that pays off the loan.
+    paid = np.flatnonzero(lBal < 0.01)
+    if len(paid):
+        rows = rows[:paid[0] + 1]
+        lBal = lBal[:paid[0] + 1]
+
+    months = statement.dates.astype('datetime64[M]').astype(np.int64)
+    df = pd.DataFrame({
+        'iMonth': months[rows] - months[0],
+        'Date': statement.dates[rows],
+        'Description': names[codes[rows]],
+        'Amount': statement.amounts[rows],
+        'Balance': statement.balances[rows],
+        'Loan Bal': lBal,
+    }, columns=columns)
+    if numeric:
+        return df
+    df['Date'] = statement.dates[rows].astype('datetime64[D]').astype(str)
+    for column in ['Amount', 'Balance', 'Loan Bal']:
+        df[column] = np.char.mod('%.2f', df[column].to_numpy())
+    return df
@@ -0,0 +1,278 @@
+"""
+ZLoan Solver
+============
+
+Answers "when will the loan be paid off?" without simulating every period.
+
+A ZLoan balance follows a piecewise recurrence with the same rules as CustomerSystem:
+* While MinPmtPctPrin applies, i.e. bal*p > MinPmtFloor, each payment is geometric: bal*(1+r-p).
+* While MinPmtFloor applies, each payment is affine: bal*(1+r) - floor.
+* The final payment is capped at the payoff amount bal*(1+r), and the loan is paid off once bal < 0.01.
+* After AprDropsOn payments the rate r drops from Apr to AprDropsTo.
+
+Within a segment, i.e. the same regime and rate, the balance after j payments has a closed form, and the number of
+payments until the next regime switch is solved with a logarithm. So the balance at any period, the payoff period and the
+total interest take a handful of segments instead of one step per period.
+
+EXAMPLE USAGE:
+    solver = ZLoanSolver(5000, BiWeeklyPeriod(datetime(2000, 1, 1)))
+    solver.payoff_period()                   # The number of payments until the loan is paid off.
+    solver.interest()                        # The total interest until the loan is paid off.
+    solver.payoff_date(datetime(2000, 1, 1)) # The date of the final payment of a loan that starts on that date.
+"""
+
+import math
+from datetime import timedelta
+from .zinclusive import GRACE_DAYS, Zinclusive
+
+
+# The loan is paid off once the balance is less than this, the same as CustomerSystem.
+PAID_OFF = 0.01
+
+PCT = "pct"
+FLOOR = "floor"
+PAYOFF = "payoff"
+
+
+class Segment:
+    """
+    The payments from k0 to k1 with the same regime and rate, i.e. payments k0+1 to k1 (counting from 1).
+
+    Attributes
+    ----------
+    k0 : int
+        The number of payments before the segment.
+    k1 : int or float
+        The number of payments at the end of the segment, or math.inf if it never ends.
+    bal : float
+        The balance at the start of the segment, i.e. after k0 payments.
+    r : float
+        The interest rate per period, as a fraction.
+    regime : str
+        PCT, FLOOR or PAYOFF, i.e. the final payment.
+    """
+    def __init__(self, k0, k1, bal, r, regime):
+        self.k0 = k0
+        self.k1 = k1
+        self.bal = bal
+        self.r = r
+        self.regime = regime
+
+    def __repr__(self):
+        return f"Segment({self.k0}, {self.k1}, {self.bal!r}, {self.r!r}, {self.regime!r})"
+
+
+class ZLoanSolver:
+    """
+    Solves the balance of a ZLoan in closed form.
+
+    Parameters
+    ----------
+    bal : float
+        The starting balance of the loan.
+    pIncome : Period
+        The income period of the customer. A payment is made every period.
+    iBand : int, optional
+        The band index into the product bands. Default is the band of the balance.
+    product : ProductConfig, optional
+        The product parameters. Default is the current Zinclusive parameters.
+    """
+    def __init__(self, bal, pIncome, iBand=None, product=None):
+        self.product = Zinclusive if product is None else product
+        if iBand is None:
+            iBand = Zinclusive.get_band_index(bal)
+            if iBand is None:
+                raise ValueError("Invalid balance. Does not fit in a band.")
+        self.bal = bal
+        self.pIncome = pIncome
+        self.iBand = iBand
+
+        # The same operations as CustomerSystem so the rates are identical.
+        self.r1 = pIncome.adjust_monthly(self.product.Apr/12) / 100
+        self.r2 = pIncome.adjust_monthly(self.product.AprDropsTo/12) / 100
+        self.pct = pIncome.adjust_monthly(self.product.MinPmtPctPrin[iBand]/100)
+        self.floor = self.product.MinPmtFloor[iBand]
+        self.segments = self._solve()
+
+    def _rate(self, k):
+        "The rate and the number of payments that it applies until, for payment k+1."
+        if k < self.product.AprDropsOn:
+            return self.r1, self.product.AprDropsOn
+        return self.r2, math.inf
+
+    def _step(self, b, r, regime, j):
+        "The balance after j payments of the regime from the balance b."
+        if j == 0:
+            return b
+        if regime == PCT:
+            return b * (1 + r - self.pct) ** j
+        if regime == FLOOR:
+            if r == 0:
+                return b - j * self.floor
+            g = (1 + r) ** j
+            return b * g - self.floor * (g - 1) / r
+        return b * (1 + r) - min(b * (1 + r), max(b * self.pct, self.floor))
+
+    def _paid(self, b, r, regime, j):
+        "The total of j payments of the regime from the balance b."
+        if j == 0:
+            return 0.0
+        if regime == PCT:
+            g = 1 + r - self.pct
+            return b * self.pct * (j if g == 1 else (1 - g ** j) / (1 - g))
+        if regime == FLOOR:
+            return j * self.floor
+        return min(b * (1 + r), max(b * self.pct, self.floor))
+
+    def _first(self, b, r, regime, lo, done):
+        """
+        The smallest j >= 0 that done(balance after j payments) is true, starting from an estimate lo.
+        The estimate comes from a logarithm, so it is corrected by stepping to the exact boundary.
+        """
+        j = max(0, lo)
+        while j > 0 and done(self._step(b, r, regime, j - 1)):
+            j -= 1
+        while not done(self._step(b, r, regime, j)):
+            j += 1
+        return j
+
+    def _solve(self):
+        "Returns the segments from the start until the loan is paid off or the balance stops going down."
+        segments = []
+        k = 0
+        b = self.bal
+        while True:
+            r, kEnd = self._rate(k)
+            if b * self.pct > self.floor:
+                g = 1 + r - self.pct
+                if g <= 0:
+                    segments.append(Segment(k, k + 1, b, r, PAYOFF))
+                    return segments
+                if g >= 1:
+                    # The payments do not cover the interest, so the balance never reaches the floor.
+                    if kEnd == math.inf:
+                        segments.append(Segment(k, math.inf, b, r, PCT))
+                        return segments
+                    j = kEnd - k
+                else:
+                    # b*g^j*pct <= floor
+                    j = math.ceil(math.log(self.floor / (self.pct * b)) / math.log(g))
+                    j = self._first(b, r, PCT, j, lambda x: x * self.pct <= self.floor)
+                    j = min(j, kEnd - k)
+                segments.append(Segment(k, k + j, b, r, PCT))
+                b = self._step(b, r, PCT, j)
+                k += j
+                continue
+
+            # The final payment is the first one that leaves less than PAID_OFF, i.e. b*(1+r) - floor < PAID_OFF.
+            limit = (self.floor + PAID_OFF) / (1 + r)
+            if b * r >= self.floor and b >= limit:
+                # The floor does not cover the interest, so the balance grows until MinPmtPctPrin applies, if ever.
+                c = self.floor / r
+                if b > c and self.pct > 0:
+                    # c + (b-c)*(1+r)^j > floor/pct
+                    j = math.ceil(math.log((self.floor / self.pct - c) / (b - c)) / math.log(1 + r))
+                    j = self._first(b, r, FLOOR, j, lambda x: x * self.pct > self.floor)
+                    j = min(j, kEnd - k)
+                    segments.append(Segment(k, k + j, b, r, FLOOR))
+                    b = self._step(b, r, FLOOR, j)
+                    k += j
+                    continue
+                if kEnd == math.inf:
+                    # The balance stays at the fixed point c, so the loan is never paid off.
+                    segments.append(Segment(k, math.inf, b, r, FLOOR))
+                    return segments
+                j = kEnd - k
+            else:
+                if r == 0:
+                    j = math.ceil((b - limit) / self.floor)
+                else:
+                    # c + (b-c)*(1+r)^j < limit, where c = floor/r is the fixed point.
+                    c = self.floor / r
+                    j = math.ceil(math.log((c - limit) / (c - b)) / math.log(1 + r)) if b > limit else 0
+                j = self._first(b, r, FLOOR, j, lambda x: x < limit)
+                if k + j < kEnd:
+                    segments.append(Segment(k, k + j, b, r, FLOOR))
+                    b = self._step(b, r, FLOOR, j)
+                    segments.append(Segment(k + j, k + j + 1, b, r, PAYOFF))
+                    return segments
+                j = kEnd - k
+            segments.append(Segment(k, k + j, b, r, FLOOR))
+            b = self._step(b, r, FLOOR, j)
+            k += j
+
+    def _segment(self, k):
+        "The segment that contains the first k payments' end, i.e. k0 <= k <= k1."
+        for s in self.segments:
+            if k <= s.k1:
+                return s
+        return None
+
+    def balance(self, k):
+        """
+        Returns the balance after k payments.
+
+        Parameters
+        ----------
+        k : int
+            The number of payments.
+        """
+        if k < 0:
+            raise ValueError("The number of payments must not be negative.")
+        s = self._segment(k)
+        if s is None:
+            return self._step(self.segments[-1].bal, self.segments[-1].r, PAYOFF, 1)
+        return self._step(s.bal, s.r, s.regime, k - s.k0)
+
+    def paid(self, k=None):
+        """
+        Returns the total of the first k payments. Default is all of the payments until the loan is paid off.
+        """
+        k = self._last(k)
+        total = 0.0
+        for s in self.segments:
+            if k <= s.k0:
+                break
+            total += self._paid(s.bal, s.r, s.regime, min(k, s.k1) - s.k0)
+        return total
+
+    def interest(self, k=None):
+        """
+        Returns the interest of the first k payments. Default is all of the payments until the loan is paid off.
+        """
+        k = self._last(k)
+        return self.paid(k) - (self.bal - self.balance(k))
+
+    def _last(self, k):
+        if k is None:
+            k = self.payoff_period()
+            if k is None:
+                raise ValueError("The loan is never paid off.")
+        return min(k, self.payoff_period() or k)
+
+    def payoff_period(self):
+        """
+        Returns the number of payments until the loan is paid off, else None if it never is.
+        """
+        last = self.segments[-1]
+        return last.k1 if last.regime == PAYOFF else None
+
+    def switches(self):
+        """
+        Returns (k, regime, r) for each segment, i.e. the number of payments before the regime or rate switches.
+        """
+        return [(s.k0, s.regime, s.r) for s in self.segments if s.k1 > s.k0]
+
+    def payment_date(self, start, k):
+        """
+        Returns the date of payment k (counting from 1) of a loan that starts on the start date.
+        The first payment is on the first income date at least 10 days after the start.
+        """
+        return self.pIncome.nth(self.pIncome._count_before(start + timedelta(days=GRACE_DAYS)) + k - 1)
+
+    def payoff_date(self, start):
+        """
+        Returns the date of the final payment of a loan that starts on the start date, else None if it is never paid off.
+        """
+        k = self.payoff_period()
+        return None if k is None else self.payment_date(start, k)
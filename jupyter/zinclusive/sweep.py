@@ -0,0 +1,202 @@
+"""
+Parameter Sweep
+===============
+
+Reruns CustomerSystem over a grid of product parameters in parallel, without changing the Zinclusive globals.
+Each point of the grid is an immutable ProductConfig. The points are split into chunks and run in a ProcessPoolExecutor.
+Each point simulates the same scenarios (loans and customers) and is summarized by one row of metrics.
+Each row has the key of its inputs, i.e. a hash of the product parameters and the scenarios, so a results file is only
+resumed with the rows of the same inputs.
+
+EXAMPLE USAGE:
+    grid = {"Apr": [49.975, 59.975], "AprDropsOn": [7, 13]}
+    df = run_sweep(grid, results="sweep.csv")  # Rerun to resume an interrupted sweep.
+"""
+
+import csv
+import hashlib
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from .cache import period_key, product_key
+from .customer import Customer
+from .loans import ZLoan
+from .period import BiWeeklyPeriod, MonthlyPeriod, SemiMonthlyPeriod
+from .systems import CustomerSystem
+from .zinclusive import Zinclusive
+
+
+METRICS = ["interest", "fees", "paid", "payments", "bal", "paidOff", "aprDropped"]
+
+
+class Scenario:
+    """
+    A loan and customer to simulate for every point of a sweep.
+    """
+    def __init__(self, bal, pIncome, start, annual_income=40000):
+        self.bal = bal
+        self.pIncome = pIncome
+        self.start = start
+        self.annual_income = annual_income
+
+    def key(self):
+        "The inputs of the scenario, e.g. for the key of a point."
+        return (self.bal, period_key(self.pIncome), self.start.isoformat(), self.annual_income)
+
+    def summary(self, product):
+        customer = Customer(annual_income=self.annual_income, pIncome=self.pIncome)
+        system = CustomerSystem(start=self.start, end=self.start, loan=ZLoan(self.bal), customer=customer, product=product)
+        return system.summary()
+
+
+def default_scenarios():
+    "A loan in each band for each income period."
+    start = datetime(2000, 1, 1)
+    periods = [BiWeeklyPeriod(start), SemiMonthlyPeriod(start), MonthlyPeriod(start)]
+    return [Scenario(bal, pIncome, start) for bal in [1500, 3000, 5500, 8500] for pIncome in periods]
+
+
+def expand(grid):
+    """
+    Returns every combination of the grid as a list of dicts, in a stable order.
+
+    Parameters
+    ----------
+    grid : dict
+        The values of each product parameter, e.g. {"Apr": [49.975, 59.975], "AprDropsOn": [7, 13]}.
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def point_key(product, scenarios):
+    "Returns the hash of the inputs of a point, i.e. the product parameters and the scenarios."
+    return hashlib.sha256(repr((product_key(product), [scenario.key() for scenario in scenarios])).encode()).hexdigest()
+
+
+def run_point(point, params, base, scenarios):
+    "Returns the row of metrics for one point of the grid, i.e. the mean of each metric over the scenarios."
+    product = base._replace(**params)
+    totals = dict.fromkeys(METRICS, 0)
+    for scenario in scenarios:
+        summary = scenario.summary(product)
+        totals["interest"] += summary.interest
+        totals["fees"] += summary.fees
+        totals["paid"] += summary.paid
+        totals["payments"] += summary.payments
+        totals["bal"] += summary.bal
+        totals["paidOff"] += summary.payoffDate is not None
+        totals["aprDropped"] += summary.aprDropDate is not None
+    row = {"point": point, "key": point_key(product, scenarios), **params}
+    row.update({name: total / len(scenarios) for name, total in totals.items()})
+    return row
+
+
+def run_chunk(chunk, base, scenarios):
+    return [run_point(point, params, base, scenarios) for point, params in chunk]
+
+
+def _done(results, columns):
+    """
+    Returns the metrics of each key that is already in the results file.
+    A file of a sweep with other columns, i.e. another grid, is not resumed.
+    """
+    if not results or not os.path.exists(results):
+        return {}
+    with open(results, newline='') as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames != columns:
+            raise ValueError(f"The results file {results} has the columns {reader.fieldnames}, not {columns}.")
+        return {row["key"]: {name: float(row[name]) for name in METRICS} for row in reader}
+
+
+def run_sweep(grid, scenarios=None, base=None, workers=None, chunksize=8, results=None):
+    """
+    Runs every point of the grid in parallel and returns the metrics as a DataFrame with one row per point.
+
+    Parameters
+    ----------
+    grid : dict
+        The values of each product parameter to sweep, e.g. {"Apr": [49.975, 59.975]}.
+    scenarios : list of Scenario, optional
+        The loans to simulate for each point. Default is default_scenarios().
+    base : ProductConfig, optional
+        The parameters that are not swept. Default is the current Zinclusive parameters.
+    workers : int, optional
+        The number of processes. Default is the number of CPUs. 0 runs in this process.
+    chunksize : int, optional
+        The number of points per task (default is 8).
+    results : str, optional
+        A CSV file that each row is appended to as soon as it is done.
+        If the file exists, its points are not run again, i.e. an interrupted sweep is resumed.
+        Only the rows with the same product parameters and scenarios are used, and the file must have the same grid.
+    """
+    import pandas as pd
+    scenarios = default_scenarios() if scenarios is None else scenarios
+    base = Zinclusive.config() if base is None else base
+    points = expand(grid)
+    columns = ["point", "key", *grid, *METRICS]
+    done = _done(results, columns)
+    keys = [point_key(base._replace(**params), scenarios) for params in points]
+    todo = [(i, params) for i, params in enumerate(points) if keys[i] not in done]
+    chunks = [todo[i:i+chunksize] for i in range(0, len(todo), chunksize)]
+
+    rows = []
+    f = None
+    if results:
+        new = not os.path.exists(results)
+        f = open(results, "a", newline='')
+        writer = csv.DictWriter(f, fieldnames=columns)
+        if new:
+            writer.writeheader()
+    try:
+        def collect(chunk_rows):
+            rows.extend(chunk_rows)
+            if f:
+                writer.writerows(chunk_rows)
+                f.flush()
+
+        if workers == 0:
+            for chunk in chunks:
+                collect(run_chunk(chunk, base, scenarios))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(run_chunk, chunk, base, scenarios) for chunk in chunks]
+                for future in as_completed(futures):
+                    collect(future.result())
+    finally:
+        if f:
+            f.close()
+
+    # The rows of the file are rebuilt from the grid, so the params have the same types as a fresh run, e.g. tuples.
+    done.update((row["key"], {name: row[name] for name in METRICS}) for row in rows)
+    rows = [{"point": i, "key": keys[i], **params, **done[keys[i]]} for i, params in enumerate(points)]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def scaling(grid, workers=None, **kwargs):
+    """
+    Returns the seconds and speedup of the sweep for 1, 2, 4, ... processes up to the number of CPUs.
+    """
+    import pandas as pd
+    workers = workers or [n for n in [1, 2, 4, 8, 16, 32, 64] if n <= (os.cpu_count() or 1)]
+    rows = []
+    for n in workers:
+        t = time.perf_counter()
+        run_sweep(grid, workers=n, **kwargs)
+        rows.append({"workers": n, "seconds": time.perf_counter() - t})
+    df = pd.DataFrame(rows)
+    df["speedup"] = df["seconds"].iloc[0] / df["seconds"]
+    return df
+
+
+if __name__ == "__main__":
+    grid = {
+        "Apr": [39.975, 49.975, 59.975],
+        "AprDropsTo": [25.95, 35.95],
+        "AprDropsOn": [7, 13],
+        "MinPmtFloor": [(100, 105, 110, 130), (120, 125, 130, 150)],
+    }
+    print(scaling(grid).to_string())
@@ -0,0 +1,274 @@
+from datetime import date
+from datetime import timedelta
+from typing import NamedTuple
+from dateutil.relativedelta import relativedelta
+from .customer import *
+from .loans import *
+from .reports import *
+from .tx import Tx
+from .zinclusive import GRACE_DAYS
+
+
+# Estimated monthly expenses
+EXPENSES = 2803.33
+
+
+
+
+class SimState(NamedTuple):
+    """
+    The state of a CustomerSystem simulation after some date, e.g. to resume it with changed inputs.
+    It is immutable and made of plain values, so it can be pickled and shared by many what-if branches.
+
+    EXAMPLE USAGE:
+        state = system.snapshot(datetime(2000, 8, 31))
+        extra = state._replace(bal=state.bal - 500)    # The customer pays $500 extra.
+        statement = system.get_statement(state=extra)  # Only the payments after the snapshot are simulated.
+    """
+    date: object        # The last date simulated, or None before the first payment period.
+    bal: float          # The loan balance.
+    apr: float          # The APR of the next payment.
+    iPayment: int = 0   # The number of payments made.
+
+
+
+
+class ISystem:
+    """
+    A "system" is anything that begins with an initial condition and evolves over time, such as a loan or statement.
+    EXAMPLE:
+        system = CustomerSystem(...)
+        for state in system:
+            print(state)
+    """
+    def __init__(self):
+        pass
+
+    def get_statement(self):
+        raise NotImplementedError("get_statement() must be implemented in a derived class.")
+
+
+
+
+class CustomerSystem(ISystem):
+    """
+    A system that models a customer with a periodic fixed income, getting a loan, and paying it down over time.
+    """
+    def __init__(self, start : date, end : date, loan : ILoan, customer : Customer, product=None):
+        """
+        Initialize a new instance of the class.
+        Parameters:
+        - start (date): The start date of the simulation.
+        - end (date): The end date of the simulation.
+        - loan (ILoan): The loan to be paid down.
+        - customer (Customer): The borrower.
+        - pIncome (Period): The fixed income period, e.g. monthly, bi-weekly.
+        - product (ProductConfig): The product parameters. Default is the current Zinclusive parameters.
+        """
+        super().__init__()
+        self.product = Zinclusive if product is None else product
+
+        self._start = start
+        self._end = end
+        self._loan = loan
+        self._customer = customer
+        self.paycheck = customer.paycheck
+
+    @property
+    def customer(self): return self._customer
+    @property
+    def loan(self): return self._loan
+    @property
+    def pIncome(self): return self.customer.pIncome
+
+    def _horizon(self, end=None):
+        "The end of the simulation. Default is the end of the system if it is after the start, else 3 years after the start."
+        if end is not None:
+            return end
+        if self._end is not None and self._end > self._start:
+            return self._end
+        return self._start + relativedelta(years=3)
+
+    def initial_state(self):
+        "Returns the state at the start of the simulation, before any payment."
+        return SimState(None, self.loan.bal, self.product.Apr, 0)
+
+    def _income_dates(self, after=None):
+        "Yields the income dates, or only the dates after a date, computed directly rather than stepping from the start."
+        if after is None:
+            yield from self.pIncome
+            return
+        k = self.pIncome._count_before(after + timedelta(days=1))
+        while True:
+            yield self.pIncome.nth(k)
+            k += 1
+
+    def _periods(self, end, state=None):
+        """
+        Yields (date, payment, interest, loan balance, APR) for each loan payment period until the end date.
+        The APR is None unless it changed, i.e. on and after the payment that it drops.
+        If a state is given, start after its date with its balance, APR and number of payments.
+        """
+        state = self.initial_state() if state is None else state
+        bal = state.bal
+        apr = state.apr
+        r = self.pIncome.adjust_monthly(apr/12)
+        iPayment = state.iPayment
+
+        for d in self._income_dates(state.date):
+            if d > end: break
+
+            # We cannot require a payment before GRACE_DAYS after the loan starts.
+            days = (d - self._start).days
+            if days >= GRACE_DAYS:
+                MinPmtFloor = self.product.MinPmtFloor[self.loan.iBand]
+                MinPmtPctPrin = self.product.MinPmtPctPrin[self.loan.iBand]
+                MinPmtPctPrin = self.pIncome.adjust_monthly(MinPmtPctPrin/100)
+                MinPmtPrin = bal*MinPmtPctPrin
+                pmt = min(bal * (1+r/100), max(MinPmtPrin, MinPmtFloor))
+                interest = bal * r/100
+
+                bal = bal*(1+r/100) - pmt
+                iPayment += 1
+
+                newApr = None
+                if iPayment >= self.product.AprDropsOn:
+                    apr = newApr = self.product.AprDropsTo
+                    r = self.pIncome.adjust_monthly(apr/12)
+
+                yield d, pmt, interest, bal, newApr
+
+    def snapshot(self, d, state=None):
+        """
+        Returns the state after the payment periods on or before the date.
+
+        Parameters
+        ----------
+        d : date
+            The last date to simulate.
+        state : SimState, optional
+            The state to continue from. Default is the start of the simulation.
+        """
+        state = self.initial_state() if state is None else state
+        bal, apr, iPayment = state.bal, state.apr, state.iPayment
+        for _, pmt, interest, bal, newApr in self._periods(d, state):
+            iPayment += 1
+            if newApr is not None:
+                apr = newApr
+        return SimState(d, bal, apr, iPayment)
+
+    def iter_events(self, end=None, stop_at_payoff=True, state=None):
+        """
+        Yields the transactions of the simulation lazily.
+
+        Parameters
+        ----------
+        end : date, optional
+            The last date to simulate. Default is the end of the system if it is after the start, else 3 years after the start.
+        stop_at_payoff : bool, optional
+            If True, stop after the period that pays off the loan (default is True).
+        state : SimState, optional
+            Resume from the state, e.g. from snapshot(), and yield only the transactions after its date.
+        """
+        if state is None or state.date is None:
+            d = self._start
+            apr = self.product.Apr
+            r = self.pIncome.adjust_monthly(apr/12)
+
+            yield Tx(d, key="apr", value=apr)
+            yield Tx(d, desc=f"APR={apr:.2f}%", key="apr", value=apr)
+            yield Tx(d, key="r", value=r)
+            yield Tx(d, "orig fee", -self.product.OrigFee)
+
+        # ADD PERIODIC INCOME, LOAN PAYMENTS, AND EXPENSES
+        for d, pmt, interest, bal, newApr in self._periods(self._horizon(end), state):
+            yield Tx(d, "", 0)
+            yield Tx(d, "paycheck", self.paycheck)
+            yield Tx(d, "loan payment", -pmt, lBal=bal)
+            yield Tx(d, "expenses", -EXPENSES)
+            if newApr is not None:
+                yield Tx(d, desc=f"APR={newApr:.2f}%", key="apr", value=newApr)
+                yield Tx(d, key="r", value=self.pIncome.adjust_monthly(newApr/12))
+            if stop_at_payoff and bal < 0.01:
+                break
+
+    def get_statement(self, end=None, state=None):
+        """
+        Returns the statement of the simulation until the end date, including after the loan is paid off.
+
+        Parameters
+        ----------
+        end : date, optional
+            The last date to simulate. Default is the end of the system if it is after the start, else 3 years after the start.
+        state : SimState, optional
+            Resume from the state, i.e. the statement has only the transactions after its date.
+        """
+        statement = Statement()
+        for tx in self.iter_events(end, stop_at_payoff=False, state=state):
+            statement.add_tx(tx)
+        return statement
+
+    def summary(self, end=None, state=None):
+        """
+        Returns the totals of the simulation until the end date or the loan is paid off, whichever is first.
+        No transactions are created.
+
+        Parameters
+        ----------
+        end : date, optional
+            The last date to simulate. Default is the end of the system if it is after the start, else 3 years after the start.
+        state : SimState, optional
+            Resume from the state, i.e. the totals are of the payments after its date, without the fees.
+        """
+        state = self.initial_state() if state is None else state
+        summary = LoanSummary(state.bal, self.product.OrigFee if state.date is None else 0)
+        for d, pmt, interest, bal, newApr in self._periods(self._horizon(end), state):
+            summary.payments += 1
+            summary.paid += pmt
+            summary.interest += interest
+            summary.bal = bal
+            if newApr is not None and summary.aprDropDate is None:
+                summary.aprDropDate = d
+            if bal < 0.01:
+                summary.payoffDate = d
+                break
+        return summary
+
+
+
+
+class LoanSummary:
+    """
+    The totals of a simulation, e.g. from CustomerSystem.summary().
+
+    Attributes
+    ----------
+    bal : float
+        The loan balance at the end.
+    fees : float
+        The fees paid, e.g. the origination fee.
+    interest : float
+        The interest paid.
+    paid : float
+        The total of the loan payments.
+    payments : int
+        The number of loan payments.
+    payoffDate : date
+        The date of the payment that paid off the loan, else None.
+    aprDropDate : date
+        The date that the APR dropped, else None.
+    """
+    def __init__(self, bal, fees=0):
+        self.bal = bal
+        self.fees = fees
+        self.interest = 0
+        self.paid = 0
+        self.payments = 0
+        self.payoffDate = None
+        self.aprDropDate = None
+
+    def as_dict(self):
+        return dict(bal=self.bal, fees=self.fees, interest=self.interest, paid=self.paid, payments=self.payments, payoffDate=self.payoffDate, aprDropDate=self.aprDropDate)
+
+    def __repr__(self):
+        return f"LoanSummary({', '.join(f'{k}={v!r}' for k, v in self.as_dict().items())})"
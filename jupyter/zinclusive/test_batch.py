@@ -0,0 +1,98 @@
+import csv
+import io
+import json
+from datetime import datetime
+import numpy as np
+import pytest
+from zinclusive.batch import *
+from zinclusive.customer import *
+from zinclusive.ledger import Ledger
+from zinclusive.loans import *
+from zinclusive.period import *
+from zinclusive.systems import *
+from zinclusive.tools import *
+
+
+APPS = [
+    {"id": "a", "bal": 5000, "income": 40000, "frequency": "biweekly", "next_pay": "2000-01-10"},
+    {"id": "b", "bal": 1500, "income": 30000, "frequency": "monthly", "next_pay": "2000-01-01"},
+    {"id": "c", "bal": 8000, "income": 60000, "frequency": "semimonthly", "next_pay": "2000-01-15", "start": "2000-01-05"},
+    {"id": "d", "bal": 500, "frequency": "weekly"},
+    {"id": "e", "bal": 2500, "frequency": "yearly"},
+]
+
+
+def read(path):
+    with open(path, newline='') as f:
+        return {row["id"]: row for row in csv.DictReader(f)}
+
+
+def test_batch_csv(tmp_path):
+    tape = str(tmp_path / "tape.csv")
+    with open(tape, "w", newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=["id", "bal", "income", "frequency", "next_pay", "start"])
+        writer.writeheader()
+        writer.writerows(APPS)
+    out = str(tmp_path / "out.csv")
+    progress = io.StringIO()
+    assert_equals(5, run_tape(tape, out, start=datetime(2000, 1, 1), workers=0, chunk=2, progress=progress))
+    assert "rows/s" in progress.getvalue()
+
+    rows = read(out)
+    start = datetime(2000, 1, 1)
+    customer = Customer(annual_income=40000, pIncome=BiWeeklyPeriod(datetime(2000, 1, 10)))
+    summary = CustomerSystem(start=start, end=start, loan=ZLoan(5000), customer=customer).summary()
+    assert_equals(str(summary.payments), rows["a"]["payments"])
+    assert_equals(f"{summary.interest:.2f}", f"{float(rows['a']['interest']):.2f}")
+    assert_equals("", rows["a"]["error"])
+    assert rows["d"]["error"]
+    assert "frequency" in rows["e"]["error"]
+
+
+def test_batch_simulation_error(monkeypatch):
+    "An application that fails in the simulation is a row with an error, not the end of the job."
+    def summary(self, end=None):
+        raise ValueError("Bad product")
+    monkeypatch.setattr(CustomerSystem, "summary", summary)
+    row, statement = run_application(0, APPS[0], datetime(2000, 1, 1), 3, ledger=True)
+    assert_equals("Bad product", row["error"])
+    assert_equals(None, statement)
+
+
+def test_batch_jsonl_workers(tmp_path):
+    tape = str(tmp_path / "tape.jsonl")
+    with open(tape, "w") as f:
+        for app in APPS * 3:
+            f.write(json.dumps(app) + "\n")
+    a, b = str(tmp_path / "a.csv"), str(tmp_path / "b.csv")
+    run_tape(tape, a, start=datetime(2000, 1, 1), workers=0, chunk=4, progress=None)
+    run_tape(tape, b, start=datetime(2000, 1, 1), workers=2, chunk=4, progress=None, ledger=str(tmp_path / "ledger"))
+    assert_equals(read(a), {id: {k: v for k, v in row.items() if k != "ledger"} for id, row in read(b).items()})
+
+    # Each loan that was simulated has its statement in the ledger.
+    ledger = Ledger(str(tmp_path / "ledger"))
+    assert_equals(9, len(ledger))
+    with open(b, newline='') as f:
+        for row in csv.DictReader(f):
+            if row["error"]:
+                assert_equals("", row["ledger"])
+            else:
+                lBals = ledger.loan(int(row["ledger"]))["lBal"]
+                assert_equals(float(row["endBal"]), round(float(lBals[~np.isnan(lBals)][int(row["payments"]) - 1]), 2))
+
+
+def test_batch_main(tmp_path):
+    tape = str(tmp_path / "tape.jsonl")
+    with open(tape, "w") as f:
+        f.write(json.dumps(APPS[0]) + "\n")
+    out = str(tmp_path / "out.csv")
+    assert_equals(0, main([tape, "--out", out, "--start", "2000-01-01", "--workers", "0", "--quiet"]))
+    assert_equals(["a"], list(read(out)))
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()
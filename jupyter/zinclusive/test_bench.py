@@ -0,0 +1,31 @@
+import pytest
+from zinclusive.bench import *
+from zinclusive.tools import *
+
+
+def test_bench_measure():
+    result = measure("Loan.calc_min_pmt", 1, 1, repeat=1)
+    assert_equals(26, result["items"])
+    assert result["throughput"] > 0
+
+
+def test_bench_compare(tmp_path):
+    results = run_all(["period.dates"], loans=[1], years=[1], repeat=1, out=None)
+    path = str(tmp_path / "baseline.json")
+    save(results, path)
+    baseline = load(path)
+    assert_equals(results, baseline)
+
+    slower = [{**r, "throughput": r["throughput"] / 2} for r in results]
+    rows = compare(slower, baseline)
+    assert_equals(0.5, rows[0]["ratio"])
+    assert rows[0]["regression"]
+    assert not compare(results, baseline)[0]["regression"]
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()
@@ -0,0 +1,96 @@
+from datetime import datetime
+import os
+import pytest
+from zinclusive.cache import *
+from zinclusive.customer import *
+from zinclusive.loans import *
+from zinclusive.period import *
+from zinclusive.systems import *
+from zinclusive.tools import *
+from zinclusive.zinclusive import Zinclusive
+
+
+def make_system(bal=5000, product=None, pIncome=None):
+    start = datetime(2000, 1, 1)
+    customer = Customer(annual_income=40000, pIncome=pIncome or BiWeeklyPeriod(start))
+    return CustomerSystem(start=start, end=start, loan=ZLoan(bal), customer=customer, product=product)
+
+
+def rows(statement):
+    return [(tx.date, tx.desc, tx.amount, tx.lBal) for tx in statement]
+
+
+def test_cache_statement():
+    cache = SimulationCache(maxsize=2)
+    expected = rows(make_system().get_statement())
+    assert_equals(expected, rows(cache.get_statement(make_system())))
+    statement = cache.get_statement(make_system())
+    assert_equals(expected, rows(statement))
+    assert_equals(CacheInfo(1, 1, 2, 1), cache.info())
+
+    # The caller gets a copy, so changing it does not change the cache.
+    statement.add_tx(Tx(datetime(2010, 1, 1), "extra", 1))
+    assert_equals(expected, rows(cache.get_statement(make_system())))
+
+    # Different inputs miss, and the least recently used result is dropped.
+    cache.get_statement(make_system(2500))
+    cache.get_statement(make_system(pIncome=MonthlyPeriod(datetime(2000, 1, 1))))
+    assert_equals(2, cache.info().currsize)
+    cache.get_statement(make_system())
+    assert_equals(4, cache.info().misses)
+
+
+def test_cache_product():
+    cache = SimulationCache()
+    product = Zinclusive.config()._replace(Apr=49.975)
+    a = cache.summary(make_system())
+    b = cache.summary(make_system(product=product))
+    assert a.interest != b.interest
+    assert_equals(2, cache.info().misses)
+
+    # Zinclusive and an equal ProductConfig are the same parameters.
+    cache.summary(make_system(product=Zinclusive.config()))
+    assert_equals(1, cache.info().hits)
+
+    cache.invalidate(product)
+    assert_equals(1, cache.info().currsize)
+    cache.invalidate()
+    assert_equals(0, cache.info().currsize)
+
+
+def test_cache_disk(tmp_path):
+    path = str(tmp_path / "cache")
+    expected = rows(SimulationCache(path=path).get_statement(make_system()))
+
+    # A new cache, e.g. after a kernel restart, reads the result from disk.
+    cache = SimulationCache(path=path)
+    assert_equals(expected, rows(cache.get_statement(make_system())))
+    assert_equals(CacheInfo(1, 0, 256, 1), cache.info())
+
+    cache.invalidate(Zinclusive)
+    cache = SimulationCache(path=path)
+    cache.get_statement(make_system())
+    assert_equals(1, cache.info().misses)
+
+
+def test_cache_invalidate_shared_dir(tmp_path):
+    "The cache directory can be shared, invalidate() only removes the results."
+    path = str(tmp_path)
+    os.makedirs(os.path.join(path, "notebooks"))
+    os.makedirs(os.path.join(path, STORE, "other"))
+    cache = SimulationCache(path=path)
+    cache.get_statement(make_system())
+    cache.invalidate()
+    assert_equals(["notebooks", STORE], sorted(os.listdir(path)))
+    assert_equals(["other"], os.listdir(os.path.join(path, STORE)))
+    cache = SimulationCache(path=path)
+    cache.get_statement(make_system())
+    assert_equals(1, cache.info().misses)
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()
@@ -0,0 +1,107 @@
+from datetime import datetime
+import pytest
+from zinclusive.customer import *
+from zinclusive.events import *
+from zinclusive.loans import *
+from zinclusive.period import *
+from zinclusive.systems import *
+from zinclusive.tools import *
+from zinclusive.tx import Tx
+
+
+def payments(statement):
+    return [(tx.date, tx.amount, tx.lBal) for tx in statement if tx.desc == "loan payment"]
+
+
+def test_events_match_system():
+    start = datetime(2000, 1, 1)
+    for bal, pIncome in [(1000, BiWeeklyPeriod(start)), (5000, BiWeeklyPeriod(datetime(2000, 1, 10))), (8000, MonthlyPeriod(start)), (2500, SemiMonthlyPeriod(start))]:
+        customer = Customer(annual_income=40000, pIncome=pIncome)
+        expected = CustomerSystem(start=start, end=start, loan=ZLoan(bal), customer=customer).get_statement()
+        actual = EventSystem(start, start, ZLoan(bal), customer).get_statement()
+        expected = [row for row in payments(expected) if row[2] >= 0.01] + [row for row in payments(expected) if row[2] < 0.01][:1]
+        assert_equals(expected, payments(actual))
+
+        # No blank separators, and the APR drops once if the loan is not paid off first.
+        assert "" not in [tx.desc for tx in actual if tx.key is None]
+        drops = [tx for tx in actual if tx.desc == f"APR={Zinclusive.AprDropsTo:.2f}%"]
+        assert_equals(1 if len(payments(actual)) >= Zinclusive.AprDropsOn else 0, len(drops))
+
+
+def test_events_start_order():
+    "On a start date that is also an income date, the fee is before the paycheck, the same order as CustomerSystem."
+    start = datetime(2000, 1, 1)
+    customer = Customer(annual_income=40000, pIncome=BiWeeklyPeriod(start))
+    expected = CustomerSystem(start=start, end=start, loan=ZLoan(5000), customer=customer).get_statement()
+    actual = EventSystem(start, start, ZLoan(5000), customer).get_statement()
+    rows = lambda statement: [(tx.date, tx.desc, tx.key) for tx in statement if tx.date == start]
+    assert_equals(rows(expected), rows(actual)[:len(rows(expected))])
+    assert_equals(["paycheck", "expenses"], [desc for _, desc, _ in rows(actual)[len(rows(expected)):]])
+
+
+def test_events_late_handler():
+    "A handler registered after the system is built is used."
+    start = datetime(2000, 1, 1)
+    system = EventSystem(start, start, ZLoan(5000), Customer(annual_income=40000, pIncome=BiWeeklyPeriod(start)))
+    system.schedule(Event(datetime(2000, 3, 1), "test bonus", dict(amount=100)))
+
+    @handler("test bonus")
+    def on_bonus(system, event):
+        system.add_tx(Tx(event.date, "bonus", event.data["amount"]))
+    try:
+        assert_equals(100, system.get_statement(end=datetime(2000, 6, 1)).total["bonus"])
+    finally:
+        del handlers["test bonus"]
+
+
+def test_events_sparse():
+    "A monthly payment with weekly income."
+    start = datetime(2000, 1, 1)
+    customer = Customer(annual_income=40000, pIncome=Period(start, days=7))
+    system = EventSystem(start, start, ZLoan(5000), customer, pPayment=MonthlyPeriod(start))
+    statement = system.get_statement(end=datetime(2000, 12, 31))
+    dates = [row[0] for row in payments(statement)]
+    assert_equals([datetime(2000, month, 1) for month in range(2, 13)], dates)
+    assert_equals(53, len([tx for tx in statement if tx.desc == "paycheck"]))
+
+    # The same as CustomerSystem with monthly income.
+    customer = Customer(annual_income=40000, pIncome=MonthlyPeriod(start))
+    expected = CustomerSystem(start=start, end=start, loan=ZLoan(5000), customer=customer).get_statement(end=datetime(2000, 12, 31))
+    assert_equals(payments(expected), payments(statement))
+
+
+def test_events_custom():
+    start = datetime(2000, 1, 1)
+    customer = Customer(annual_income=40000, pIncome=BiWeeklyPeriod(start))
+    system = EventSystem(start, start, ZLoan(5000), customer)
+    system.schedule(Event(datetime(2000, 6, 1), "fee", dict(amount=25, desc="late fee")))
+
+    def on_extra(system, event):
+        system.bal -= event.data["amount"]
+        system.add_tx(Tx(event.date, "extra payment", -event.data["amount"], lBal=system.bal))
+    system.on("extra", on_extra)
+    system.schedule(Event(datetime(2000, 3, 1), "extra", dict(amount=1000)))
+
+    statement = system.get_statement()
+    assert_equals(-25, statement.total["late fee"])
+    assert_equals(-1000, statement.total["extra payment"])
+    assert_equals(-Zinclusive.OrigFee, statement.total["orig fee"])
+
+    # The scheduled events are kept for every run.
+    assert_equals([(tx.date, tx.desc, tx.amount) for tx in statement], [(tx.date, tx.desc, tx.amount) for tx in system.get_statement()])
+
+    # An extra payment pays off the loan sooner.
+    other = EventSystem(start, start, ZLoan(5000), customer).get_statement()
+    assert len(payments(statement)) < len(payments(other))
+
+    system.schedule(Event(datetime(2000, 3, 1), "unknown"))
+    with pytest.raises(KeyError):
+        system.get_statement()
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import pytest
+from zinclusive.tools import *
+
+
+# The core must import quickly for short-lived worker processes and CLI invocations.
+# The limit is generous so a slow machine does not fail, but pandas alone takes longer than this.
+MAX_SECONDS = 0.5
+
+CORE = ["zinclusive." + name for name in ["period", "customer", "loans", "systems", "zinclusive", "portfolio", "solver"]]
+
+
+def import_core():
+    "Imports the core in a new interpreter and returns the seconds and the heavy modules that were imported."
+    code = f"""
+import sys, time
+t = time.perf_counter()
+import {", ".join(CORE)}
+print(time.perf_counter() - t)
+print(",".join(name for name in ["pandas", "pytest"] if name in sys.modules))
+"""
+    out = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), capture_output=True, text=True, check=True).stdout
+    seconds, heavy = out.split("\n")[:2]
+    return float(seconds), heavy
+
+
+def test_import_time():
+    seconds, heavy = import_core()
+    assert_equals("", heavy, "Heavy modules imported by the core")
+    assert seconds < MAX_SECONDS, f"Importing the core took {seconds:.3f} s"
+
+
+def test_reports_import_pandas():
+    "The reporting functions still work once they import pandas."
+    from zinclusive.reports import Statement, statement_report
+    from zinclusive.tx import Tx
+    from datetime import datetime
+    statement = Statement()
+    statement.add_tx(Tx(datetime(2000, 1, 1), "paycheck", 100))
+    assert_equals(["paycheck"], statement_report(statement)["Description"].tolist())
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()
@@ -0,0 +1,118 @@
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+import pytest
+from zinclusive import instrument
+from zinclusive.customer import *
+from zinclusive.instrument import *
+from zinclusive.loans import *
+from zinclusive.period import *
+from zinclusive.reports import *
+from zinclusive.systems import *
+from zinclusive.tools import *
+
+
+def make_system():
+    start = datetime(2000, 1, 1)
+    customer = Customer(annual_income=40000, pIncome=BiWeeklyPeriod(start))
+    return CustomerSystem(start=start, end=start, loan=ZLoan(5000), customer=customer)
+
+
+def test_profiled(tmp_path):
+    system = make_system()
+    trace = str(tmp_path / "trace.json")
+    with profiled(trace=trace) as profiler:
+        assert is_enabled()
+        statement = system.get_statement()
+        loan_report(customer=system.customer, expenses=0, statement=statement, loan=system.loan)
+    assert not is_enabled()
+
+    stages = {row["stage"]: row for row in profiler.rows()}
+    assert_equals(1, stages["CustomerSystem.get_statement"]["calls"])
+    assert_equals(len(statement), stages["Statement.add_tx"]["calls"])
+    assert_equals(1, stages["loan_report"]["calls"])
+    assert stages["Period.generator"]["calls"] > 0
+    assert stages["CustomerSystem.get_statement"]["seconds"] >= stages["Statement.add_tx"]["seconds"]
+    assert "Statement.add_tx" in profiler.table()
+
+    with open(trace) as f:
+        events = json.load(f)["traceEvents"]
+    assert_equals(sum(row["calls"] for row in stages.values()), len(events))
+    assert_equals({"name", "ph", "ts", "dur", "pid", "tid"}, set(events[0]))
+
+
+def test_disabled_restores():
+    "When profiling is off, the functions are the originals, i.e. there is no overhead."
+    from zinclusive import reports
+    originals = (Statement.add_tx, Period.generator, CustomerSystem.get_statement, reports.loan_report)
+    enable()
+    assert Statement.add_tx is not originals[0]
+    disable()
+    assert_equals(originals, (Statement.add_tx, Period.generator, CustomerSystem.get_statement, reports.loan_report))
+
+    # The results are the same with and without profiling.
+    expected = [(tx.date, tx.amount) for tx in make_system().get_statement()]
+    with profiled():
+        assert_equals(expected, [(tx.date, tx.amount) for tx in make_system().get_statement()])
+
+
+def test_environment(tmp_path):
+    trace = str(tmp_path / "trace.json")
+    code = "from zinclusive.test_instrument import make_system; make_system().summary()"
+    env = {**os.environ, ENV_PROFILE: "1", ENV_TRACE: trace}
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), env=env, capture_output=True, text=True, check=True)
+    assert "CustomerSystem.summary" in result.stderr
+    assert os.path.exists(trace)
+
+
+
+def test_environment_entry_point():
+    "The environment variable profiles any entry point of the package, not only the ones that import systems."
+    code = "from datetime import datetime; from zinclusive.period import *; BiWeeklyPeriod(datetime(2000, 1, 1)).dates(end=datetime(2000, 3, 1))"
+    env = {**os.environ, ENV_PROFILE: "1"}
+    env.pop(ENV_TRACE, None)
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), env=env, capture_output=True, text=True, check=True)
+    assert "Period.dates" in result.stderr
+
+
+def test_profiled_nested():
+    "A nested profiled() gives back the outer profiler, which also records the calls of the inner block."
+    outer = enable()
+    try:
+        with profiled() as inner:
+            make_system().get_statement()
+        assert is_enabled()
+        assert instrument._profiler is outer
+        make_system().get_statement()
+    finally:
+        disable()
+    assert_equals(1, inner.stages["CustomerSystem.get_statement"].calls)
+    assert_equals(2, outer.stages["CustomerSystem.get_statement"].calls)
+
+
+def test_generator_closed():
+    "An abandoned generator closes the generator that it wraps."
+    closed = []
+
+    def numbers():
+        try:
+            yield from range(10)
+        finally:
+            closed.append(True)
+
+    with profiled() as profiler:
+        gen = instrument._wrap("numbers", numbers)()
+        assert_equals(0, next(gen))
+        gen.close()
+    assert_equals([True], closed)
+    assert_equals(1, profiler.stages["numbers"].calls)
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()
@@ -0,0 +1,104 @@
+from datetime import date, datetime
+import numpy as np
+import pytest
+from zinclusive.customer import *
+from zinclusive.ledger import *
+from zinclusive.loans import *
+from zinclusive.period import *
+from zinclusive.reports import *
+from zinclusive.systems import *
+from zinclusive.tools import *
+from zinclusive.tx import Tx
+
+
+def make_statements():
+    start = datetime(2000, 1, 1)
+    result = []
+    for bal, pIncome in [(5000, BiWeeklyPeriod(start)), (1500, MonthlyPeriod(start)), (8000, SemiMonthlyPeriod(start))]:
+        customer = Customer(annual_income=40000, pIncome=pIncome)
+        result.append(CustomerSystem(start=start, end=start, loan=ZLoan(bal), customer=customer).get_statement())
+    return result
+
+
+def rows(statement):
+    return [(tx.date, tx.desc, tx.amount, tx.key, tx.value, tx.bal, tx.lBal) for tx in statement]
+
+
+def test_ledger_roundtrip(tmp_path):
+    statements = make_statements()
+    path = str(tmp_path / "book")
+    assert_equals(3, write_ledger(path, iter(statements), chunk=100))
+
+    ledger = Ledger(path)
+    assert_equals(3, len(ledger))
+    assert_equals(sum(len(s) for s in statements), ledger.count)
+    assert isinstance(ledger.amount, np.memmap)
+    for i, statement in enumerate(statements):
+        s = ledger.statement(i)
+        assert_equals(rows(statement), rows(s))
+        assert_equals(statement.total, s.total)
+        assert abs(statement.bal - s.bal) < 1e-9
+        assert_equals(statement.balances.tolist(), ledger.loan(i)['bal'].tolist())
+
+    with pytest.raises(IndexError):
+        ledger.loan(3)
+
+
+def test_ledger_between(tmp_path):
+    statements = make_statements()
+    path = str(tmp_path / "book")
+    write_ledger(path, statements)
+    ledger = Ledger(path)
+    start, end = datetime(2001, 1, 1), datetime(2001, 2, 1)
+
+    columns = ledger.between(start, end, loan=1)
+    expected = [tx for tx in statements[1] if start <= tx.date < end]
+    assert_equals([tx.amount for tx in expected], columns['amount'].tolist())
+
+    columns = ledger.between(start, end)
+    expected = [(i, tx.amount) for i, s in enumerate(statements) for tx in s if start <= tx.date < end]
+    assert_equals(expected, list(zip(columns['loan'].tolist(), columns['amount'].tolist())))
+
+
+def test_ledger_dates(tmp_path):
+    "A statement of dates is read back with dates, the same as the statement that was written."
+    statement = Statement(100)
+    statement.add_tx(Tx(date(2000, 1, 1), "paycheck", 1000))
+    statement.add_tx(Tx(date(2000, 1, 15), "loan payment", -130, lBal=4870))
+    path = str(tmp_path / "book")
+    write_ledger(path, [statement, Statement()])
+    assert_equals(statement.txs, Ledger(path).statement(0).txs)
+    assert_equals(date, type(Ledger(path).statement(0).txs[0].date))
+
+    write_ledger(path, [statement] + make_statements())
+    assert_equals(datetime, type(Ledger(path).statement(0).txs[0].date))
+
+
+def test_ledger_empty(tmp_path):
+    path = str(tmp_path / "book")
+    write_ledger(path, [Statement()])
+    ledger = Ledger(path)
+    assert_equals(0, len(ledger.statement(0)))
+
+
+
+def test_ledger_incomplete(tmp_path):
+    "A ledger whose writer failed cannot be opened, even if it replaced a complete ledger."
+    path = str(tmp_path / "book")
+    write_ledger(path, make_statements())
+
+    def statements():
+        yield from make_statements()
+        raise RuntimeError("failed")
+    with pytest.raises(RuntimeError):
+        write_ledger(path, statements(), chunk=100)
+    with pytest.raises(FileNotFoundError):
+        Ledger(path)
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()
@@ -0,0 +1,73 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from zinclusive.customer import *
+from zinclusive.loans import *
+from zinclusive.montecarlo import *
+from zinclusive.period import *
+from zinclusive.systems import *
+from zinclusive.tools import *
+
+
+def test_montecarlo_deterministic():
+    "With no random behavior, every path is the same as CustomerSystem."
+    start = datetime(2000, 1, 1)
+    for bal, pIncome in [(1500, BiWeeklyPeriod(start)), (5000, MonthlyPeriod(start)), (8000, SemiMonthlyPeriod(start))]:
+        system = CustomerSystem(start=start, end=start, loan=ZLoan(bal), customer=Customer(annual_income=40000, pIncome=pIncome))
+        summary = system.summary()
+        result = run(bal, pIncome, start, paths=10, batch=4)
+        assert_equals(10, result.paths)
+        assert_equals(10 if summary.payoffDate else 0, result.paidOff)
+        assert_equals(10 if summary.aprDropDate else 0, result.aprDropped)
+        assert abs(result.interest.mean - summary.interest) < 1e-6
+        if summary.payoffDate:
+            assert_equals(summary.payments, result.payoff.mean)
+
+
+def test_montecarlo_behavior():
+    start = datetime(2000, 1, 1)
+    pIncome = BiWeeklyPeriod(start)
+    base = run(1500, pIncome, start, paths=2000, seed=1)
+    missed = run(1500, pIncome, start, Behavior(p_miss=0.2, p_partial=0.1, p_income=0.05), paths=2000, seed=1)
+    prepaid = run(1500, pIncome, start, Behavior(p_prepay=0.3), paths=2000, seed=1)
+    assert missed.payoff.mean > base.payoff.mean
+    assert missed.interest.mean > base.interest.mean
+    assert missed.aprDropped < missed.paths
+    assert prepaid.payoff.mean < base.payoff.mean
+
+    summary = missed.summary()
+    assert summary["payoff_q5"] <= summary["payoff_q50"] <= summary["payoff_q95"]
+    assert 0 < summary["paidOff"] <= 1
+
+
+def test_montecarlo_seeds():
+    "The results depend on the seed, but not on the number of workers."
+    start = datetime(2000, 1, 1)
+    behavior = Behavior(p_miss=0.1, p_partial=0.1, p_prepay=0.05, p_income=0.05)
+    a = run(5000, BiWeeklyPeriod(start), start, behavior, paths=3000, seed=7, batch=1000)
+    b = run(5000, BiWeeklyPeriod(start), start, behavior, paths=3000, seed=7, batch=1000, workers=2)
+    c = run(5000, BiWeeklyPeriod(start), start, behavior, paths=3000, seed=8, batch=1000)
+    assert_equals(a.summary(), b.summary())
+    assert_equals(a.payoff.counts.tolist(), b.payoff.counts.tolist())
+    assert a.summary() != c.summary()
+
+
+def test_histogram():
+    h = Histogram(1)
+    h.add([0, 1, 1, 2, 9])
+    assert_equals(1, h.quantile(0.5))
+    assert_equals(9, h.quantile(1))
+    assert_equals(2.6, h.mean)
+    other = Histogram(1)
+    other.add([20])
+    h.merge(other)
+    assert_equals(6, h.n)
+    assert_equals(20, h.quantile(1))
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()
@@ -0,0 +1,225 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from zinclusive.customer import Customer
+from zinclusive.period import Period
+from zinclusive.tools import *
+from zinclusive.paydown import *
+from zinclusive.loans import *
+from zinclusive.solver import ZLoanSolver
+
+def test_loan_pmt():
+    "Sanity check that the standard 30-year mortgage payment is correct."
+    loan = Loan(100000, 0.12/12, 360)
+    assert(round(loan.pmt, 2) == 1028.61)
+
+
+def test_loan_pmt_follows_bal():
+    "The payment is of the current balance, e.g. after the balance is changed."
+    loan = Loan(100000, 0.12/12, 360)
+    loan.bal = 50000
+    assert_equals(514.31, round(loan.pmt, 2))
+    assert_equals(None, Loan(1000, 0.01).pmt)
+
+
+def test_loan_schedule():
+    "The closed-form schedule matches paying the loan one month at a time."
+    loan = Loan(100000, 0.12/12, 360)
+    interest, principal, bal = loan.schedule()
+    assert_equals(360, len(bal))
+    b = loan.bal
+    for k in range(360):
+        i = b * loan.rate
+        b = b + i - loan.pmt
+        assert_equals(round(i, 6), round(interest[k], 6), f"Payment {k} interest")
+        assert_equals(round(b, 6), round(bal[k], 6), f"Payment {k} balance")
+    assert_equals(0, round(bal[-1], 6))
+    assert_equals(100000, round(principal.sum(), 6))
+
+
+def test_amortize():
+    "The batch form returns one row per loan, padded with NaN after the term."
+    interest, principal, bal = amortize([5000, 1000, 100000], [2/12, 0, 0.12/12], [24, 10, 360])
+    assert_equals((3, 360), bal.shape)
+    assert_equals([900, 800], list(bal[1, :2]))
+    assert np.isnan(bal[1, 10:]).all()
+    assert np.isnan(bal[0, 24:]).all()
+    assert_equals(list(Loan(100000, 0.12/12, 360).schedule()[2]), list(bal[2]))
+    assert_equals([5000, 1000, 100000], list(np.nansum(principal, axis=1).round(6)))
+
+
+def test_run_statement():
+    "Each month has a paycheck, the level payment and the expenses, and the loan is paid off after the term."
+    customer = Customer(40000)
+    them = Loan(5000, 2/12, 24)
+    statement = run_statement(them, customer, customer.paycheck - them.pmt, start=datetime(2000, 1, 1))
+    assert_equals(4 * 24, len(statement))
+    assert_equals(0, round(statement.bal, 6))
+    assert_equals(0, round(statement.loan_balance_at(datetime(2001, 12, 1)), 6))
+    assert_equals(round(-24 * them.pmt, 6), round(statement.total_between(datetime(2000, 1, 1), datetime(2002, 1, 1), "loan payment"), 6))
+
+
+def test_compare():
+    "Each offer of the grid matches a loop over the months of that one offer."
+    c = compare(5000, [1, 2], [12, 24, 60], months=48, start_bal=100)
+    assert_equals((2, 3), c.savings.shape)
+    assert_equals((2, 3, 49), c.bank_us.shape)
+    solver = ZLoanSolver(5000, MonthlyPeriod(datetime(2000, 1, 1)))
+    for i, apr in enumerate([1, 2]):
+        for j, term in enumerate([12, 24, 60]):
+            pmt = Loan(5000, apr/12, term).pmt
+            them = us = 100
+            for k in range(48):
+                them += pmt - (pmt if k < term else 0)
+                us += pmt - (solver.paid(k + 1) - solver.paid(k))
+            assert_equals(100, c.bank_them[i, j, min(term, 48)])
+            assert_equals(round(them, 6), round(c.bank_them[i, j, -1], 6))
+            assert_equals(round(us, 6), round(c.bank_us[i, j, -1], 6))
+            owed = Loan(5000, apr/12, term).schedule()[2][47] if term > 48 else 0
+            assert_equals(round(owed, 6), round(c.owed_them[i, j], 6))
+            assert_equals(round((us - solver.balance(48)) - (them - owed), 6), round(c.savings[i, j], 6))
+
+
+def test_compare_owed():
+    "What is still owed on our loan at the horizon is not savings."
+    c = compare(5000, [2], [24])
+    solver = ZLoanSolver(5000, MonthlyPeriod(datetime(2000, 1, 1)))
+    assert_equals(round(solver.balance(24), 6), round(c.owed_us, 6))
+    assert_equals(0, c.owed_them[0, 0])
+    assert_equals(round(c.bank_us[0, 0, -1] - c.bank_them[0, 0, -1] - solver.balance(24), 6), round(c.savings[0, 0], 6))
+    c = compare(5000, [2], [24], months=solver.payoff_period())
+    assert_equals(0, c.owed_us)
+
+
+def test_loan_min_pmt_1():
+    loan = Loan(100000, 0.12/12, 360, mp_type=1)
+
+    loan.bal = 2000
+    mp = loan.calc_min_pmt()
+    assert_equals(40.00, round(mp, 2))
+
+    loan.bal = 1000
+    mp = loan.calc_min_pmt()
+    assert_equals(20.00, round(mp, 2))
+
+    loan.bal = 26
+    mp = loan.calc_min_pmt()
+    assert_equals(1.00, round(mp, 2))
+
+    loan.bal = 999.99
+    mp = loan.calc_min_pmt()
+    assert_equals(20.00, round(mp, 2))
+
+    loan.bal = 25
+    mp = loan.calc_min_pmt()
+    assert_equals(1, round(mp, 2))
+
+
+def test_loan_min_pmt_2():
+    bal=2000
+    rate=0.12/12
+    xl=25
+    xh=1000
+    r=0.02
+    fees=0
+    loan = Loan(bal=bal, rate=rate, term=25, mp_type=2, xl=xl, xh=xh, r=r, fees=fees)
+
+    loan.bal = 2000
+    mp = loan.calc_min_pmt()
+    assert_equals(40.00, round(mp, 2), "Percentage of balance plus fees")
+
+    loan.bal = 1000
+    mp = loan.calc_min_pmt()
+    assert_equals(25.00, round(mp, 2), "Min fixed payment")
+
+    loan.bal = 999.99
+    mp = loan.calc_min_pmt()
+    assert_equals(25.00, round(mp, 2), "Min fixed payment")
+
+    loan.bal = 25
+    mp = loan.calc_min_pmt()
+    assert_equals(25.00, round(mp, 2), "A small balance becomes the payment")
+
+    loan.bal = 10
+    mp = loan.calc_min_pmt()
+    assert_equals(10.00, round(mp, 2), "A small balance becomes the payment")
+
+
+def test_loan_min_pmts():
+    "The batch minimum payments match the scalar ones exactly, including the round-up."
+    bals = [2000, 1000, 999.99, 26, 25, 10, 0, 1000.01, 24.50005, 1012.5]
+    for loan in [Loan(100000, 0.12/12, 360, mp_type=1), Loan(2000, 0.12/12, 25, mp_type=2, xl=25, xh=1000, r=0.02, fees=0), Loan(2000, 0.12/12, mp_type=2, fees=2.5)]:
+        expected = []
+        for bal in bals:
+            loan.bal = bal
+            expected.append(loan.calc_min_pmt())
+        assert_equals(expected, list(loan.calc_min_pmts(bals)))
+    with pytest.raises(Exception):
+        Loan(1000, 0.01, mp_type=3).calc_min_pmts(bals)
+
+
+def test_period():
+    start = datetime(2000, 1, 1)
+
+    # Get paid every two weeks
+    period = Period(start=start, days=14)
+    n = iter(period)
+    n = next(period)
+    assert_equals(datetime(2000, 1, 15), n)
+    n = next(period)
+    assert_equals(datetime(2000, 1, 29), n)
+
+
+
+
+def test_periods():
+    "Multiple periods merged together"
+
+    # Customer makes $40K per year and lives paycheck to paycheck.
+    customer = Customer(annual_income=40000, end_bal=0)
+
+    # Our loan's origination date.
+    orig = datetime(2000, 1, 25)
+
+    # Customer gets paid bi-weekly
+    pIncome = Period(orig, days=14)
+
+    # Customer pays them every month on the first.
+    paymentThem = Period(orig, months=1)
+
+    # Customer pays us after each paycheck.
+    paymentUs = Period(orig, days=14)
+
+    # They offer a 200% loan of $5000.
+    them = Loan(5000, 2/12)
+
+    # We offer a 59% loan of $5000.
+    us = Loan(5000, .59/12)
+
+    # The customer's expenses are whatever is left after paying the loan.
+    expenses = customer.pay_period_expenses(them, paymentThem)
+
+    sThem = run_statement(loan=them, customer=customer, expenses=expenses)
+    sUs = run_statement(customer=customer, us=us, them=them, pIncome=pIncome, pPayment=paymentThem)
+
+
+def test_payment():
+    term = 24
+    loan = Loan(100000, 12/12)
+    period = Period(datetime(2000, 1, 1), months=1)
+    n = period.num_periods(months=term)
+    assert_equals(24, n)
+
+
+def test_spreadsheet_payment_band1():
+    with pytest.raises(Exception) as e:
+        loan = ZLoan(100000)
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests:
+        print(f"Skipping {test}")
+        #test()
@@ -0,0 +1,143 @@
+from datetime import datetime
+import pytest
+from zinclusive.tools import *
+from zinclusive.period import *
+from itertools import *
+import numpy as np
+
+
+
+def test_period():
+    start = datetime(2000, 1, 1)
+
+    # Get paid every two weeks
+    period = Period(start=start, days=14)
+    it = iter(period)
+    n = next(it)
+    assert_equals(datetime(2000, 1, 1), n)
+    n = next(it)
+    assert_equals(datetime(2000, 1, 15), n)
+    n = next(it)
+    assert_equals(datetime(2000, 1, 29), n)
+
+
+
+def expected_dates(period, dates):
+    it = iter(period)
+    for i,d in enumerate(dates):
+        n = next(it)
+        assert_equals(datetime.strptime(d, "%Y-%m-%d"), n, f"Date {i+1} is {n}")
+
+
+def test_period1():
+    # Bi-weekly
+    period = BiWeeklyPeriod(datetime(2000, 1, 1))
+    expected_dates(period, ["2000-01-01", "2000-01-15", "2000-01-29", "2000-02-12", "2000-02-26", "2000-03-11"])
+
+    # Monthly
+    period = MonthlyPeriod(datetime(2000, 1, 1))
+    expected_dates(period, ["2000-01-01", "2000-02-01", "2000-03-01", "2000-04-01", "2000-05-01"])
+
+    # Does it wrap around the year?
+    period = MonthlyPeriod(datetime(2000, 12, 1))
+    expected_dates(period, ["2000-12-01", "2001-01-01", "2001-02-01"])
+
+    # Semi-monthly
+    period = SemiMonthlyPeriod(datetime(2000, 1, 1), days=[7, 22])
+    expected_dates(period, ["2000-01-07", "2000-01-22", "2000-02-07", "2000-02-22", "2000-03-07"])
+
+    # Semi-monthly
+    period = SemiMonthlyPeriod(datetime(2000, 1, 1), days=[1, 15])
+    expected_dates(period, ["2000-01-01", "2000-01-15", "2000-02-01", "2000-02-15", "2000-03-01"])
+
+    # Semi-monthly - delayed start
+    period = SemiMonthlyPeriod(datetime(2000, 1, 8), days=[1, 15])
+    expected_dates(period, ["2000-01-15", "2000-02-01", "2000-02-15", "2000-03-01"])
+
+
+def expected_array(period, dates, start=None, end=None):
+    actual = period.dates(start, end or datetime.strptime(dates[-1], "%Y-%m-%d"))
+    assert_equals([np.datetime64(d) for d in dates], list(actual))
+
+
+def test_period_dates():
+    # The same dates as test_period1.
+    expected_array(BiWeeklyPeriod(datetime(2000, 1, 1)), ["2000-01-01", "2000-01-15", "2000-01-29", "2000-02-12", "2000-02-26", "2000-03-11"])
+    expected_array(MonthlyPeriod(datetime(2000, 1, 1)), ["2000-01-01", "2000-02-01", "2000-03-01", "2000-04-01", "2000-05-01"])
+    expected_array(MonthlyPeriod(datetime(2000, 12, 1)), ["2000-12-01", "2001-01-01", "2001-02-01"])
+    expected_array(SemiMonthlyPeriod(datetime(2000, 1, 1), days=[7, 22]), ["2000-01-07", "2000-01-22", "2000-02-07", "2000-02-22", "2000-03-07"])
+    expected_array(SemiMonthlyPeriod(datetime(2000, 1, 1), days=[1, 15]), ["2000-01-01", "2000-01-15", "2000-02-01", "2000-02-15", "2000-03-01"])
+    expected_array(SemiMonthlyPeriod(datetime(2000, 1, 8), days=[1, 15]), ["2000-01-15", "2000-02-01", "2000-02-15", "2000-03-01"])
+
+    # Weekly, starting part way through the schedule.
+    expected_array(Period(datetime(2000, 1, 1), days=7), ["2000-01-15", "2000-01-22"], start=datetime(2000, 1, 10))
+
+    # A day that is not in every month.
+    expected_array(Period(datetime(2000, 1, 1), months=1, days=[31]), ["2000-01-31", "2000-03-31", "2000-05-31"])
+
+
+def test_period_dates_match_generator():
+    end = datetime(2010, 1, 1)
+    for period in [BiWeeklyPeriod(datetime(2000, 1, 3)), MonthlyPeriod(datetime(2000, 1, 20)), SemiMonthlyPeriod(datetime(2000, 2, 10)), Period(datetime(2000, 1, 1), months=1, days=[15, 30])]:
+        expected = list(takewhile(lambda d: d <= end, period))
+        assert_equals([np.datetime64(d, 'D') for d in expected], list(period.dates(end=end)))
+
+
+def test_period_nth():
+    period = SemiMonthlyPeriod(datetime(2000, 1, 8), days=[1, 15])
+    assert_equals(datetime(2000, 1, 15), period.nth(0))
+    assert_equals(datetime(2000, 3, 1), period.nth(3))
+    assert_equals(datetime(2010, 1, 15), period.nth(240))
+    assert_equals(datetime(2000, 3, 11), BiWeeklyPeriod(datetime(2000, 1, 1)).nth(5))
+    assert_equals(datetime(2000, 5, 31), Period(datetime(2000, 1, 1), months=1, days=[31]).nth(2))
+    with pytest.raises(IndexError):
+        period.nth(-1)
+
+
+def test_period_nth_past_schedule():
+    "Days that are not in every month are walked on past the shared schedule, the same as the generator."
+    for start in [datetime(2099, 6, 1), datetime(2101, 3, 5), datetime(1960, 1, 1)]:
+        period = Period(start, months=1, days=[30, 31])
+        expected = list(takewhile(lambda d: d < datetime(2103, 1, 1), period))
+        assert_equals(expected[-20:], [period.nth(k) for k in range(len(expected) - 20, len(expected))])
+        assert_equals(len(expected) - 1, period.index_of(expected[-1]))
+
+
+def test_period_count_between():
+    period = MonthlyPeriod(datetime(2000, 1, 1))
+    assert_equals(24, period.num_periods(months=24))
+    assert_equals(12, period.count_between(datetime(1990, 1, 1), datetime(2001, 1, 1)))
+    assert_equals(1, period.count_between(datetime(2000, 2, 1), datetime(2000, 2, 2)))
+    assert_equals(0, period.count_between(datetime(2000, 2, 2), datetime(2000, 2, 1)))
+
+    period = BiWeeklyPeriod(datetime(2000, 1, 1))
+    assert_equals(27, period.num_periods(months=12))  # 2000 is a leap year.
+    assert_equals(2, period.count_between(datetime(2000, 1, 2), datetime(2000, 1, 30)))
+
+
+def test_period_index_of():
+    period = SemiMonthlyPeriod(datetime(2000, 1, 1), days=[7, 22])
+    assert_equals(3, period.index_of(datetime(2000, 2, 22)))
+    with pytest.raises(ValueError):
+        period.index_of(datetime(2000, 2, 23))
+    with pytest.raises(ValueError):
+        BiWeeklyPeriod(datetime(2000, 1, 1)).index_of(datetime(1999, 12, 18))
+
+
+def test_period_schedule_cache():
+    # Bi-weekly periods on the same cycle share one schedule.
+    schedule_cache_clear()
+    BiWeeklyPeriod(datetime(2000, 1, 1)).dates(end=datetime(2001, 1, 1))
+    BiWeeklyPeriod(datetime(2000, 1, 15)).dates(end=datetime(2001, 1, 1))
+    BiWeeklyPeriod(datetime(2000, 1, 8)).dates(end=datetime(2001, 1, 1))
+    info = schedule_cache_info()
+    assert_equals(2, info.misses)
+    assert_equals(1, info.hits)
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()
@@ -0,0 +1,62 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from zinclusive.customer import *
+from zinclusive.loans import *
+from zinclusive.period import *
+from zinclusive.portfolio import *
+from zinclusive.systems import *
+from zinclusive.tools import *
+
+
+def loan_payments(bal, pIncome, start):
+    "The loan payments of a single loan from CustomerSystem.get_statement."
+    customer = Customer(annual_income=40000, pIncome=pIncome)
+    system = CustomerSystem(start=start, end=start, loan=ZLoan(bal), customer=customer)
+    statement = system.get_statement()
+    return [tx for tx in statement.txs if tx.desc == "loan payment"]
+
+
+def test_portfolio_matches_statement():
+    start = datetime(2000, 1, 1)
+    bals = [1000, 1500, 2500, 5000, 8000, 9999.99, 5000, 5000]
+    pIncomes = [
+        BiWeeklyPeriod(datetime(2000, 1, 1)),
+        MonthlyPeriod(datetime(2000, 1, 1)),
+        SemiMonthlyPeriod(datetime(2000, 1, 1)),
+        BiWeeklyPeriod(datetime(2000, 1, 10)),
+        Period(datetime(2000, 1, 3), days=7),
+        SemiMonthlyPeriod(datetime(2000, 1, 1), days=[7, 22]),
+        MonthlyPeriod(datetime(1999, 12, 1)),
+        BiWeeklyPeriod(datetime(1999, 12, 20)),
+    ]
+    result = simulate(bals, pIncomes=pIncomes, starts=start)
+
+    for i, (bal, pIncome) in enumerate(zip(bals, pIncomes)):
+        txs = loan_payments(bal, pIncome, start)
+        assert_equals(len(txs), result.n[i], f"Loan {i} number of payments")
+        for k, tx in enumerate(txs):
+            assert_equals(np.datetime64(tx.date, 'D'), result.dates[i, k], f"Loan {i} payment {k} date")
+            assert_equals(-tx.amount, result.pmt[i, k], f"Loan {i} payment {k} amount")
+            assert_equals(tx.lBal, result.bal[i, k], f"Loan {i} payment {k} balance")
+        assert np.isnan(result.bal[i, result.n[i]:]).all()
+
+
+def test_portfolio_apr_drop():
+    start = datetime(2000, 1, 1)
+    result = simulate([5000], pIncomes=BiWeeklyPeriod(start), starts=start)
+    assert_equals(Zinclusive.Apr, result.apr[0, Zinclusive.AprDropsOn-1])
+    assert_equals(Zinclusive.AprDropsTo, result.apr[0, Zinclusive.AprDropsOn])
+
+
+def test_portfolio_invalid_balance():
+    with pytest.raises(ValueError):
+        simulate([500], pIncomes=BiWeeklyPeriod(datetime(2000, 1, 1)), starts=datetime(2000, 1, 1))
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()
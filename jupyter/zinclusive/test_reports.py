@@ -0,0 +1,235 @@
+from datetime import date, datetime
+import numpy as np
+import pytest
+from zinclusive.reports import *
+from zinclusive.tools import *
+from zinclusive.tx import Tx
+
+
+def make_statement():
+    statement = Statement(100)
+    statement.add_tx(Tx(datetime(2000, 1, 1), key="apr", value=59.975))
+    statement.add_tx(Tx(datetime(2000, 1, 1), "paycheck", 1000))
+    statement.add_tx(Tx(datetime(2000, 1, 1), "loan payment", -130, lBal=4870))
+    statement.add_tx(Tx(datetime(2000, 1, 15), "paycheck", 1000))
+    return statement
+
+
+def test_statement():
+    statement = make_statement()
+    assert_equals(4, len(statement))
+    assert_equals(1970, statement.bal)
+    assert_equals([100, 1100, 970, 1970], list(statement.balances))
+    assert_equals({"": 0, "paycheck": 2000, "loan payment": -130}, statement.total)
+
+
+def test_statement_txs():
+    statement = make_statement()
+    txs = statement.txs
+    assert_equals(4, len(txs))
+    assert_equals("apr", txs[0].key)
+    assert_equals(59.975, txs[0].value)
+    assert_equals(datetime(2000, 1, 1), txs[2].date)
+    assert_equals(970, txs[2].bal)
+    assert_equals(4870, txs[2].lBal)
+    assert_equals(None, txs[1].lBal)
+    with pytest.raises(AttributeError):
+        txs[2].amount = 0
+
+    # FrozenTx takes the same positional arguments as Tx.
+    args = (datetime(2000, 1, 1), "loan payment", -130, None, None, 4870)
+    assert_equals(Tx(*args).freeze(), FrozenTx(*args))
+    assert_equals(4870, FrozenTx(*args).lBal)
+
+    # The views are rebuilt after a new transaction.
+    statement.add_tx(Tx(datetime(2000, 1, 15), "expenses", -500))
+    assert_equals(5, len(statement.txs))
+    assert_equals(-500, statement.total["expenses"])
+
+
+def test_statement_txs_dates():
+    "A date comes back as a date, and a datetime as a datetime."
+    statement = Statement()
+    statement.add_tx(Tx(date(2000, 1, 1), "paycheck", 1000))
+    assert_equals(date(2000, 1, 1), statement.txs[0].date)
+    assert type(statement.txs[0].date) is date
+    statement = make_statement()
+    assert type(statement.txs[0].date) is datetime
+
+
+def test_statement_add_and_read():
+    "Reading the views while adding transactions gives the same views as reading them at the end."
+    statement = Statement(100)
+    for i in range(50):
+        statement.add_tx(Tx(datetime(2000, 1, 1 + i % 28), ["paycheck", "expenses", ""][i % 3], i * 1.1 - 20, lBal=i if i % 4 else None))
+        assert_equals(statement.bal, statement.balances[-1])
+        assert_equals(i + 1, len(statement.txs))
+        statement.total
+    fresh = statement.copy()
+    assert_equals(list(fresh.balances), list(statement.balances))
+    assert_equals(list(np.nan_to_num(fresh.loan_balances, nan=-1)), list(np.nan_to_num(statement.loan_balances, nan=-1)))
+    assert_equals(fresh.txs, statement.txs)
+    assert_equals({name: round(total, 9) for name, total in fresh.total.items()}, {name: round(total, 9) for name, total in statement.total.items()})
+
+
+def test_statement_index():
+    statement = make_statement()
+    assert_equals(100, statement.balance_at(datetime(1999, 12, 31)))
+    assert_equals(970, statement.balance_at(datetime(2000, 1, 1)))
+    assert_equals(970, statement.balance_at(datetime(2000, 1, 14)))
+    assert_equals(1970, statement.balance_at(datetime(2000, 2, 1)))
+    assert_equals(None, statement.loan_balance_at(datetime(1999, 12, 31)))
+    assert_equals(4870, statement.loan_balance_at(datetime(2000, 1, 20)))
+    assert_equals(870, statement.total_between(datetime(2000, 1, 1), datetime(2000, 1, 15)))
+    assert_equals(1000, statement.total_between(datetime(2000, 1, 2), datetime(2000, 2, 1), "paycheck"))
+    assert_equals(0, statement.total_between(datetime(2000, 1, 1), datetime(2000, 2, 1), "fee"))
+
+    # The index is rebuilt after a transaction is added, also one before the last date.
+    statement.add_tx(Tx(datetime(2000, 1, 10), "fee", -25, lBal=4895))
+    assert_equals(945, statement.balance_at(datetime(2000, 1, 10)))
+    assert_equals(4895, statement.loan_balance_at(datetime(2000, 1, 20)))
+    assert_equals(-25, statement.total_between(datetime(2000, 1, 1), datetime(2000, 2, 1), "fee"))
+
+
+def test_statement_index_appends():
+    "Queries between appends in date order match a scan of the transactions."
+    statement = Statement(100)
+    for i in range(60):
+        d = datetime(2000, 1, 1 + i // 3)
+        statement.add_tx(Tx(d, ["paycheck", "expenses", "loan payment"][i % 3], [1000, -700, -100][i % 3], lBal=5000 - i if i % 3 == 2 else None))
+        dates = statement.dates
+        before = dates <= np.datetime64(d, 'us')
+        assert_equals(round(100 + statement.amounts[before].sum(), 9), round(statement.balance_at(d), 9))
+        a, b = np.datetime64(datetime(2000, 1, 3), 'us'), np.datetime64(d, 'us')
+        rows = (dates >= a) & (dates < b) & (statement.codes == statement._codes["paycheck"])
+        assert_equals(round(statement.amounts[rows].sum(), 9), round(statement.total_between(datetime(2000, 1, 3), d, "paycheck"), 9))
+    assert_equals(5000 - 59, statement.loan_balance_at(datetime(2000, 2, 1)))
+
+    # A transaction out of order gives the same answers from the sorted index.
+    statement.add_tx(Tx(datetime(2000, 1, 2), "paycheck", 1000))
+    assert_equals(3000, statement.total_between(datetime(2000, 1, 1), datetime(2000, 1, 3), "paycheck"))
+    assert_equals(100 + 2 * (1000 - 700 - 100) + 1000, statement.balance_at(datetime(2000, 1, 2)))
+
+
+def test_statement_monthly():
+    statement = make_statement()
+    assert_equals({"2000-01": {"": 0, "paycheck": 2000, "loan payment": -130}}, statement.monthly())
+    statement.add_tx(Tx(datetime(2000, 2, 1), "paycheck", 1000))
+    statement.add_tx(Tx(datetime(2000, 1, 31), "paycheck", 500))
+    assert_equals({"2000-01": {"": 0, "paycheck": 2500, "loan payment": -130}, "2000-02": {"paycheck": 1000}}, statement.monthly())
+
+
+def test_statement_grows():
+    statement = Statement(capacity=1)
+    for i in range(100):
+        statement.add_tx(Tx(datetime(2000, 1, 1), "paycheck", 1))
+    assert_equals(100, statement.bal)
+    assert_equals(100, statement.balances[-1])
+
+
+def test_statement_to_frame():
+    statement = make_statement()
+    df = statement.to_frame()
+    assert_equals(['Date', 'Description', 'Amount', 'Balance', 'Loan Bal'], list(df.columns))
+    assert_equals("loan payment", df['Description'][2])
+    assert np.shares_memory(df['Amount'].to_numpy(), statement.amounts)
+    assert np.shares_memory(df['Balance'].to_numpy(), statement.balances)
+
+
+def test_merge():
+    a = make_statement()
+    b = Statement(50)
+    b.add_tx(Tx(datetime(2000, 1, 10), "paycheck", 500))
+    s = merge(a, b)
+    assert_equals(5, len(s))
+    assert_equals(a.bal + b.bal, s.bal)
+    assert_equals(2500, s.total["paycheck"])
+    assert_equals([datetime(2000, 1, 1)] * 3 + [datetime(2000, 1, 10), datetime(2000, 1, 15)], [tx.date for tx in s.txs])
+    assert_equals("apr", s.txs[0].key)
+    assert_equals(4870, s.txs[2].lBal)
+
+
+def test_imerge():
+    a = make_statement()
+    b = Statement(50)
+    b.add_tx(Tx(datetime(1999, 12, 31), "paycheck", 500))
+    b.add_tx(Tx(datetime(2000, 1, 1), "expenses", -20))
+    b.add_tx(Tx(datetime(2000, 1, 10), "paycheck", 500))
+    txs = list(imerge(a, b))
+    assert_equals([tx.date for tx in merge(a, b).txs], [tx.date for tx in txs])
+    assert_equals(merge(a, b).txs, txs)
+    assert_equals(["paycheck", "", "paycheck", "loan payment", "expenses", "paycheck", "paycheck"], [tx.desc for tx in txs])
+    assert_equals(a.bal + b.bal, txs[-1].bal)
+    assert_equals(0, len(merge()))
+
+    # The totals stream with the transactions.
+    totals = {}
+    txs = imerge(a, b, totals=totals)
+    next(txs)
+    assert_equals({"paycheck": 500}, totals)
+    list(txs)
+    assert_equals(merge(a, b).total, totals)
+
+    # A statement of dates merges with a statement of datetimes.
+    c = Statement()
+    c.add_tx(Tx(date(2000, 1, 1), "expenses", -20))
+    c.add_tx(Tx(date(2000, 1, 12), "expenses", -20))
+    txs = list(imerge(a, c))
+    assert_equals(["", "paycheck", "loan payment", "expenses", "expenses", "paycheck"], [tx.desc for tx in txs])
+    assert_equals([tx.amount for tx in merge(a, c).txs], [tx.amount for tx in txs])
+    assert_equals(a.bal + c.bal, txs[-1].bal)
+
+
+def test_loan_report():
+    statement = Statement()
+    statement.add_tx(Tx(datetime(2000, 1, 1), "orig fee", -75))
+    statement.add_tx(Tx(datetime(2000, 1, 15), "", 0))
+    statement.add_tx(Tx(datetime(2000, 1, 15), "loan payment", -600, lBal=500))
+    statement.add_tx(Tx(datetime(2000, 2, 15), "paycheck", 1000))
+    statement.add_tx(Tx(datetime(2000, 3, 15), "loan payment", -500, lBal=0))
+    statement.add_tx(Tx(datetime(2000, 4, 15), "paycheck", 1000))
+    loan = Loan(1000, 0.12/12)
+
+    df = loan_report(customer=None, expenses=0, statement=statement, loan=loan)
+    assert_equals([0, 0, 1, 2], list(df['iMonth']))
+    assert_equals(['2000-01-01', '2000-01-15', '2000-02-15', '2000-03-15'], list(df['Date']))
+    assert_equals(['1000.00', '500.00', '500.00', '0.00'], list(df['Loan Bal']))
+    assert_equals(['-75.00', '-675.00', '325.00', '-175.00'], list(df['Balance']))
+
+    df = loan_report(customer=None, expenses=0, statement=statement, loan=loan, numeric=True)
+    assert_equals([1000, 500, 500, 0], list(df['Loan Bal']))
+    assert_equals(-175, df['Amount'].sum())
+
+
+def test_report():
+    report = Report("Date:<10", "Description:<15", "Amount:>10,.2f")
+    assert_equals("Date        Description          Amount  \n==========  ===============  ==========  ", report.header())
+    assert_equals("2000-01-02  paycheck           1,234.57  ", report.row(datetime(2000, 1, 2), "paycheck", 1234.567))
+    rows = [(datetime(2000, 1, 2), "paycheck", 1234.567), (datetime(2000, 1, 3), "expenses", -50)]
+    assert_equals([report.row(*row) for row in rows], list(report.rows(rows)))
+
+
+def test_report_write():
+    import io
+    report = Report("Date:<10", "Description:<15", "Amount:>10,.2f")
+    rows = [(datetime(2000, 1, 2), "paycheck", 1234.567), (datetime(2000, 1, 3), "expenses", -50)]
+
+    f = io.StringIO()
+    report.write(iter(rows), f, chunk=1)
+    assert_equals(report.header() + "\n" + "\n".join(report.rows(rows)) + "\n", f.getvalue())
+
+    f = io.StringIO()
+    report.write(rows, f, mode="csv")
+    assert_equals("Date,Description,Amount\n2000-01-02,paycheck,1234.57\n2000-01-03,expenses,-50.00\n", f.getvalue())
+
+    f = io.StringIO()
+    report.write(rows, f, mode="tsv", header=False)
+    assert_equals("2000-01-02\tpaycheck\t1234.57\n2000-01-03\texpenses\t-50.00\n", f.getvalue())
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()
@@ -0,0 +1,104 @@
+from datetime import datetime
+import pytest
+from zinclusive.customer import *
+from zinclusive.loans import *
+from zinclusive.period import *
+from zinclusive.solver import *
+from zinclusive.systems import *
+from zinclusive.tools import *
+from zinclusive.zinclusive import Zinclusive
+
+
+def make_system(bal, pIncome, product=None):
+    start = datetime(2000, 1, 1)
+    customer = Customer(annual_income=40000, pIncome=pIncome)
+    return CustomerSystem(start=start, end=start, loan=ZLoan(bal), customer=customer, product=product)
+
+
+def test_solver_matches_system():
+    start = datetime(2000, 1, 1)
+    bals = [1000, 1999.99, 2500, 5000, 7000, 9999.99]
+    pIncomes = [
+        BiWeeklyPeriod(datetime(2000, 1, 1)),
+        MonthlyPeriod(datetime(2000, 1, 1)),
+        SemiMonthlyPeriod(datetime(2000, 1, 1)),
+        BiWeeklyPeriod(datetime(1999, 12, 20)),
+        Period(datetime(2000, 1, 3), days=7),
+    ]
+    for bal in bals:
+        for pIncome in pIncomes:
+            system = make_system(bal, pIncome)
+            summary = system.summary(end=datetime(2030, 1, 1))
+            solver = ZLoanSolver(bal, pIncome)
+            assert_equals(summary.payments, solver.payoff_period(), f"{bal} {pIncome} payments")
+            assert_equals(summary.payoffDate, solver.payoff_date(start), f"{bal} {pIncome} payoff date")
+            assert abs(summary.interest - solver.interest()) < 1e-6
+            assert abs(summary.paid - solver.paid()) < 1e-6
+
+
+def test_solver_balance():
+    pIncome = BiWeeklyPeriod(datetime(2000, 1, 1))
+    system = make_system(8000, pIncome)
+    payments = [tx for tx in system.iter_events(end=datetime(2030, 1, 1)) if tx.desc == "loan payment"]
+    solver = ZLoanSolver(8000, pIncome)
+    assert_equals(8000, solver.balance(0))
+    for k, tx in enumerate(payments, 1):
+        assert abs(tx.lBal - solver.balance(k)) < 1e-6, f"Payment {k}"
+        assert_equals(tx.date, solver.payment_date(datetime(2000, 1, 1), k))
+
+    # The regime switches from a percent of the principal to the floor, and the rate drops.
+    regimes = [regime for k, regime, r in solver.switches()]
+    assert_equals(PCT, regimes[0])
+    assert FLOOR in regimes
+    assert_equals(PAYOFF, regimes[-1])
+    assert Zinclusive.AprDropsOn in [k for k, regime, r in solver.switches()]
+
+    with pytest.raises(ValueError):
+        solver.balance(-1)
+
+
+def test_solver_product():
+    pIncome = MonthlyPeriod(datetime(2000, 1, 1))
+    product = Zinclusive.config()._replace(Apr=49.975, AprDropsOn=4)
+    summary = make_system(5000, pIncome, product).summary(end=datetime(2030, 1, 1))
+    solver = ZLoanSolver(5000, pIncome, product=product)
+    assert_equals(summary.payments, solver.payoff_period())
+    assert abs(summary.interest - solver.interest()) < 1e-6
+
+    # The payments never cover the interest.
+    product = Zinclusive.config()._replace(MinPmtPctPrin=(0.5,)*4, MinPmtFloor=(1,)*4, AprDropsTo=Zinclusive.Apr)
+    solver = ZLoanSolver(5000, pIncome, product=product)
+    assert_equals(None, solver.payoff_period())
+    assert_equals(None, solver.payoff_date(datetime(2000, 1, 1)))
+    assert solver.balance(1000) > 5000
+    with pytest.raises(ValueError):
+        solver.interest()
+
+
+def test_solver_floor_grows():
+    "The floor does not cover the interest, so the balance grows until MinPmtPctPrin applies, then the rate drops."
+    pIncome = MonthlyPeriod(datetime(2000, 1, 1))
+    product = Zinclusive.config()._replace(Apr=60, AprDropsTo=6, AprDropsOn=32, MinPmtPctPrin=(1,)*4)
+    system = make_system(5000, pIncome, product)
+    summary = system.summary(end=datetime(2030, 1, 1))
+    solver = ZLoanSolver(5000, pIncome, product=product)
+    assert_equals(summary.payments, solver.payoff_period())
+    assert_equals(summary.payoffDate, solver.payoff_date(datetime(2000, 1, 1)))
+    assert abs(summary.interest - solver.interest()) < 1e-6
+    payments = [tx for tx in system.iter_events(end=datetime(2030, 1, 1)) if tx.desc == "loan payment"]
+    for k, tx in enumerate(payments, 1):
+        assert abs(tx.lBal - solver.balance(k)) < 1e-6, f"Payment {k}"
+    assert_equals([FLOOR, PCT, PCT, FLOOR, PAYOFF], [regime for k, regime, r in solver.switches()])
+
+
+def test_solver_invalid_balance():
+    with pytest.raises(ValueError):
+        ZLoanSolver(500, BiWeeklyPeriod(datetime(2000, 1, 1)))
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()
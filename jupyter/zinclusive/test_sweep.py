@@ -0,0 +1,71 @@
+from datetime import datetime
+import pytest
+from zinclusive.sweep import *
+from zinclusive.tools import *
+
+
+def test_expand():
+    points = expand({"Apr": [49.975, 59.975], "AprDropsOn": [7, 13]})
+    assert_equals([{"Apr": 49.975, "AprDropsOn": 7}, {"Apr": 49.975, "AprDropsOn": 13}, {"Apr": 59.975, "AprDropsOn": 7}, {"Apr": 59.975, "AprDropsOn": 13}], points)
+
+
+def test_sweep(tmp_path):
+    grid = {"Apr": [49.975, 59.975], "AprDropsOn": [7, 13]}
+    scenarios = default_scenarios()[:3]
+    df = run_sweep(grid, scenarios=scenarios, workers=0, chunksize=3)
+    assert_equals(4, len(df))
+    assert_equals(list(range(4)), list(df["point"]))
+
+    # The globals are not changed, and the base scenario matches CustomerSystem.
+    assert_equals(59.975, Zinclusive.Apr)
+    row = df[(df["Apr"] == 59.975) & (df["AprDropsOn"] == 13)].iloc[0]
+    expected = sum(scenario.summary(Zinclusive).interest for scenario in scenarios) / len(scenarios)
+    assert abs(expected - row["interest"]) < 1e-9
+
+    # A lower APR means less interest.
+    assert df["interest"][0] < df["interest"][2]
+
+    # Resume: the points in the results file are not run again.
+    results = str(tmp_path / "sweep.csv")
+    run_sweep({"Apr": [49.975, 59.975]}, scenarios=scenarios, workers=0, results=results)
+    with open(results) as f:
+        lines = f.readlines()
+    lines.pop()
+    with open(results, "w") as f:
+        f.writelines(lines)
+    df2 = run_sweep({"Apr": [49.975, 59.975]}, scenarios=scenarios, workers=1, results=results)
+    assert_equals([0, 1], list(df2["point"]))
+    with open(results) as f:
+        assert_equals(3, len(f.readlines()))
+
+
+
+def test_sweep_resume_other_inputs(tmp_path):
+    "A results file is only resumed with the rows of the same inputs, and tuple params come back as tuples."
+    results = str(tmp_path / "sweep.csv")
+    scenarios = default_scenarios()[:2]
+    grid = {"MinPmtFloor": [(100, 105, 110, 130), (120, 125, 130, 150)]}
+    fresh = run_sweep(grid, scenarios=scenarios, workers=0, results=results)
+    resumed = run_sweep(grid, scenarios=scenarios, workers=0, results=results)
+    assert_equals(list(fresh["MinPmtFloor"]), list(resumed["MinPmtFloor"]))
+    assert_equals((100, 105, 110, 130), resumed["MinPmtFloor"][0])
+    assert_equals(list(fresh["interest"]), list(resumed["interest"]))
+
+    # Other scenarios are run again rather than returning the old rows.
+    other = run_sweep(grid, scenarios=scenarios[:1], workers=0, results=results)
+    with open(results) as f:
+        assert_equals(5, len(f.readlines()))
+    expected = run_sweep(grid, scenarios=scenarios[:1], workers=0)
+    assert_equals(list(expected["interest"]), list(other["interest"]))
+
+    # Another grid is refused.
+    with pytest.raises(ValueError):
+        run_sweep({"Apr": [49.975]}, scenarios=scenarios, workers=0, results=results)
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()
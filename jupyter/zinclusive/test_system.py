@@ -0,0 +1,112 @@
+from datetime import datetime
+import pytest
+from zinclusive.customer import *
+from zinclusive.loans import *
+from zinclusive.period import *
+from zinclusive.reports import *
+from zinclusive.systems import *
+from zinclusive.tools import *
+from zinclusive.zinclusive import Zinclusive
+
+
+def test_system_1():
+    # Loan origination date
+    start = datetime(2000, 1, 1)
+
+    pIncome = BiWeeklyPeriod(datetime(2000, 1, 1))
+    customer = Customer(annual_income=40000, pIncome=pIncome)
+    loan = ZLoan(5000)
+    r = pIncome.adjust_monthly(Zinclusive.Apr/12)
+    MinPmtFloor = Zinclusive.MinPmtFloor[loan.iBand]
+
+    system = CustomerSystem(start=datetime(2000, 1, 1), end=datetime(2000, 1, 1), loan=loan, customer=customer)
+    statement = system.get_statement()
+    df = loan_report(loan=loan, customer=customer, expenses=0, statement=statement)
+    print(df.to_string())
+
+
+def make_system(bal=5000):
+    start = datetime(2000, 1, 1)
+    customer = Customer(annual_income=40000, pIncome=BiWeeklyPeriod(start))
+    return CustomerSystem(start=start, end=start, loan=ZLoan(bal), customer=customer)
+
+
+def test_system_iter_events():
+    system = make_system(1000)
+    txs = list(system.iter_events())
+    payments = [tx for tx in txs if tx.desc == "loan payment"]
+    assert payments[-1].lBal < 0.01
+    assert all(tx.lBal >= 0.01 for tx in payments[:-1])
+    assert_equals(payments[-1].date, txs[-1].date)
+
+    # The statement keeps going after the loan is paid off.
+    statement = system.get_statement()
+    assert len(statement) > len(txs)
+    assert_equals([(tx.date, tx.desc, tx.amount) for tx in txs], [(tx.date, tx.desc, tx.amount) for tx in statement.txs[:len(txs)]])
+
+    # Stop at the end date.
+    txs = list(system.iter_events(end=datetime(2000, 3, 1)))
+    assert_equals(datetime(2000, 2, 26), txs[-1].date)
+
+
+def test_system_summary():
+    for bal in [1000, 5000]:
+        system = make_system(bal)
+        txs = list(system.iter_events())
+        payments = [tx for tx in txs if tx.desc == "loan payment"]
+        summary = system.summary()
+        assert_equals(len(payments), summary.payments)
+        assert_equals(payments[-1].lBal, summary.bal)
+        assert abs(summary.paid + sum(tx.amount for tx in payments)) < 1e-6
+        assert abs(summary.interest - (summary.paid - (bal - summary.bal))) < 1e-6
+        assert_equals(Zinclusive.OrigFee, summary.fees)
+
+    assert_equals(datetime(2000, 5, 20), make_system(1000).summary().payoffDate)
+    assert_equals(None, make_system(5000).summary(end=datetime(2001, 1, 1)).payoffDate)
+
+
+def test_system_end():
+    "Without an end, the system runs to its own end if it is after the start, else for 3 years."
+    start = datetime(2000, 1, 1)
+    customer = Customer(annual_income=40000, pIncome=BiWeeklyPeriod(start))
+    system = CustomerSystem(start=start, end=datetime(2001, 1, 1), loan=ZLoan(5000), customer=customer)
+    assert_equals(system.get_statement(datetime(2001, 1, 1)).txs, system.get_statement().txs)
+    assert_equals(repr(system.summary(datetime(2001, 1, 1))), repr(system.summary()))
+    assert_equals(datetime(2003, 1, 1), make_system()._horizon())
+
+
+def test_system_snapshot():
+    import pickle
+    for pIncome in [BiWeeklyPeriod(datetime(2000, 1, 1)), MonthlyPeriod(datetime(2000, 1, 1)), SemiMonthlyPeriod(datetime(2000, 1, 1), days=[7, 22])]:
+        start = datetime(2000, 1, 1)
+        system = CustomerSystem(start=start, end=start, loan=ZLoan(5000), customer=Customer(annual_income=40000, pIncome=pIncome))
+        full = [(tx.date, tx.desc, tx.amount, tx.lBal) for tx in system.get_statement()]
+
+        # The prefix until the snapshot and the resumed suffix are the same as the full statement.
+        d = datetime(2001, 2, 15)
+        state = pickle.loads(pickle.dumps(system.snapshot(d)))
+        suffix = [(tx.date, tx.desc, tx.amount, tx.lBal) for tx in system.get_statement(state=state)]
+        prefix = [row for row in full if row[0] <= d]
+        assert_equals(full, prefix + suffix)
+        assert state.iPayment >= Zinclusive.AprDropsOn
+        assert_equals(Zinclusive.AprDropsTo, state.apr)
+
+        # Snapshots can be chained.
+        assert_equals(state, system.snapshot(d, system.snapshot(datetime(2000, 6, 1))))
+
+    # What if the customer pays $500 extra?
+    system = make_system(5000)
+    state = system.snapshot(datetime(2000, 8, 31))
+    summary = system.summary(state=state._replace(bal=state.bal - 500))
+    assert summary.payoffDate < system.summary().payoffDate
+    assert_equals(0, summary.fees)
+    assert_equals(system.summary().payments, system.summary(state=state).payments + state.iPayment)
+    assert_equals(system.summary().payments, system.summary(state=system.initial_state()).payments)
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()
@@ -0,0 +1,54 @@
+from typing import NamedTuple
+
+
+class Tx:
+    """
+    Model a transaction, i.e. an amount at some time.
+    Uses __slots__ instead of a __dict__ since a portfolio has millions of transactions.
+    """
+    __slots__ = ('date', 'desc', 'amount', 'key', 'value', 'bal', 'lBal')
+
+    def __init__(self, date, desc='', amount=0, key=None, value=None, lBal=None):
+        self.date = date
+        self.desc = desc
+        self.amount = amount
+        self.key = key # The name of an event, e.g. "rate".
+        self.value = value # The value of the event, e.g. 0.12.
+        self.bal = 0 # The new balance after the transaction is applied.
+        self.lBal = lBal # The loan balance after the transaction is applied, if it changed the loan.
+
+    def __str__(self):
+        return repr(self)
+
+    def __repr__(self):
+        if self.desc:
+            return f"{self.date.strftime('%Y-%m-%d')} {self.amount:>8.2f} {self.bal:>8.2f} {self.desc}"
+        return ""
+
+    def freeze(self):
+        "Returns an immutable copy of the transaction."
+        return FrozenTx(self.date, self.desc, self.amount, self.key, self.value, self.lBal, self.bal)
+
+
+class FrozenTx(NamedTuple):
+    """
+    An immutable transaction, e.g. from a Statement. It can be shared without copying.
+    The fields are in the order of the Tx arguments, so FrozenTx(*args) and Tx(*args) agree, then the balance.
+    It is not smaller than a Tx with __slots__; the memory is saved by the columns of the Statement, not by this record.
+    """
+    date: object
+    desc: str = ''
+    amount: float = 0
+    key: str = None
+    value: float = None
+    lBal: float = None
+    bal: float = 0
+
+    def __str__(self):
+        return repr(self)
+
+    def __repr__(self):
+        return Tx.__repr__(self)
+
+    def freeze(self):
+        return self
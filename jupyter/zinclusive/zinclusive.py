@@ -0,0 +1,153 @@
+from typing import NamedTuple
+import numpy as np
+from .tools import *
+
+
+# No payment can be required before this many days after the loan starts.
+GRACE_DAYS = 10
+
+
+class ProductConfig(NamedTuple):
+    """
+    An immutable copy of the Zinclusive product parameters, e.g. one scenario of a parameter sweep.
+    It has the same attributes as Zinclusive, so either can be the product of a CustomerSystem.
+
+    EXAMPLE USAGE:
+        product = Zinclusive.config()._replace(Apr=49.975)
+        system = CustomerSystem(start, end, loan, customer, product=product)
+    """
+    OrigFee: float
+    Apr: float
+    AprDropsTo: float
+    AprDropsOn: int
+    MinInitBal: float
+    bands: tuple
+    MinPmtPctPrin: tuple
+    MinPmtFloor: tuple
+
+
+
+class Zinclusive:
+    """
+    This file contains the parameters for the Zinclusive loan product.
+    """
+
+    # Suffixes:
+    #  BW = Bi-weekly
+    #  SM = Semi-monthly
+
+    # Origination Fee
+    OrigFee = 75.00
+
+    # Starting Annual Percentage Rate (APR) for the loan
+    Apr = 59.975
+
+    # Later Annual Percentage Rate (APR) for the loan if the customer makes consistent good payments
+    AprDropsTo = 35.950
+
+    # The month that the APR drops if the borrower makes consistent good payments
+    AprDropsOn = 13
+
+    # The minimum amount that we lend.
+    MinInitBal = 1000
+
+    # Band: a number in range 1..4
+    # iBand: a number in range 0..3 = Band-1
+    # If balance is 500, then iBand = -1 and is not allowed since we don't lend less than 1000
+    # If balance is 2500, then iBand = 1
+    bands = [1000, 2000, 4000, 7000, 10000]
+
+    # Monthly minimum percentage of the principle to calculate the payment
+    MinPmtPctPrin = np.array([5.5, 5.5, 5.25, 4.5])
+    MinPmtPctPrinBW = MinPmtPctPrin*12/26
+    MinPmtPctPrinSM = MinPmtPctPrin/2
+
+    # The minimum payment for a monthly term
+    MinPmtFloor = np.array([120, 125, 130, 150])
+    MinPmtFloorBW = MinPmtFloor*12/26
+    MinPmtFloorSM = MinPmtFloor*2
+
+    # The band index of a balance that does not fit in a band, for arrays of balances.
+    NoBand = -1
+
+    def get_band_index(bal):
+        """
+        Returns the band index of a balance, or None if it does not fit in a band.
+        For an array of balances, returns an array of band indexes with NoBand (-1) for balances that do not fit in a band.
+        """
+        bands = Zinclusive.bands
+        i = np.searchsorted(bands, bal, side='right') - 1
+        valid = (i >= 0) & (i < len(bands) - 1)
+        if np.ndim(i) == 0:
+            return int(i) if valid else None
+        return np.where(valid, i, Zinclusive.NoBand)
+
+    def _per_band(values, iBand):
+        "Returns the values for the band indexes, with NaN for NoBand."
+        iBand = np.asarray(iBand)
+        values = np.append(np.asarray(values, dtype=float), np.nan)  # values[NoBand] is NaN.
+        return values[np.where((iBand >= 0) & (iBand < len(values) - 1), iBand, -1)]
+
+    def get_min_pmt_floor(iBand):
+        "Returns the monthly MinPmtFloor of each band index, NaN for NoBand."
+        return Zinclusive._per_band(Zinclusive.MinPmtFloor, iBand)
+
+    def get_min_pmt_pct_prin(iBand):
+        "Returns the monthly MinPmtPctPrin of each band index, NaN for NoBand."
+        return Zinclusive._per_band(Zinclusive.MinPmtPctPrin, iBand)
+
+    def get_band(bal : float):
+        i = Zinclusive.get_band_index(bal)
+        return None if i is None else i+1
+
+    def config():
+        "Returns the current product parameters as an immutable ProductConfig."
+        return ProductConfig(
+            OrigFee=Zinclusive.OrigFee,
+            Apr=Zinclusive.Apr,
+            AprDropsTo=Zinclusive.AprDropsTo,
+            AprDropsOn=Zinclusive.AprDropsOn,
+            MinInitBal=Zinclusive.MinInitBal,
+            bands=tuple(Zinclusive.bands),
+            MinPmtPctPrin=tuple(Zinclusive.MinPmtPctPrin.tolist()),
+            MinPmtFloor=tuple(Zinclusive.MinPmtFloor.tolist()),
+        )
+
+
+
+
+
+
+
+def test_bands():
+    assert_equals(None, Zinclusive.get_band_index(500))
+    assert_equals(None, Zinclusive.get_band_index(990.99))
+    assert_equals(0, Zinclusive.get_band_index(1000))
+    assert_equals(0, Zinclusive.get_band_index(1500))
+    assert_equals(1, Zinclusive.get_band_index(2000))
+    assert_equals(1, Zinclusive.get_band_index(2500))
+    assert_equals(2, Zinclusive.get_band_index(4000))
+    assert_equals(2, Zinclusive.get_band_index(4500))
+    assert_equals(3, Zinclusive.get_band_index(7000))
+    assert_equals(3, Zinclusive.get_band_index(7500))
+    assert_equals(None, Zinclusive.get_band_index(10000))
+
+
+def test_bands_array():
+    bals = np.array([500, 990.99, 1000, 1500, 2000, 2500, 4000, 4500, 7000, 7500, 9999.99, 10000])
+    expected = [-1, -1, 0, 0, 1, 1, 2, 2, 3, 3, 3, -1]
+    assert_equals(expected, Zinclusive.get_band_index(bals).tolist())
+
+    iBands = Zinclusive.get_band_index(np.array([500, 1500, 8000]))
+    floor = Zinclusive.get_min_pmt_floor(iBands)
+    assert np.isnan(floor[0])
+    assert_equals([120, 150], floor[1:].tolist())
+    assert_equals([5.5, 4.5], Zinclusive.get_min_pmt_pct_prin(iBands)[1:].tolist())
+
+
+if __name__ == "__main__":
+    #pytest.main(["-k", "test_"])
+    import inspect
+    tests = inspect.getmembers(__import__(__name__), inspect.isfunction)
+    tests = [func for name, func in tests if name.startswith("test_")]
+    for test in tests: test()